@@ -0,0 +1,253 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from services.alert_monitor import AlertMonitor
+from services.api_key_status import APIKeyStatus
+from services.geocode_cache import GeocodeCache
+from services.http_cache import HTTPResponseCache
+from services.retry_scheduler import CircuitBreaker, backoff_delay, parse_retry_after
+from utils.json_codec import loads as json_loads
+from utils.rate_limiter import TokenBucket
+from weather_data_fetcher import (
+    GEOCODING_URL, GROUP_BATCH_SIZE, build_weather_reading, parse_group_response, units_for_country
+)
+
+
+class AsyncWeatherDataFetcher:
+    """asyncio counterpart of WeatherDataFetcher for bulk collection.
+
+    Requests are issued concurrently (bounded by ``max_concurrency``) and paced
+    by a shared token bucket instead of a fixed delay between calls, so a sweep
+    over many cities costs roughly ``len(cities) / requests_per_second`` seconds.
+    Readings are normalized with the same ``build_weather_reading`` helper as the
+    sync fetcher, so they can be passed straight to ``WeatherDB.insert_reading``.
+    Pass the sync fetcher's ``rate_limiter`` so both draw from one budget.
+
+    The blocking ``collect_*`` entry points each run their own event loop and
+    ``ClientSession``; they are serialized, so callers on different threads
+    never share a session across loops. Cache reads and writes (disk, SQLite)
+    run in worker threads to keep the loop free.
+    """
+
+    def __init__(self, config, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 requests_per_second: Optional[float] = None, burst: Optional[int] = None,
+                 max_concurrency: Optional[int] = None, geocode_cache: Optional[GeocodeCache] = None,
+                 alert_monitor: Optional[AlertMonitor] = None, http_cache: Optional[HTTPResponseCache] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 api_key_status: Optional[APIKeyStatus] = None, rate_limiter: Optional[TokenBucket] = None):
+        self.config = config
+        self.api_key = api_key or config.api_key
+        self.base_url = base_url or config.base_url
+        self.timeout = getattr(config, "request_timeout", 10)
+        self.max_retries = getattr(config, "retry_limit", 3)
+        self.rate_limiter = rate_limiter or TokenBucket(
+            requests_per_second or getattr(config, "requests_per_second", 1.0),
+            burst or getattr(config, "rate_limit_burst", 5)
+        )
+        self.max_concurrency = max_concurrency or getattr(config, "max_concurrency", 20)
+        self.failed_cities = {}
+        self.geocode_cache = geocode_cache or GeocodeCache()
+        self.alert_monitor = alert_monitor
+        self.http_cache = http_cache
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.api_key_status = api_key_status or APIKeyStatus(self.api_key)
+        self.logger = config.logger or logging.getLogger(__name__)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._run_lock = threading.Lock()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self) -> None:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(
+                    limit=max(self.max_concurrency, getattr(self.config, "http_pool_size", 0)),
+                    force_close=not getattr(self.config, "http_keep_alive", True)
+                )
+            )
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def register_failure(self, city: str):
+        self.failed_cities[city] = self.failed_cities.get(city, 0) + 1
+
+    def is_fake_or_unresolvable(self, city: str, threshold: int = 3) -> bool:
+        city = city.lower()
+        if city in {"testville", "demo city"}:
+            return True
+        return self.failed_cities.get(city.title(), 0) >= threshold
+
+    async def _get_json(self, url: str, params: Dict) -> Optional[Dict]:
+        """GET ``url`` under the rate limit, retrying transient failures without blocking other requests"""
+        await self.open()
+        params = dict(params)
+        params["appid"] = self.api_key
+        host = urlparse(url).netloc
+
+        cached = await asyncio.to_thread(self.http_cache.lookup, url, params) if self.http_cache else None
+        if self.http_cache and self.http_cache.is_fresh(cached):
+            return cached["data"]
+        headers = HTTPResponseCache.conditional_headers(cached)
+
+        for attempt in range(self.max_retries):
+            if not self.circuit_breaker.allow(host):
+                self.logger.warning(f"🔌 {host} is cooling down — skipping {params.get('q', url)}")
+                return None
+            await self.rate_limiter.acquire_async()
+            try:
+                async with self._session.get(url, params=params, headers=headers) as response:
+                    if response.status == 200:
+                        self.circuit_breaker.record_success(host)
+                        self.api_key_status.record(True)
+                        data = json_loads(await response.read())
+                        if self.http_cache:
+                            await asyncio.to_thread(self.http_cache.store, url, params, response.headers, data)
+                        return data
+                    elif response.status == 304 and cached:
+                        self.circuit_breaker.record_success(host)
+                        self.api_key_status.record(True)
+                        await asyncio.to_thread(self.http_cache.revalidated, url, params, cached, response.headers)
+                        return cached["data"]
+                    elif response.status == 401:
+                        self.api_key_status.record(False)
+                        self.logger.error("❌ Invalid API key. Please check your OpenWeatherMap API key.")
+                        return None
+                    elif response.status == 429:
+                        delay = parse_retry_after(response.headers.get("Retry-After"))
+                        if delay is None:
+                            delay = backoff_delay(attempt, base=2.0, cap=60.0)
+                        self.circuit_breaker.hold(host, delay)
+                        self.logger.warning(f"⏳ Rate limited! {host} paused for {delay:.0f} seconds")
+                        return None
+                    elif response.status == 404:
+                        self.circuit_breaker.record_success(host)
+                        self.logger.warning(f"🌍 City not found: {params.get('q', 'Unknown location')}")
+                        if "q" in params:
+                            self.register_failure(params["q"].split(",")[0].title())
+                        return None
+                    else:
+                        self.circuit_breaker.record_failure(host)
+                        self.logger.warning(f"⚠️ Unexpected status code: {response.status}")
+                        if "q" in params:
+                            self.register_failure(params["q"].split(",")[0].title())
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.circuit_breaker.record_failure(host)
+                self.logger.warning(f"📡 Request error on attempt {attempt + 1}: {e}")
+
+            if attempt < self.max_retries - 1:
+                await asyncio.sleep(backoff_delay(attempt))
+
+        self.logger.error("🚫 Failed to get a valid response after retries")
+        return None
+
+    async def _api_request(self, endpoint: str, params: Dict, base_url: Optional[str] = None) -> Optional[Dict]:
+        return await self._get_json(f"{base_url or self.base_url}/{endpoint}", params)
+
+    async def get_coordinates(self, city: str, country: str) -> Optional[tuple]:
+        """Get latitude and longitude for a city, geocoding only on a cache miss"""
+        cached = await asyncio.to_thread(self.geocode_cache.get, city, country)
+        if cached:
+            return cached
+
+        data = await self._get_json(GEOCODING_URL, {"q": f"{city},{country}", "limit": 1})
+        if data:
+            lat, lon = data[0]["lat"], data[0]["lon"]
+            await asyncio.to_thread(self.geocode_cache.put, city, country, lat, lon)
+            return lat, lon
+        return None
+
+    async def fetch_weather_alerts(self, city: str, country: Optional[str] = None) -> List[Dict]:
+        """Fetch weather alerts for a location"""
+        coords = await self.get_coordinates(city, country or "")
+        if not coords:
+            return []
+        lat, lon = coords
+        data = await self._api_request("onecall", {"lat": lat, "lon": lon, "exclude": "minutely,daily"})
+        return data.get("alerts", []) if data else []
+
+    async def fetch_current_weather(self, city: str, country: Optional[str] = None, units: str = 'metric') -> Optional[Dict]:
+        """Fetch current conditions with a single request and return a normalized reading"""
+        city = city.strip().title()
+        country = country.upper() if country else ""
+
+        if self.is_fake_or_unresolvable(city):
+            self.logger.warning(f"⛔️ Skipping persistently failing city: {city}")
+            return None
+
+        units = units_for_country(country)
+        location = f"{city},{country}" if country else city
+
+        raw_data = await self._api_request("weather", {"q": location, "units": units})
+        if not raw_data:
+            return None
+
+        alerts = []
+        if self.alert_monitor is not None:
+            self.alert_monitor.watch(city, country)
+            alerts = self.alert_monitor.peek(city, country)
+
+        try:
+            return build_weather_reading(raw_data, city, units, alerts)
+        except (KeyError, IndexError, TypeError) as err:
+            self.logger.error(f"🧨 Data parsing error for {location}: {err}")
+            return None
+
+    async def fetch_current_weather_group(self, city_ids: List[int], units: str = "metric") -> Dict[int, Dict]:
+        """Fetch current weather for up to GROUP_BATCH_SIZE provider city IDs in one request"""
+        if not city_ids:
+            return {}
+        params = {"id": ",".join(str(city_id) for city_id in city_ids[:GROUP_BATCH_SIZE]), "units": units}
+        return parse_group_response(await self._api_request("group", params), units)
+
+    async def fetch_forecast(self, city: str, country: Optional[str] = None, units: str = "metric") -> Optional[Dict]:
+        """Fetch the raw 5-day/3-hour forecast payload"""
+        location = f"{city},{country}" if country else city
+        return await self._api_request("forecast", {"q": location, "units": units})
+
+    async def fetch_many_current(self, locations: List[Dict]) -> List[Optional[Dict]]:
+        """Fetch current weather for every ``{"city", "country"}`` dict, preserving input order"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch_one(location: Dict) -> Optional[Dict]:
+            async with semaphore:
+                try:
+                    return await self.fetch_current_weather(location["city"], location.get("country"))
+                except Exception as e:
+                    self.logger.error(f"Error fetching {location.get('city')}: {e}")
+                    return None
+
+        return await asyncio.gather(*(fetch_one(loc) for loc in locations))
+
+    def collect_groups(self, batches: List[tuple]) -> List[Dict[int, Dict]]:
+        """Blocking entry point that runs ``(city_ids, units)`` group batches concurrently"""
+        async def run():
+            async with self:
+                return await asyncio.gather(*(
+                    self.fetch_current_weather_group(city_ids, units) for city_ids, units in batches
+                ))
+
+        with self._run_lock:
+            return asyncio.run(run())
+
+    def collect_current_weather(self, locations: List[Dict]) -> List[Optional[Dict]]:
+        """Blocking entry point for threaded callers such as AutomatedWeatherTracker"""
+        async def run():
+            async with self:
+                return await self.fetch_many_current(locations)
+
+        with self._run_lock:
+            return asyncio.run(run())
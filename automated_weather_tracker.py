@@ -1,26 +1,66 @@
-import schedule
+import functools
 import threading
-import time
-from typing import Dict, List
-from weather_data_fetcher import WeatherDataFetcher
-from weather_db import WeatherDB
+from collections import defaultdict
+from typing import Dict, List, Optional
+from async_weather_fetcher import AsyncWeatherDataFetcher
+from weather_data_fetcher import WeatherDataFetcher, GROUP_BATCH_SIZE, units_for_country
+from weather_db import WeatherDB, location_key
+from services.retry_scheduler import RetryScheduler
+from services.adaptive_poller import AdaptivePollPolicy
+from services.job_scheduler import JobScheduler
+from services.retention import RetentionManager
 from datetime import datetime
 from weather_data_fetcher import WeatherDataFetcher
 
 class AutomatedWeatherTracker:
-    def __init__(self, collector: WeatherDataFetcher, database: WeatherDB):
+    DISCOVERY_INTERVAL = 60  # new or deactivated locations are only noticed by querying the table
+    SWEEP_WINDOW = 2.0  # due locations are gathered this long so they can share /group requests
+    MAINTENANCE_IDLE_WINDOW = 30.0  # maintenance only runs while no poll or sweep is due this soon
+
+    def __init__(self, collector: WeatherDataFetcher, database: WeatherDB,
+                 async_collector: Optional[AsyncWeatherDataFetcher] = None,
+                 poll_policy: Optional[AdaptivePollPolicy] = None,
+                 retention: Optional[RetentionManager] = None):
         self.collector = collector
         self.database = database
+        self.async_collector = async_collector
+        self.retry_queue = RetryScheduler()
+        self.poll_policy = poll_policy or self._default_poll_policy()
+        self.scheduler = JobScheduler()
+        self._scheduled: Dict[int, Dict] = {}
+        self._due_batch: Dict[int, Dict] = {}
+        self._due_lock = threading.Lock()
+        self.retention = retention or self._default_retention()
+        config = getattr(self.collector, "config", None)
+        self.maintenance_interval = (config.maintenance_interval_hours if config else 6) * 3600
+        self._maintenance_due = 0.0
         self.is_running = False
-        self.collection_thread = None
+
+    def _default_poll_policy(self) -> AdaptivePollPolicy:
+        config = getattr(self.collector, "config", None)
+        if config is None:
+            return AdaptivePollPolicy()
+        return AdaptivePollPolicy(
+            min_interval=config.poll_min_minutes * 60,
+            max_interval=config.poll_max_minutes * 60,
+            hourly_budget=config.hourly_request_budget
+        )
+
+    def _default_retention(self) -> Optional[RetentionManager]:
+        config = getattr(self.collector, "config", None)
+        if config is None or not isinstance(self.database, WeatherDB):
+            return None
+        return RetentionManager.from_config(self.database, config)
 
     def add_location(self, city: str, country: str) -> bool:
         try:
             with self.database.get_connection() as conn:
+                # Geocode lookups and readings create inactive rows; favoriting one starts tracking it
                 conn.execute("""
-                    INSERT OR IGNORE INTO locations (city, country, is_active)
-                    VALUES (?, ?, 1)
-                """, (city, country))
+                    INSERT INTO locations (city, country, is_active, location_key)
+                    VALUES (?, ?, 1, ?)
+                    ON CONFLICT(location_key) DO UPDATE SET is_active = 1
+                """, (city, country, location_key(city, country)))
             return True
         except Exception as e:
             print(f"[Add Location Error] {e}")
@@ -28,47 +68,218 @@ class AutomatedWeatherTracker:
 
     def get_active_locations(self) -> List[Dict]:
         with self.database.get_connection() as conn:
-            cursor = conn.execute("SELECT id, city, country FROM locations WHERE is_active = 1")
+            cursor = conn.execute("SELECT id, city, country, owm_id FROM locations WHERE is_active = 1")
             return [dict(row) for row in cursor.fetchall()]
 
     def collect_for_location(self, location: Dict):
         try:
             data = self.collector.fetch_current_weather(location["city"], location["country"])
             print(f"[FETCHED] {location['city']}: {data}")  # Debug print
+            self.store_reading(location, data)
+        except Exception as e:
+            self.database.log_request("auto_fetch", location["id"], "error", str(e))
+            self.park_location(location)
+
+    def store_reading(self, location: Dict, data: Optional[Dict]):
+        if data:
+            self.retry_queue.forget(location["id"])
+            if data.get("city_id") and not location.get("owm_id"):
+                self.database.save_city_id(location["id"], data["city_id"])
+            success = self.database.insert_reading({**data, "location_id": location["id"]})
+            if not success:
+                status = "insert_failed"
+            elif getattr(self.database, "write_pipeline", None) is not None:
+                status = "queued"  # the writer thread commits it later; flush_writes() reports failures
+            else:
+                status = "success"
+            self.database.log_request("auto_fetch", location["id"], status)
+            self.poll_policy.observe(location["id"], data, self.has_active_alerts(location, data))
+        else:
+            self.database.log_request("auto_fetch", location["id"], "api_error", "No data returned")
+            self.park_location(location)
+
+    def has_active_alerts(self, location: Dict, data: Dict) -> bool:
+        if data.get("alerts"):
+            return True
+        monitor = getattr(self.collector, "alert_monitor", None)
+        return bool(monitor and monitor.peek(location["city"], location["country"]))
 
-            if data:
-                success = self.database.insert_reading(data)
-                status = "success" if success else "insert_failed"
-                self.database.log_request("auto_fetch", location["id"], status)
+    def park_location(self, location: Dict):
+        """Queue a failed location for a jittered retry instead of blocking the sweep on it"""
+        breaker = getattr(self.collector, "circuit_breaker", None)
+        min_delay = breaker.retry_in() if breaker else 0.0
+        delay = self.retry_queue.park(location["id"], location, min_delay=min_delay)
+        # The retry queue owns the next attempt; keep the poller from re-selecting it meanwhile
+        self.poll_policy.postpone(location["id"])
+        if delay is not None:
+            print(f"🅿️ Retrying {location['city']} in {delay:.0f}s")
+            self._schedule_retries()
+
+    def retry_parked_locations(self):
+        for loc in self.retry_queue.pop_due():
+            self.collect_for_location(loc)
+        self._schedule_retries()
+
+    def _schedule_retries(self):
+        due = self.retry_queue.next_due()
+        if due is not None:
+            self.scheduler.schedule("retry", self.retry_parked_locations, at=due)
+
+    def collect_grouped(self, locations: List[Dict]) -> List[Dict]:
+        """Collect locations with a known provider city ID via /group batches.
+
+        Returns the locations that still need an individual request: those without
+        an ID yet, and any the group response did not include.
+        """
+        batches = defaultdict(list)
+        pending = []
+        for loc in locations:
+            if loc.get("owm_id"):
+                batches[units_for_country(loc["country"])].append(loc)
+            else:
+                pending.append(loc)
+
+        jobs = []
+        for units, locs in batches.items():
+            for start in range(0, len(locs), GROUP_BATCH_SIZE):
+                jobs.append((units, locs[start:start + GROUP_BATCH_SIZE]))
+        if not jobs:
+            return pending
+
+        requests = [([loc["owm_id"] for loc in locs], units) for units, locs in jobs]
+        try:
+            if self.async_collector:
+                results = self.async_collector.collect_groups(requests)
             else:
-                self.database.log_request("auto_fetch", location["id"], "api_error", "No data returned")
+                results = [self.collector.fetch_current_weather_group(ids, units) for ids, units in requests]
         except Exception as e:
-            self.database.log_request("auto_fetch", location["id"], "error", str(e))
+            print(f"[Group Collection Error] {e} — falling back to per-city fetch")
+            return locations
 
-    def collect_all_locations(self):
-        for loc in self.get_active_locations():
+        for (units, locs), readings in zip(jobs, results):
+            for loc in locs:
+                data = readings.get(loc["owm_id"])
+                if data:
+                    self.store_reading(loc, data)
+                else:
+                    pending.append(loc)
+        return pending
+
+    def collect_locations(self, locations: List[Dict]):
+        locations = self.collect_grouped(locations)
+
+        # Concurrent sweep when an async engine is available; the sync fetcher
+        # already spaces its own requests, so no extra sleep is needed here.
+        if self.async_collector:
+            try:
+                results = self.async_collector.collect_current_weather(locations)
+            except Exception as e:
+                print(f"[Async Collection Error] {e} — falling back to sequential fetch")
+            else:
+                for loc, data in zip(locations, results):
+                    try:
+                        self.store_reading(loc, data)
+                    except Exception as e:
+                        self.database.log_request("auto_fetch", loc["id"], "error", str(e))
+                return
+
+        for loc in locations:
             self.collect_for_location(loc)
-            time.sleep(1)
 
-    def start_scheduled_collection(self, interval_minutes: int = 30):
-        schedule.every(interval_minutes).minutes.do(self.collect_all_locations)
-        schedule.run_all()
+    def collect_all_locations(self):
+        """Sweep every active location now, regardless of its polling interval"""
+        locations = self.get_active_locations()
+        self.poll_policy.charge(locations)
+        self.collect_locations(locations)
+
+    def collect_due_locations(self) -> int:
+        """Collect the locations whose adaptive interval has elapsed, within the hourly budget"""
+        locations = self.poll_policy.select(self.get_active_locations())
+        if locations:
+            self.collect_locations(locations)
+        return len(locations)
+
+    def schedule_locations(self):
+        """Give every active location a poll job and drop the jobs of deactivated ones"""
+        locations = self.get_active_locations()
+        active = {loc["id"] for loc in locations}
+        for loc in locations:
+            if loc["id"] not in self._scheduled:
+                self._schedule_poll(loc)
+            self._scheduled[loc["id"]] = loc
+        for location_id in set(self._scheduled) - active:
+            self.scheduler.cancel(("poll", location_id))
+            del self._scheduled[location_id]
 
-        def loop():
-            while self.is_running:
-                schedule.run_pending()
-                time.sleep(1)
+    def _schedule_poll(self, location: Dict, delay: Optional[float] = None):
+        location_id = location["id"]
+        interval = self.poll_policy.intervals.get(location_id, self.poll_policy.base_interval)
+        at = None if delay is not None else self.poll_policy.next_due.get(location_id, self.scheduler.clock())
+        self.scheduler.schedule(("poll", location_id), functools.partial(self._mark_due, location),
+                                at=at, delay=delay or 0.0, jitter=min(30.0, interval * 0.05))
 
+    def _mark_due(self, location: Dict):
+        with self._due_lock:
+            self._due_batch[location["id"]] = location
+        self.scheduler.schedule("sweep", self.collect_due_batch, delay=self.SWEEP_WINDOW, replace=False)
+
+    def collect_due_batch(self):
+        """Collect the locations whose poll jobs fired, within the hourly budget, then re-arm their jobs"""
+        with self._due_lock:
+            batch = list(self._due_batch.values())
+            self._due_batch.clear()
+        selected = self.poll_policy.select(batch)
+        if selected:
+            self.collect_locations(selected)
+        chosen = {loc["id"] for loc in selected}
+        now = self.scheduler.clock()
+        for loc in batch:
+            if loc["id"] not in chosen:
+                # Over budget: look again once some of the hour's requests have aged out
+                self._schedule_poll(loc, delay=self.DISCOVERY_INTERVAL)
+                continue
+            if self.poll_policy.next_due.get(loc["id"], 0) <= now:
+                self.poll_policy.postpone(loc["id"])
+            self._schedule_poll(loc)
+
+    def _is_idle(self) -> bool:
+        """No locations waiting to be collected and no poll or sweep due within the idle window"""
+        with self._due_lock:
+            if self._due_batch:
+                return False
+        next_run = self.scheduler.next_run_at(exclude=("discover", "maintenance"))
+        return next_run is None or next_run > self.scheduler.clock() + self.MAINTENANCE_IDLE_WINDOW
+
+    def run_maintenance(self) -> bool:
+        """Prune old readings and vacuum/analyze once per maintenance interval, only while idle.
+
+        Runs on the scheduler thread, so polls cannot fire meanwhile; the
+        retention work stops between batches as soon as one is about to come
+        due, and is retried at the next idle check. Returns True if it ran.
+        """
+        if self.retention is None:
+            return False
+        now = self.scheduler.clock()
+        if now < self._maintenance_due or not self._is_idle():
+            return False
+        self.retention.run(now, keep_going=self._is_idle)
+        if self._is_idle():
+            self._maintenance_due = now + self.maintenance_interval
+        return True
+
+    def start_scheduled_collection(self, interval_minutes: int = 30):
+        """Poll each location on its own adaptive interval, starting from ``interval_minutes``"""
+        self.poll_policy.base_interval = interval_minutes * 60
+        self.scheduler.schedule("discover", self.schedule_locations, every=self.DISCOVERY_INTERVAL)
+        if self.retention is not None:
+            self.scheduler.schedule("maintenance", self.run_maintenance, delay=self.DISCOVERY_INTERVAL,
+                                    every=self.DISCOVERY_INTERVAL)
+        self._schedule_retries()
         self.is_running = True
-        self.collection_thread = threading.Thread(target=loop, daemon=True)
-        self.collection_thread.start()
-        print(f"⏰ Automated weather tracking started — every {interval_minutes} min")
+        self.scheduler.start()
+        print(f"⏰ Automated weather tracking started — adaptive, {interval_minutes} min base interval")
 
     def stop_collection(self):
         self.is_running = False
-        schedule.clear()
-        if self.collection_thread:
-            self.collection_thread.join()
-            self.collection_thread = None
+        self.scheduler.stop()
         print("🛑 Tracking stopped.")
-
@@ -0,0 +1,89 @@
+"""Offline throughput benchmark for the collector.
+
+Runs AutomatedWeatherTracker sweeps against an in-process ReplayTransport, so
+no network or API key is needed. The first sweep resolves every city through
+/weather; later sweeps go through /group batches. ``--workers N`` runs the
+sweeps through ShardedCollector instead, with one replay transport per worker
+process.
+
+    python benchmarks/collector_benchmark.py --cities 2000 --latency 0.01 --error-rate 0.01
+    python benchmarks/collector_benchmark.py --cities 2000 --latency 0.01 --workers 4
+"""
+import argparse
+import contextlib
+import functools
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from automated_weather_tracker import AutomatedWeatherTracker
+from config import Config
+from services.sharded_collector import ShardedCollector
+from services.transport import ReplayTransport
+from weather_data_fetcher import WeatherDataFetcher
+from weather_db import WeatherDB
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cities", type=int, default=1000)
+    parser.add_argument("--sweeps", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.01, help="simulated round trip in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with a 500")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=0, help="collect across N processes (0 = in-process tracker)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    transport = ReplayTransport(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DB_PATH"] = os.path.join(tmp, "weather.db")
+        config = Config(api_key="benchmark-key", db_file_path=os.environ["DB_PATH"], requests_per_second=1e6)
+        fetcher = WeatherDataFetcher(config, transport=transport)
+        fetcher.min_request_interval = 0
+        fetcher.max_inline_retry_wait = 0  # failures go to the retry queue instead of sleeping
+        db = WeatherDB(fetcher)
+        tracker = AutomatedWeatherTracker(collector=fetcher, database=db)
+        for i in range(args.cities):
+            tracker.add_location(f"Benchmark City {i}", "US")
+
+        if args.workers:
+            replay = functools.partial(ReplayTransport, latency=args.latency, jitter=args.jitter,
+                                       error_rate=args.error_rate, seed=args.seed)
+            collector = ShardedCollector(config, db, workers=args.workers, transport_factory=replay,
+                                         fetcher_overrides={"max_inline_retry_wait": 0})
+            with collector, contextlib.redirect_stdout(io.StringIO()):
+                timings = []
+                for sweep in range(args.sweeps):
+                    start = time.perf_counter()
+                    collector.collect_all_locations()
+                    timings.append(time.perf_counter() - start)
+            for sweep, elapsed in enumerate(timings, 1):
+                print(f"sweep {sweep}: {args.cities} cities in {elapsed:6.2f}s "
+                      f"→ {args.cities / elapsed * 60:9.0f} cities/min across {args.workers} workers")
+            print(f"readings stored: {len(db.get_all_readings())}")
+            return
+
+        for sweep in range(1, args.sweeps + 1):
+            calls_before = sum(transport.calls.values())
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                tracker.collect_all_locations()
+            elapsed = time.perf_counter() - start
+            calls = sum(transport.calls.values()) - calls_before
+            print(f"sweep {sweep}: {args.cities} cities in {elapsed:6.2f}s "
+                  f"→ {args.cities / elapsed * 60:9.0f} cities/min, {calls} requests, "
+                  f"{len(tracker.retry_queue)} parked")
+
+        print(f"readings stored: {len(db.get_all_readings())}")
+
+
+if __name__ == "__main__":
+    main()
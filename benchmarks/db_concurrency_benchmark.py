@@ -0,0 +1,120 @@
+"""Read latency while the tracker is writing.
+
+A writer thread inserts readings (one commit each, like an unbatched sweep)
+while the main thread runs per-city ``get_latest_reading`` lookups, as the
+GUI does. "legacy" reproduces the old setup: a fresh connection per call
+and the default rollback journal. "pooled" is the current
+SQLiteConnectionManager: persistent per-thread connections in WAL mode.
+
+    python benchmarks/db_concurrency_benchmark.py --reads 2000
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from weather_db import WeatherDB
+
+
+class LegacyConnections:
+    """The pre-pool behaviour: connect on every call, rollback-journal mode"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.close()
+
+    def connection(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def close_all(self):
+        pass
+
+
+def reading(i):
+    return {
+        "timestamp": f"2024-01-01T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}", "city": f"City {i % 50}",
+        "country": "US", "temp": 20.0, "feels_like": 19.0, "humidity": 50, "pressure": 1013,
+        "weather_summary": "Clear", "weather_detail": "clear sky", "wind_speed": 1.0, "wind_direction": 90,
+        "cloudiness": 0, "visibility": 10000, "api_timestamp": f"2024-01-01T00:00:{i % 60:02d}"
+    }
+
+
+def run(mode, reads, seed_rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DB_PATH"] = os.path.join(tmp, "weather.db")
+        db = WeatherDB()
+        db.write_batch([reading(i) for i in range(seed_rows)])
+        if mode == "legacy":
+            db.connections.close_all()
+            db.connections = LegacyConnections(db.db_file)
+
+        stop = threading.Event()
+        writes = 0
+
+        def writer():
+            nonlocal writes
+            i = seed_rows
+            while not stop.is_set():
+                db.insert_reading(reading(i))
+                i += 1
+                writes += 1
+
+        thread = threading.Thread(target=writer, daemon=True)
+        thread.start()
+        latencies = []
+        for i in range(reads):
+            start = time.perf_counter()
+            db.get_latest_reading(f"City {i % 50}", "US")
+            latencies.append((time.perf_counter() - start) * 1000)
+        stop.set()
+        thread.join()
+        db.close()
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+        "max": latencies[-1],
+        "writes": writes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reads", type=int, default=1000)
+    parser.add_argument("--seed-rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    for mode in ("legacy", "pooled"):
+        result = run(mode, args.reads, args.seed_rows)
+        print(f"{mode:7}: read p50 {result['p50']:7.3f} ms  p99 {result['p99']:7.3f} ms  "
+              f"max {result['max']:7.2f} ms  ({result['writes']} concurrent writes)")
+
+
+if __name__ == "__main__":
+    main()
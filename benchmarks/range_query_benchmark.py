@@ -0,0 +1,85 @@
+"""Per-city time-window query latency on a large readings table.
+
+Compares the old ``datetime(timestamp) >= datetime('now', ...)`` filter with
+the indexed ``ts`` range scan that ``fetch_recent`` now uses.
+
+    python benchmarks/range_query_benchmark.py --rows 1000000 --cities 1000
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from weather_db import WeatherDB
+
+OLD_QUERY = """
+SELECT timestamp, temp FROM readings
+WHERE location_id = ? AND datetime(timestamp) >= datetime('now', '-24 hours')
+ORDER BY timestamp DESC
+"""
+NEW_QUERY = """
+SELECT timestamp, temp FROM readings
+WHERE location_id = ? AND ts >= ?
+ORDER BY ts DESC
+"""
+
+
+def populate(db, rows, cities):
+    now = int(time.time())
+    step = 3600 * 24 * 365 // max(1, rows // cities)  # spread each city's readings over a year
+    insert = "INSERT INTO readings (timestamp, location_id, temp, ts) VALUES (?, ?, ?, ?)"
+    with db.get_connection() as conn:
+        location_ids = [db._location_id(conn, f"City {i}", "US", create=True) for i in range(cities)]
+        batch = []
+        for i in range(rows):
+            ts = now - (i // cities) * step
+            batch.append((time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ts)), location_ids[i % cities], 20.0, ts))
+            if len(batch) == 100000:
+                conn.executemany(insert, batch)
+                batch.clear()
+        conn.executemany(insert, batch)
+        conn.execute("ANALYZE")
+    return location_ids
+
+
+def measure(conn, query, params_for, queries):
+    latencies = []
+    for i in range(queries):
+        start = time.perf_counter()
+        conn.execute(query, params_for(i)).fetchall()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cities", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DB_PATH"] = os.path.join(tmp, "weather.db")
+        db = WeatherDB()
+        start = time.perf_counter()
+        location_ids = populate(db, args.rows, args.cities)
+        print(f"populated {args.rows} rows in {time.perf_counter() - start:.1f}s")
+
+        conn = db._conn()
+        since = int(time.time()) - 24 * 3600
+        old = measure(conn, OLD_QUERY, lambda i: (location_ids[i % args.cities],), args.queries)
+        new = measure(conn, NEW_QUERY, lambda i: (location_ids[i % args.cities], since), args.queries)
+        db.close()
+
+    print(f"datetime(timestamp) filter: {old:8.3f} ms median per city")
+    print(f"ts index range scan       : {new:8.3f} ms median per city")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Cold-start benchmark for the objects main.initialize_system builds.
+
+Times WeatherDataFetcher + WeatherDB construction against a throwaway
+database, then the blocking key check the fetcher used to run in __init__.
+The network check is simulated with a fixed latency so results are
+comparable offline; pass --latency 0 --live to hit the real API instead.
+
+    python benchmarks/startup_benchmark.py --runs 5 --latency 0.8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import Config
+from weather_data_fetcher import WeatherDataFetcher
+from weather_db import WeatherDB
+
+
+class SlowResponse:
+    status_code = 200
+    headers = {}
+
+    def json(self):
+        return {}
+
+
+class SlowSession:
+    """Stands in for requests.Session with a fixed round-trip time"""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def get(self, *args, **kwargs):
+        time.sleep(self.latency)
+        return SlowResponse()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.8, help="simulated API round trip in seconds")
+    parser.add_argument("--live", action="store_true", help="validate against the real API")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DB_PATH"] = os.path.join(tmp, "weather.db")
+        config = Config(
+            api_key=os.getenv("WEATHER_API_KEY", "benchmark-key"),
+            db_file_path=os.environ["DB_PATH"],
+            api_key_status_path=""  # force an unknown key status every run
+        )
+
+        lazy, eager = [], []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            fetcher = WeatherDataFetcher(config)
+            WeatherDB(fetcher)
+            lazy.append(time.perf_counter() - start)
+
+            if not args.live:
+                fetcher.session = SlowSession(args.latency)
+            start = time.perf_counter()
+            fetcher._validate_api_key()
+            eager.append(time.perf_counter() - start + lazy[-1])
+
+    print(f"lazy startup  : {min(lazy) * 1000:8.1f} ms (best of {args.runs})")
+    print(f"eager startup : {min(eager) * 1000:8.1f} ms (best of {args.runs})")
+
+
+if __name__ == "__main__":
+    main()
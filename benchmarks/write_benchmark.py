@@ -0,0 +1,60 @@
+"""Insert throughput benchmark for WeatherDB.
+
+Writes the same reading + request-log pair a tracker sweep produces per city,
+first one connection and commit per row, then through the batching
+WritePipeline.
+
+    python benchmarks/write_benchmark.py --rows 5000
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from weather_db import WeatherDB
+
+
+def reading(i):
+    return {
+        "timestamp": f"2024-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}", "city": f"City {i % 100}", "country": "US",
+        "temp": 20.0, "feels_like": 19.0, "humidity": 50, "pressure": 1013, "weather_summary": "Clear",
+        "weather_detail": "clear sky", "wind_speed": 1.0, "wind_direction": 90, "cloudiness": 0,
+        "visibility": 10000, "api_timestamp": "2024-01-01T00:00:00"
+    }
+
+
+def run(db, rows):
+    start = time.perf_counter()
+    for i in range(rows):
+        db.insert_reading(reading(i))
+        db.log_request("auto_fetch", i % 100, "success")
+    db.flush_writes()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DB_PATH"] = os.path.join(tmp, "weather.db")
+        db = WeatherDB()
+        direct = run(db, args.rows)
+        db.start_write_pipeline(batch_size=args.batch_size)
+        batched = run(db, args.rows)
+        db.stop_write_pipeline()
+
+    for label, elapsed in (("per-row commits", direct), ("write pipeline", batched)):
+        print(f"{label:16}: {args.rows} readings in {elapsed:6.2f}s → {args.rows / elapsed:9.0f} readings/s")
+    print(f"speed-up: {direct / batched:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -286,9 +286,9 @@ class CreateDashboardLayout:
 
             if not hourly_data:
                 try:
-                    forecast_data = self.fetcher.fetch_five_day_forecast(city, country, units)
-                    if forecast_data and 'list' in forecast_data:
-                        hourly_data = self.extract_hourly_from_forecast(forecast_data, units)
+                    forecast_table = self.fetcher.fetch_forecast_table(city, country, units)
+                    if forecast_table:
+                        hourly_data = self.extract_hourly_from_forecast(forecast_table, units)
                 except Exception as fallback_error:
                     self.logger.error(f"Fallback hourly data fetch failed: {fallback_error}")
 
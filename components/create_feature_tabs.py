@@ -69,7 +69,8 @@ class CreateFeatureTabs:
         self.notebook.add(compare_frame, text="🏙️ Compare Cities")
         
         try:
-            self.compare_panel = CityComparisonPanel(compare_frame, self.db, self.fetcher, self.logger)
+            self.compare_panel = CityComparisonPanel(compare_frame, fetcher=self.fetcher, db=self.db,
+                                                     logger=self.logger, cfg=self.cfg)
         except Exception as e:
             self.logger.error(f"Error initializing compare panel: {e}")
             self._add_error_label(compare_frame, "🏙️ Compare Cities\n\nCity comparisons will appear here")
@@ -1,6 +1,6 @@
 from typing import Dict, Optional, Union
-from collections import defaultdict
 from datetime import datetime, timedelta
+from itertools import islice
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.dates import DateFormatter, HourLocator
@@ -84,7 +84,11 @@ class DisplayFeatures:
             
             # Display city and description
             if self.city_label:
-                self.city_label.config(text=f"{weather_data.get('city', 'Unknown')}")
+                city_text = weather_data.get('city', 'Unknown')
+                if weather_data.get('stale_label'):
+                    # Offline-first reading served from the database
+                    city_text = f"{city_text}  •  {weather_data['stale_label']}"
+                self.city_label.config(text=city_text)
             
             if self.desc_label:
                 self.desc_label.config(text=weather_data.get('weather_detail', '').title())
@@ -186,26 +190,7 @@ class DisplayFeatures:
             self.logger.error(f"Error updating weather details: {e}")
 
     def extract_five_day_summary(self, forecast):       
-        forecast_list = forecast.get("list", [])
-        daily_data = defaultdict(list)
-              
-        for entry in forecast_list:
-            dt_txt = entry.get("dt_txt")
-            if dt_txt:
-                date = dt_txt.split(" ")[0]
-                daily_data[date].append(entry)
-
-        five_day_forecasts = []
-     
-        for date in sorted(daily_data.keys())[:5]:
-            entries = daily_data[date]
-            preferred_entry = next(
-                (e for e in entries if "12:00:00" in e["dt_txt"]),
-                entries[len(entries)//2]  
-            )
-            five_day_forecasts.append(preferred_entry)
-
-        return five_day_forecasts
+        return self.fetcher.extract_five_day_summary(forecast)
 
     def display_forecast(self, forecast_list, units="metric"):       
         try:
@@ -388,9 +373,9 @@ class DisplayFeatures:
 
             if not hourly_data:                
                 try:
-                    forecast_data = self.fetcher.fetch_five_day_forecast(city, country, units)
-                    if forecast_data and 'list' in forecast_data:
-                        hourly_data = self.extract_hourly_from_forecast(forecast_data, units)
+                    forecast_table = self.fetcher.fetch_forecast_table(city, country, units)
+                    if forecast_table:
+                        hourly_data = self.extract_hourly_from_forecast(forecast_table, units)
                 except Exception as fallback_error:
                     self.logger.error(f"Fallback hourly data fetch failed: {fallback_error}")
 
@@ -493,36 +478,20 @@ class DisplayFeatures:
                 )
                 error_label.pack(pady=20)
 
-    def extract_hourly_from_forecast(self, forecast_data, units):      
+    def extract_hourly_from_forecast(self, forecast_table, units):      
         try:
-            forecast_list = forecast_data.get("list", [])
             hourly_data = []
-            
-            for entry in forecast_list[:8]:
-                dt_txt = entry.get("dt_txt", "")
-                if dt_txt:
-                    try:
-                        dt = datetime.strptime(dt_txt, "%Y-%m-%d %H:%M:%S")
-                        time_str = dt.strftime("%H:%M")
-                    except:
-                        time_str = dt_txt.split(" ")[1][:5]
-                else:
-                    time_str = "N/A"
-                
-                main_data = entry.get('main', {})
-                weather_data = entry.get('weather', [{}])[0]
-                
-                hourly_entry = {
-                    'time': time_str,
-                    'datetime': dt if dt_txt else datetime.now(),
-                    'temp': main_data.get('temp', 0),
-                    'weather_main': weather_data.get('main', ''),
-                    'weather_desc': weather_data.get('description', ''),
-                    'humidity': main_data.get('humidity', 0),
-                    'pop': entry.get('pop', 0) * 100  # Convert to percentage
-                }
-                hourly_data.append(hourly_entry)
-            
+            for i in range(min(8, len(forecast_table))):
+                dt = datetime.strptime(forecast_table.dt_txt[i], "%Y-%m-%d %H:%M:%S")
+                hourly_data.append({
+                    'time': dt.strftime("%H:%M"),
+                    'datetime': dt,
+                    'temp': forecast_table.temp[i],
+                    'weather_main': forecast_table.weather_main[i],
+                    'weather_desc': forecast_table.weather_desc[i],
+                    'humidity': forecast_table.humidity[i],
+                    'pop': forecast_table.pop[i] * 100  # Convert to percentage
+                })
             return hourly_data
         except Exception as e:
             self.logger.error(f"Error extracting hourly from forecast: {e}")
@@ -550,20 +519,12 @@ class DisplayFeatures:
                 except Exception as e:
                     self.logger.warning(f"Could not insert current data: {e}")
             
-            # Try different time ranges to get data with case-insensitive search
+            # Try different time ranges; fetch_recent resolves any casing of the name to the same location
             readings = None
             for hours in [24, 48, 72, 168, 720, 8760]:  # Up to 1 year
                 try:
-                    # Try exact match first
                     readings = self.db.fetch_recent(city, country, hours=hours)
                     
-                    # If no exact match, try case variations
-                    if not readings or len(readings) <= 1:
-                        readings = self.db.fetch_recent(city.title(), country.upper(), hours=hours)
-                    
-                    if not readings or len(readings) <= 1:
-                        readings = self.db.fetch_recent(city.lower(), country.lower(), hours=hours)
-                    
                     if readings and len(readings) > 1:
                         self.logger.info(f"Found {len(readings)} readings in last {hours} hours")
                         break
@@ -576,20 +537,11 @@ class DisplayFeatures:
             if not readings or len(readings) <= 1:
                 try:
                     self.logger.info("Trying alternative data fetch method")
-                    all_readings = self.db.get_all_readings()
-                    
-                    # Filter manually with case-insensitive matching
-                    city_lower = city.lower()
-                    country_lower = country.lower()
-                    
-                    matching_readings = []
-                    for reading in all_readings:
-                        if (reading.get('city', '').lower() == city_lower and 
-                            reading.get('country', '').lower() == country_lower):
-                            matching_readings.append(reading)
+                    # Case-insensitive match in SQL; only the newest 50 rows are read
+                    matching_readings = list(islice(self.db.iter_readings(city, country, chunk_size=50), 50))
                     
                     if matching_readings:
-                        readings = matching_readings[:50]  # Limit to last 50 readings
+                        readings = matching_readings
                         self.logger.info(f"Found {len(readings)} matching readings via manual filter")
                         
                 except Exception as e:
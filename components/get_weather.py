@@ -1,13 +1,11 @@
 import threading
 import tkinter as tk
 from tkinter import messagebox
-from collections import defaultdict
 from datetime import datetime, timedelta
-import time
 from features.weather_icons import WeatherIconManager
 from features.emoji import WeatherEmoji
 from PIL import Image, ImageTk
-from utils.date_time_utils import format_local_time
+from utils.date_time_utils import format_local_time, describe_age
 class GetWeather:
       
     def __init__(self, fetcher, db, logger, root=None):
@@ -16,6 +14,8 @@ class GetWeather:
         self.logger = logger
         self.root = root
         self.current_weather_data = None
+        # Stored readings younger than this are shown without calling the API
+        self.fresh_age = getattr(getattr(fetcher, "config", None), "offline_fresh_minutes", 10) * 60
         
         self.widgets = {}
         self.display_component = None
@@ -81,7 +81,7 @@ class GetWeather:
         for callback in self.ui_callbacks.get(event_type, []):
             try:
                 if self.root:
-                    self.root.after(0, lambda: callback(*args, **kwargs))
+                    self.root.after(0, lambda cb=callback: cb(*args, **kwargs))
                 else:
                     callback(*args, **kwargs)
             except Exception as e:
@@ -109,29 +109,34 @@ class GetWeather:
             # Trigger loading callbacks
             self._trigger_callbacks('on_weather_start', city, country)
             
-            # Update UI to show loading
-            if self.root and self.widgets.get('temp_label'):
-                self.root.after(0, lambda: self.widgets['temp_label'].config(text="Loading..."))
-            if self.root and self.widgets.get('city_label'):
-                self.root.after(0, lambda: self.widgets['city_label'].config(text=f"Loading {city}, {country}..."))
-            
-            # Fetch current weather with retry logic
+            # Offline-first: paint the newest stored reading and forecast straight away
+            stored = self.load_stored_weather(city, country)
+            if stored:
+                self.current_weather_data = stored
+                self._trigger_callbacks('on_weather_success', stored, units)
+                cached_forecast = self.fetcher.peek_forecast_table(city, country, units)
+                if cached_forecast:
+                    self._trigger_callbacks('on_forecast_success', self.extract_five_day_summary(cached_forecast), units)
+            else:
+                # Update UI to show loading
+                if self.root and self.widgets.get('temp_label'):
+                    self.root.after(0, lambda: self.widgets['temp_label'].config(text="Loading..."))
+                if self.root and self.widgets.get('city_label'):
+                    self.root.after(0, lambda: self.widgets['city_label'].config(text=f"Loading {city}, {country}..."))
+
+            # Refresh in the background (this runs on the worker thread); the
+            # fetcher already retries transient errors, so no extra retry loop here
             current_weather = None
-            for attempt in range(3):
+            if stored and not stored["stale"]:
+                self.logger.info(f"Stored reading for {city}, {country} is fresh ({stored['stale_label']}); skipping API call")
+            else:
                 try:
-                    self.logger.info(f"Weather fetch attempt {attempt + 1}")
                     current_weather = self.fetcher.fetch_current_weather(city, country, units)
-                    if current_weather:
-                        self.logger.info("Weather data fetched successfully")
-                        break
-                    else:
-                        self.logger.warning(f"Attempt {attempt + 1}: No weather data returned")
-                except Exception as attempt_error:
-                    self.logger.warning(f"Attempt {attempt + 1} failed: {attempt_error}")
-                    if attempt == 2:
-                        raise attempt_error
-                    time.sleep(1)
-            
+                except Exception as fetch_error:
+                    self.logger.warning(f"Weather fetch failed: {fetch_error}")
+                    if not stored:
+                        raise
+
             if current_weather:
                 self.current_weather_data = current_weather
                 self.logger.info(f"Current weather data: {current_weather}")
@@ -145,7 +150,10 @@ class GetWeather:
                 
                 # Trigger success callbacks BEFORE graph update
                 self._trigger_callbacks('on_weather_success', current_weather, units)
-                
+            elif stored and stored["stale"]:
+                self.logger.warning(f"API unavailable; showing stored reading for {city}, {country} ({stored['stale_label']})")
+
+            if current_weather or stored:
                 # ⭐ CRITICAL FIX: Update temperature graph with longer delay to ensure DB insert completes
                 if self.root and self.widgets.get('graph_container'):
                     self.logger.info(f"Scheduling temperature graph update for {city}, {country}")
@@ -161,9 +169,9 @@ class GetWeather:
                 
                 # Fetch and display forecast
                 try:
-                    forecast_data = self.fetcher.fetch_five_day_forecast(city, country, units)
-                    if forecast_data:
-                        daily_forecasts = self.extract_five_day_summary(forecast_data)
+                    forecast_table = self.fetcher.fetch_forecast_table(city, country, units)
+                    if forecast_table:
+                        daily_forecasts = self.extract_five_day_summary(forecast_table)
                         self._trigger_callbacks('on_forecast_success', daily_forecasts, units)
                         self.logger.info("Forecast data processed successfully")
                 except Exception as forecast_error:
@@ -193,6 +201,23 @@ class GetWeather:
                 self.root.after(0, lambda: messagebox.showerror("Connection Error", error_msg))
 
 
+    def load_stored_weather(self, city, country):
+        """Newest stored reading for a city tagged with its age, or None if we've never seen it"""
+        try:
+            reading = self.db.get_latest_reading(city, country)
+        except Exception as e:
+            self.logger.warning(f"Could not read stored weather: {e}")
+            return None
+        if not reading:
+            return None
+        try:
+            age = (datetime.utcnow() - datetime.fromisoformat(reading["api_timestamp"])).total_seconds()
+        except (TypeError, ValueError):
+            age = float("inf")
+        reading["age_seconds"] = age
+        reading["stale"] = age > self.fresh_age
+        reading["stale_label"] = f"🕒 Updated {describe_age(age)}" if age != float("inf") else "🕒 Stored reading"
+        return reading
    
     def refresh_for_location(self, city, country):
             """Refresh weather data for a specific location"""
@@ -200,27 +225,8 @@ class GetWeather:
    
    
     def extract_five_day_summary(self, forecast):
-        """Extract 5-day forecast summary from API response"""
-        forecast_list = forecast.get("list", [])
-        daily_data = defaultdict(list)
-              
-        for entry in forecast_list:
-            dt_txt = entry.get("dt_txt")
-            if dt_txt:
-                date = dt_txt.split(" ")[0]
-                daily_data[date].append(entry)
-
-        five_day_forecasts = []
-     
-        for date in sorted(daily_data.keys())[:5]:
-            entries = daily_data[date]
-            preferred_entry = next(
-                (e for e in entries if "12:00:00" in e["dt_txt"]),
-                entries[len(entries)//2]  # fallback to middle of the day
-            )
-            five_day_forecasts.append(preferred_entry)
-
-        return five_day_forecasts
+        """Extract 5-day forecast summary (daily highs/lows) from a ForecastTable"""
+        return self.fetcher.extract_five_day_summary(forecast)
     
     def get_current_weather_data(self):
         """Get the last fetched weather data"""
@@ -230,35 +236,20 @@ class GetWeather:
         """Refresh weather data (alias for get_weather_threaded)"""
         self.get_weather_threaded(city, country)
 
-    def extract_hourly_from_forecast(self, forecast_data, units):
-        """Extract hourly data from forecast response"""
+    def extract_hourly_from_forecast(self, forecast_table, units):
+        """Extract hourly data from a ForecastTable"""
         try:
-            forecast_list = forecast_data.get("list", [])
-            hourly_data = []            
-           
-            for entry in forecast_list[:8]:
-                dt_txt = entry.get("dt_txt", "")
-                if dt_txt:                   
-                    try:
-                        dt = datetime.strptime(dt_txt, "%Y-%m-%d %H:%M:%S")
-                        time_str = dt.strftime("%I:%M %p")
-                    except:
-                        time_str = dt_txt.split(" ")[1][:5]
-                else:
-                    time_str = "N/A"                
-                main_data = entry.get('main', {})
-                weather_data = entry.get('weather', [{}])[0]
-                
-                hourly_entry = {
-                    'time': time_str,
-                    'temp': main_data.get('temp', 0),
-                    'weather_main': weather_data.get('main', ''),
-                    'weather_desc': weather_data.get('description', ''),
-                    'humidity': main_data.get('humidity', 0),
-                    'pop': entry.get('pop', 0) * 100  # Convert to percentage
-                }
-                hourly_data.append(hourly_entry)
-            
+            hourly_data = []
+            for i in range(min(8, len(forecast_table))):
+                dt = datetime.strptime(forecast_table.dt_txt[i], "%Y-%m-%d %H:%M:%S")
+                hourly_data.append({
+                    'time': dt.strftime("%I:%M %p"),
+                    'temp': forecast_table.temp[i],
+                    'weather_main': forecast_table.weather_main[i],
+                    'weather_desc': forecast_table.weather_desc[i],
+                    'humidity': forecast_table.humidity[i],
+                    'pop': forecast_table.pop[i] * 100  # Convert to percentage
+                })
             return hourly_data
         except Exception as e:
             self.logger.error(f"Error extracting hourly from forecast: {e}")
@@ -293,9 +284,9 @@ class GetWeather:
 
             if not hourly_data:
                 try:
-                    forecast_data = self.fetcher.fetch_five_day_forecast(city, country, units)
-                    if forecast_data and 'list' in forecast_data:
-                        hourly_data = self.extract_hourly_from_forecast(forecast_data, units)
+                    forecast_table = self.fetcher.fetch_forecast_table(city, country, units)
+                    if forecast_table:
+                        hourly_data = self.extract_hourly_from_forecast(forecast_table, units)
                         print(f"DEBUG: Fallback hourly_data length: {len(hourly_data) if hourly_data else 'None'}")
                 except Exception as fallback_error:
                     self.logger.error(f"Fallback hourly data fetch failed: {fallback_error}")
@@ -30,7 +30,29 @@ class Config:
     request_timeout: int = 10
     base_url: str = 'https://api.openweathermap.org/data/2.5'
     default_timezone: str = 'America/New_York'
-
+    requests_per_second: float = 1.0  # the free tier allows 60 calls per minute
+    rate_limit_burst: int = 5
+    max_concurrency: int = 20
+    alert_refresh_minutes: int = 10
+    forecast_ttl_minutes: int = 10
+    http_cache_dir: str = ''
+    http_cache_ttl: int = 240  # below poll_min_minutes, so a poll never replays the previous response
+    api_key_status_path: str = ''
+    api_key_recheck_hours: int = 24
+    http_pool_size: int = 20
+    http_keep_alive: bool = True
+    http2: bool = False
+    comparison_max_age_minutes: int = 10
+    offline_fresh_minutes: int = 10
+    poll_min_minutes: int = 5
+    poll_max_minutes: int = 120
+    hourly_request_budget: int = 1000
+    write_batch_size: int = 500
+    write_flush_seconds: float = 1.0
+    raw_retention_days: int = 0  # 0 keeps raw readings forever
+    hourly_rollup_retention_days: int = 0
+    archive_dir: str = ''
+    maintenance_interval_hours: int = 6
 
     logger: Optional[logging.Logger] = None
 
@@ -57,5 +79,28 @@ class Config:
             request_timeout=int(os.getenv('REQUEST_TIMEOUT', '10')),
             base_url=os.getenv('BASE_URL', 'https://api.openweathermap.org/data/2.5'),
             default_timezone=default_tz,
+            requests_per_second=float(os.getenv('REQUESTS_PER_SECOND', '1')),
+            rate_limit_burst=int(os.getenv('RATE_LIMIT_BURST', '5')),
+            max_concurrency=int(os.getenv('MAX_CONCURRENCY', '20')),
+            alert_refresh_minutes=int(os.getenv('ALERT_REFRESH_MINUTES', '10')),
+            forecast_ttl_minutes=int(os.getenv('FORECAST_TTL_MINUTES', '10')),
+            http_cache_dir=os.getenv('HTTP_CACHE_DIR', './data/http_cache'),
+            http_cache_ttl=int(os.getenv('HTTP_CACHE_TTL', '240')),
+            api_key_status_path=os.getenv('API_KEY_STATUS_PATH', './data/api_key_status.json'),
+            api_key_recheck_hours=int(os.getenv('API_KEY_RECHECK_HOURS', '24')),
+            http_pool_size=int(os.getenv('HTTP_POOL_SIZE', '20')),
+            http_keep_alive=os.getenv('HTTP_KEEP_ALIVE', 'true').lower() in ('1', 'true', 'yes'),
+            http2=os.getenv('HTTP2', 'false').lower() in ('1', 'true', 'yes'),
+            comparison_max_age_minutes=int(os.getenv('COMPARISON_MAX_AGE_MINUTES', '10')),
+            offline_fresh_minutes=int(os.getenv('OFFLINE_FRESH_MINUTES', '10')),
+            poll_min_minutes=int(os.getenv('POLL_MIN_MINUTES', '5')),
+            poll_max_minutes=int(os.getenv('POLL_MAX_MINUTES', '120')),
+            hourly_request_budget=int(os.getenv('HOURLY_REQUEST_BUDGET', '1000')),
+            write_batch_size=int(os.getenv('WRITE_BATCH_SIZE', '500')),
+            write_flush_seconds=float(os.getenv('WRITE_FLUSH_SECONDS', '1.0')),
+            raw_retention_days=int(os.getenv('RAW_RETENTION_DAYS', '0')),
+            hourly_rollup_retention_days=int(os.getenv('HOURLY_ROLLUP_RETENTION_DAYS', '0')),
+            archive_dir=os.getenv('ARCHIVE_DIR', ''),
+            maintenance_interval_hours=int(os.getenv('MAINTENANCE_INTERVAL_HOURS', '6')),
             logger=logger
         )
\ No newline at end of file
@@ -2,7 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
 from features.simple_statistics import SimpleStatsPanel
-from services.weather_stats import get_weather_stats
+from services.city_comparison import iter_city_comparisons, parse_locations
 from datetime import datetime
 import threading
 from weather_db import WeatherDB
@@ -11,11 +11,14 @@ from typing import Dict, List
 from config import Config 
 from features.weather_icons import WeatherIconManager
 class CityComparisonPanel:
-    def __init__(self, parent_tab, fetcher, db, logger):
+    def __init__(self, parent_tab, fetcher, db, logger, cfg=None):
         self.fetcher = fetcher
         self.db = db
         self.logger = logger
+        # Stored readings younger than this are shown instead of re-fetching
+        self.max_age = getattr(cfg, "comparison_max_age_minutes", 10) * 60
         self.comparison_data = {}
+        self.city_cards = []
         self.main_frame = ttk.Frame(parent_tab, padding=25)
         self.main_frame.pack(expand=True, fill='both')
 
@@ -29,7 +32,7 @@ class CityComparisonPanel:
         header_frame.pack(fill='x', pady=(0, 25))
 
         ttk.Label(header_frame, text="🆚 City Weather Comparison", font=("Segoe UI", 22, "bold")).pack(pady=(0, 5))
-        ttk.Label(header_frame, text="Compare current weather conditions and statistics between two cities",
+        ttk.Label(header_frame, text="Compare current weather conditions and statistics between cities",
                   font=("Segoe UI", 12), foreground="#666666").pack()
 
     def create_input_section(self):
@@ -68,6 +71,12 @@ class CityComparisonPanel:
         grid_frame.columnconfigure(0, weight=1)
         grid_frame.columnconfigure(2, weight=1)
 
+        more_frame = ttk.Frame(input_frame)
+        more_frame.pack(fill='x', pady=(15, 0))
+        ttk.Label(more_frame, text="➕ More Cities (City, CC; City, CC):", font=("Segoe UI", 10, "bold")).pack(anchor='w')
+        self.extra_cities_entry = ttk.Entry(more_frame, font=("Segoe UI", 11))
+        self.extra_cities_entry.pack(fill='x', pady=(2, 0))
+
         button_frame = ttk.Frame(input_frame)
         button_frame.pack(fill='x', pady=(20, 0))
 
@@ -97,52 +106,42 @@ class CityComparisonPanel:
         ttk.Label(welcome_frame, text="🌤️", font=("Segoe UI", 72)).pack(pady=(50, 20))
         ttk.Label(welcome_frame, text="Ready to Compare Cities", font=("Segoe UI", 18, "bold")).pack()
         ttk.Label(welcome_frame,
-                  text="Enter two cities above and click 'Compare Cities' to see the weather comparison",
+                  text="Enter cities above and click 'Compare Cities' to see the weather comparison",
                   font=("Segoe UI", 11), foreground="#666666").pack(pady=(10, 0))
 
     def compare_cities_threaded(self):
         threading.Thread(target=self.compare_cities, daemon=True).start()
 
+    def get_locations(self):
+        locations = []
+        for city_entry, country_entry in ((self.city1_entry, self.country1_entry), (self.city2_entry, self.country2_entry)):
+            city = city_entry.get().strip()
+            if city:
+                locations.append((city, country_entry.get().strip().upper() or "US"))
+        return locations + parse_locations(self.extra_cities_entry.get())
+
     def compare_cities(self):
         self.root_after_idle(self.show_loading)
 
-        city_a = self.city1_entry.get().strip()
-        city_b = self.city2_entry.get().strip()
-        country_a = self.country1_entry.get().strip() or "US"
-        country_b = self.country2_entry.get().strip() or "US"
-        
-        # FIX: Always use imperial units for US cities, metric for others
-        units_a = "imperial" if country_a.upper() == "US" else "metric"
-        units_b = "imperial" if country_b.upper() == "US" else "metric"
-        
-        if not city_a or not city_b:
-            self.root_after_idle(lambda: messagebox.showwarning("Missing Input", "Please enter both cities."))
+        locations = self.get_locations()
+        if len(locations) < 2:
+            self.root_after_idle(lambda: messagebox.showwarning("Missing Input", "Please enter at least two cities."))
             self.root_after_idle(self.hide_loading)
             return
 
         try:
-         
-            data_a = self.fetcher.fetch_current_weather(city_a, country_a, units_a)
-            data_b = self.fetcher.fetch_current_weather(city_b, country_b, units_b)
-
-            if not data_a or not data_b:
-                self.root_after_idle(lambda: messagebox.showerror("❌ Compare Error", "Could not fetch weather for one or both cities."))
-                self.root_after_idle(self.hide_loading)
-                return
+            results = [None] * len(locations)
+            self.root_after_idle(lambda: self.prepare_city_cards(len(locations)))
 
-            city_a_name = data_a.get("city") or data_a.get("name")
-            country_a_code = data_a.get("country") or data_a.get("sys", {}).get("country")
+            # Cards fill in as each city arrives instead of after the slowest one
+            for index, result in iter_city_comparisons(self.fetcher, self.db, locations, max_age=self.max_age):
+                results[index] = result
+                self.root_after_idle(lambda i=index, r=result, loc=locations[index]: self.show_city_result(i, r, loc))
 
-            city_b_name = data_b.get("city") or data_b.get("name")
-            country_b_code = data_b.get("country") or data_b.get("sys", {}).get("country")
-   
-            stats_a = get_weather_stats(self.db, city_a_name, country_a_code)
-            stats_b = get_weather_stats(self.db, city_b_name, country_b_code)
-
-            self.comparison_data = {
-                'city_a': {'data': data_a, 'stats': stats_a},
-                'city_b': {'data': data_b, 'stats': stats_b}
-            }
+            self.comparison_data = {'cities': [r for r in results if r]}
+            if len(self.comparison_data['cities']) < len(locations):
+                failed = ", ".join(f"{c}, {cc}" for (c, cc), r in zip(locations, results) if not r)
+                self.root_after_idle(lambda: messagebox.showerror("❌ Compare Error", f"Could not fetch weather for: {failed}"))
 
             self.root_after_idle(self.display_comparison_results)
 
@@ -170,29 +169,47 @@ class CityComparisonPanel:
         self.compare_button.config(state='normal')
         self.loading_label.config(text="")
 
-    def display_comparison_results(self):
-        self.hide_loading()
+    def prepare_city_cards(self, count):
         for widget in self.comparison_frame.winfo_children():
             widget.destroy()
 
-        if not self.comparison_data:
+        self.cards_container = ttk.Frame(self.comparison_frame)
+        self.cards_container.pack(expand=True, fill='both')
+        self.city_cards = []
+        columns = min(count, 4)
+        for i in range(count):
+            slot = ttk.Frame(self.cards_container, padding=5)
+            slot.grid(row=i // columns, column=i % columns, sticky="nsew")
+            ttk.Label(slot, text="🔄", font=("Segoe UI", 24)).pack(pady=20)
+            self.city_cards.append(slot)
+        for column in range(columns):
+            self.cards_container.columnconfigure(column, weight=1)
+
+    def show_city_result(self, index, result, location):
+        if index >= len(self.city_cards):
             return
+        slot = self.city_cards[index]
+        for widget in slot.winfo_children():
+            widget.destroy()
+        if result:
+            self.create_city_card(slot, result, f"City {index + 1}", 0)
+        else:
+            ttk.Label(slot, text=f"❌ {location[0]}, {location[1]}", font=("Segoe UI", 12)).pack(pady=20)
 
-        container = ttk.Frame(self.comparison_frame)
-        container.pack(expand=True, fill='both')
+    def display_comparison_results(self):
+        self.hide_loading()
 
-        self.create_city_card(container, self.comparison_data['city_a'], "City A", 0)
-        self.create_comparison_indicators(container)
-        self.create_city_card(container, self.comparison_data['city_b'], "City B", 2)
+        if not self.comparison_data.get('cities'):
+            return
 
-        container.columnconfigure(0, weight=1)
-        container.columnconfigure(2, weight=1)
+        indicator_row = (len(self.city_cards) - 1) // min(len(self.city_cards), 4) + 1
+        self.create_comparison_indicators(self.cards_container, indicator_row)
 
         self.show_detailed_comparison()
 
     def create_city_card(self, container, city_data, label, column):
         frame = ttk.Frame(container, padding=10)
-        frame.grid(row=0, column=column, sticky="nsew")
+        frame.pack(expand=True, fill='both')
 
         name = city_data["data"].get("city", "Unknown")
         temp = city_data["data"].get("temperature", "N/A")
@@ -206,6 +223,8 @@ class CityComparisonPanel:
         ttk.Label(frame, text=f"{name}", font=("Segoe UI", 14, "bold")).pack(pady=(0, 5))
         ttk.Label(frame, text=f"{temp}{unit}", font=("Segoe UI", 20)).pack(pady=5)
         ttk.Label(frame, text=condition.title(), font=("Segoe UI", 12)).pack()
+        if city_data.get("cached"):
+            ttk.Label(frame, text="🕒 From recent reading", font=("Segoe UI", 9), foreground="#999999").pack()
 
         try:
             icon_mgr = WeatherIconManager()
@@ -221,24 +240,25 @@ class CityComparisonPanel:
             print(f"[Icon Error] {e}")
             ttk.Label(frame, text="🌤️", font=("Segoe UI", 32)).pack(pady=5)
                 
-    def create_comparison_indicators(self, container):
+    def create_comparison_indicators(self, container, row=1):
         indicator_frame = ttk.Frame(container, padding=10)
-        indicator_frame.grid(row=0, column=1, sticky="nsew")
-
-        temp_a = self.comparison_data["city_a"]["data"].get("temperature", 0)
-        temp_b = self.comparison_data["city_b"]["data"].get("temperature", 0)
-
-        unit_a = self.comparison_data["city_a"]["data"].get("temp_unit", "°C")
-        unit_b = self.comparison_data["city_b"]["data"].get("temp_unit", "°C")
-        
-        try:
-            diff = round(abs(float(temp_a) - float(temp_b)), 1)
-            unit_label = unit_a if unit_a == unit_b else f"{unit_a.replace('°', '')}"
-            msg = f"🌡️ Temperature Difference: {diff}°{unit_label.replace('°', '')}"
-        except Exception:
-            msg = "🌡️ Temperature Difference: N/A"
-
-        ttk.Label(indicator_frame, text=msg, font=("Segoe UI", 12, "bold"), foreground="#FF6B6B").pack(pady=30)
+        indicator_frame.grid(row=row, column=0, columnspan=4, sticky="nsew")
+
+        temps = {}
+        for city in self.comparison_data["cities"]:
+            unit = city["data"].get("temp_unit", "°C")
+            try:
+                temps.setdefault(unit, []).append((float(city["data"].get("temperature", 0)), city["data"].get("city", "")))
+            except (TypeError, ValueError):
+                continue
+
+        # Only compare temperatures reported in the same unit
+        for unit, values in temps.items():
+            if len(values) < 2:
+                continue
+            (low, low_city), (high, high_city) = min(values), max(values)
+            msg = f"🌡️ Temperature Spread: {round(high - low, 1)}°{unit.replace('°', '')} ({high_city} warmest, {low_city} coolest)"
+            ttk.Label(indicator_frame, text=msg, font=("Segoe UI", 12, "bold"), foreground="#FF6B6B").pack(pady=10)
 
     def show_detailed_comparison(self):
         self.details_frame.pack(fill='both', expand=True, pady=(10, 0))
@@ -246,24 +266,22 @@ class CityComparisonPanel:
         for widget in self.details_frame.winfo_children():
             widget.destroy()
 
-        stats_a = self.comparison_data['city_a']['stats']
-        stats_b = self.comparison_data['city_b']['stats']
-
-   
-        country_a = self.comparison_data['city_a']['data'].get('country', 'US')
-        country_b = self.comparison_data['city_b']['data'].get('country', 'US')
-        
+        cities = self.comparison_data['cities']
         keys = ["avg_temp", "humidity_avg", "wind_avg"]
         labels = {
-            "avg_temp": f"🌡️ Avg Temp ({'°F' if country_a == 'US' else '°C'} vs {'°F' if country_b == 'US' else '°C'})",
+            "avg_temp": "🌡️ Avg Temp",
             "humidity_avg": "💧 Avg Humidity (%)",
             "wind_avg": "🌬️ Avg Wind Speed (km/h)"
         }
 
         for key in keys:
-            val_a = stats_a.get(key, "N/A")
-            val_b = stats_b.get(key, "N/A")
-            summary = f"{labels[key]}: {val_a} vs {val_b}"
+            values = []
+            for city in cities:
+                value = city['stats'].get(key, "N/A")
+                if key == "avg_temp":
+                    value = f"{value}{'°F' if city['data'].get('country', 'US') == 'US' else '°C'}"
+                values.append(f"{city['data'].get('city', '?')} {value}")
+            summary = f"{labels[key]}: " + " vs ".join(values)
             ttk.Label(self.details_frame, text=summary, font=("Segoe UI", 11)).pack(anchor='w', pady=2)
 
         ttk.Separator(self.details_frame, orient='horizontal').pack(fill='x', pady=(10, 10))
@@ -26,6 +26,8 @@ class FavoriteCityPanel:
     def refresh(self):
         self.display.delete(1.0, tk.END)
         locations = self.tracker.get_active_locations()
+        # request_log timestamps are ISO strings, so an ISO bound compares correctly and uses the index
+        since = (datetime.now(timezone.utc) - timedelta(hours=24)).isoformat()
 
         with self.db.get_connection() as conn:
             for loc in locations:
@@ -33,19 +35,20 @@ class FavoriteCityPanel:
 
                 latest = conn.execute("""
                     SELECT temp, weather_detail, humidity, wind_speed, pressure, timestamp
-                    FROM readings WHERE city = ? AND country = ?
-                    ORDER BY timestamp DESC LIMIT 1
-                """, (city, country)).fetchone()
+                    FROM readings WHERE location_id = ?
+                    ORDER BY ts DESC LIMIT 1
+                """, (loc_id,)).fetchone()
 
                 logs = conn.execute("""
                     SELECT status, COUNT(*) FROM request_log
-                    WHERE location_id = ? AND timestamp > datetime('now', '-24 hours')
+                    WHERE location_id = ? AND timestamp > ?
                     GROUP BY status
-                """, (loc_id,)).fetchall()
+                """, (loc_id, since)).fetchall()
 
                 status_counts = {row["status"]: row["COUNT(*)"] for row in logs}
-                success = status_counts.get("success", 0)
-                errors = sum(c for s, c in status_counts.items() if s != "success")
+                # "queued" rows are fetches handed to the write pipeline
+                success = status_counts.get("success", 0) + status_counts.get("queued", 0)
+                errors = sum(c for s, c in status_counts.items() if s not in ("success", "queued"))
                 total = success + errors
                 rate = f"{(success / total * 100):.1f}%" if total else "N/A"
 
@@ -3,7 +3,7 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.dates import DateFormatter, HourLocator, DayLocator
 import matplotlib.dates as mdates
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import tkinter as tk
 from tkinter import ttk
 import numpy as np
@@ -11,10 +11,18 @@ from matplotlib.container import BarContainer
 import pandas as pd
 import logging
 
+
+def reading_count(readings):
+    """Number of readings in a list of reading dicts or a WeatherDB.read_columns result"""
+    return len(readings["ts"]) if isinstance(readings, dict) else len(readings)
+
+
 class WeatherGraphs:
     def __init__(self, theme_manager=None):
         self.theme_manager = theme_manager
         self.logger = logging.getLogger(__name__)     
+        # Hourly rollup rows (WeatherDB.get_rollups) for the bar chart; raw readings are grouped when unset
+        self.hourly_rollups = None
         self.colors = {
             "primary": "#2563eb",
             "secondary": "#1e40af", 
@@ -42,11 +50,22 @@ class WeatherGraphs:
             }
     
     def process_temperature_data(self, readings, country="US"):      
+        self.logger.info(f"Processing {reading_count(readings)} readings for temperature data")
+        
+        if isinstance(readings, dict):
+            # read_columns arrays are already ordered by ts, so no per-row parsing or sorting
+            valid = ~np.isnan(readings["temp"])
+            temps = readings["temp"][valid].astype(np.float64)
+            if country.upper() == "US":
+                temps = np.where(temps < 50, (temps * 9/5) + 32, temps)
+            # Local time, like the timestamp strings the list path parses
+            times = [datetime.fromtimestamp(ts) for ts in readings["ts"][valid].tolist()]
+            self.logger.info(f"Successfully processed {len(temps)} temperature readings")
+            return temps.tolist(), times
+        
         temps = []
         times = []
         
-        self.logger.info(f"Processing {len(readings)} readings for temperature data")
-        
         for i, reading in enumerate(readings):
             try:
                 temp = None               
@@ -78,7 +97,7 @@ class WeatherGraphs:
                     time_str = reading['dt_txt']
                 elif 'dt' in reading:
                     # Unix timestamp
-                    time_obj = datetime.utcfromtimestamp(reading['dt'])
+                    time_obj = datetime.fromtimestamp(reading['dt'], timezone.utc)
                 elif 'created_at' in reading:
                     time_str = reading['created_at']
                 else:
@@ -92,8 +111,6 @@ class WeatherGraphs:
                             # Try ISO format first
                             if 'T' in time_str:
                                 time_obj = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-                                if time_obj.tzinfo:
-                                    time_obj = time_obj.replace(tzinfo=None)
                             # Try standard format
                             else:
                                 time_obj = datetime.strptime(time_str, "%Y-%m-%d %H:%M:%S")
@@ -109,6 +126,11 @@ class WeatherGraphs:
                 
                 if time_obj is None:
                     continue
+
+                # Stored and API times are UTC; plot local time, as the read_columns path does
+                if time_obj.tzinfo is None:
+                    time_obj = time_obj.replace(tzinfo=timezone.utc)
+                time_obj = time_obj.astimezone().replace(tzinfo=None)
                 
                 temps.append(temp)
                 times.append(time_obj)
@@ -131,12 +153,12 @@ class WeatherGraphs:
     
     def create_enhanced_line_chart(self, parent_frame, readings, country="US"):
      
-        self.logger.info(f"Creating line chart with {len(readings)} readings")
+        self.logger.info(f"Creating line chart with {reading_count(readings)} readings")
         
         temps, times = self.process_temperature_data(readings, country)
         
         if not temps or len(temps) < 1:
-            self._show_no_data_message(parent_frame, f"Processed 0 temperature readings from {len(readings)} input readings")
+            self._show_no_data_message(parent_frame, f"Processed 0 temperature readings from {reading_count(readings)} input readings")
             return None
         
         colors = self.get_theme_colors()
@@ -199,25 +221,42 @@ class WeatherGraphs:
         return canvas
     
     def create_enhanced_bar_chart(self, parent_frame, readings, country="US"):        
-        temps, times = self.process_temperature_data(readings, country)
-        
-        if not temps:
-            self._show_no_data_message(parent_frame, "No temperature data available for bar chart")
-            return None
-        
-        # Group by day for daily averages
-        daily_temps = {}
-        for temp, time in zip(temps, times):
-            day_key = time.strftime('%m/%d')
-            if day_key not in daily_temps:
-                daily_temps[day_key] = []
-            daily_temps[day_key].append(temp)
-        
-        # Calculate daily statistics
-        days = list(daily_temps.keys())
-        avg_temps = [np.mean(daily_temps[day]) for day in days]
-        max_temps = [max(daily_temps[day]) for day in days]
-        min_temps = [min(daily_temps[day]) for day in days]
+        if self.hourly_rollups:
+            # Hourly buckets folded into local days, so days match the raw path's grouping;
+            # display_temp already has the US Celsius readings converted
+            daily = {}
+            for row in self.hourly_rollups:
+                if not row["n"] or row["display_temp_avg"] is None:
+                    continue
+                day = daily.setdefault(datetime.fromtimestamp(row["bucket"]).strftime('%m/%d'), [0, 0.0, [], []])
+                day[0] += row["n"]
+                day[1] += row["display_temp_avg"] * row["n"]
+                day[2].append(row["display_temp_max"])
+                day[3].append(row["display_temp_min"])
+            days = list(daily.keys())
+            avg_temps = [daily[day][1] / daily[day][0] for day in days]
+            max_temps = [max(daily[day][2]) for day in days]
+            min_temps = [min(daily[day][3]) for day in days]
+        else:
+            temps, times = self.process_temperature_data(readings, country)
+            
+            if not temps:
+                self._show_no_data_message(parent_frame, "No temperature data available for bar chart")
+                return None
+            
+            # Group by day for daily averages
+            daily_temps = {}
+            for temp, time in zip(temps, times):
+                day_key = time.strftime('%m/%d')
+                if day_key not in daily_temps:
+                    daily_temps[day_key] = []
+                daily_temps[day_key].append(temp)
+            
+            # Calculate daily statistics
+            days = list(daily_temps.keys())
+            avg_temps = [np.mean(daily_temps[day]) for day in days]
+            max_temps = [max(daily_temps[day]) for day in days]
+            min_temps = [min(daily_temps[day]) for day in days]
         
         # Limit to recent days
         if len(days) > 10:
@@ -348,7 +387,7 @@ class WeatherGraphs:
         debug_label.pack(pady=(0, 50))
     
     def create_enhanced_graph_selector(self, parent_frame, readings, country="US"):
-        self.logger.info(f"Creating graph selector with {len(readings)} readings")
+        self.logger.info(f"Creating graph selector with {reading_count(readings)} readings")
         
         control_frame = tk.Frame(parent_frame, bg='white', relief='solid', bd=1)
         control_frame.pack(fill='x', pady=(0, 15))
@@ -366,9 +405,9 @@ class WeatherGraphs:
         
         # Data info with debugging
         temps, times = self.process_temperature_data(readings, country)
-        info_text = f"Showing {len(temps)} temperature readings from {len(readings)} total readings"
+        info_text = f"Showing {len(temps)} temperature readings from {reading_count(readings)} total readings"
         if not temps:
-            info_text = f"No valid temperature data found in {len(readings)} readings"
+            info_text = f"No valid temperature data found in {reading_count(readings)} readings"
             
         info_label = tk.Label(header_frame, text=info_text,
                              font=("Segoe UI", 11),
@@ -638,18 +677,19 @@ class GraphsAndChartsPanel:
         self.logger.info(f"=== DEBUGGING DATA FOR {city}, {country} ===")
         
         try:
-            # Check all readings in database
-            all_readings = self.db.get_all_readings()
-            self.logger.info(f"Total readings in database: {len(all_readings)}")
+            # Count and sample without loading the whole table
+            total_readings = sum(1 for _ in self.db.iter_readings(columns=("id",)))
+            self.logger.info(f"Total readings in database: {total_readings}")
             
             # Check specific city readings
-            city_readings = [r for r in all_readings 
-                            if r.get('city', '').lower() == city.lower() 
-                            and r.get('country', '').lower() == country.lower()]
-            self.logger.info(f"Readings for {city}, {country}: {len(city_readings)}")
+            city_readings = 0
+            sample = None
+            for reading in self.db.iter_readings(city, country):
+                city_readings += 1
+                sample = sample or reading
+            self.logger.info(f"Readings for {city}, {country}: {city_readings}")
             
-            if city_readings:
-                sample = city_readings[0]
+            if sample:
                 self.logger.info(f"Sample reading structure: {sample}")
                 self.logger.info(f"Sample keys: {list(sample.keys())}")
             
@@ -677,8 +717,8 @@ class GraphsAndChartsPanel:
         msgbox.showinfo("Debug Complete", 
                        f"Debug information logged for {city}, {country}.\n"
                        f"Check console/logs for details.\n"
-                       f"Total readings: {len(all_readings) if 'all_readings' in locals() else 'Error'}\n"
-                       f"City readings: {len(city_readings) if 'city_readings' in locals() else 'Error'}")
+                       f"Total readings: {total_readings if 'total_readings' in locals() else 'Error'}\n"
+                       f"City readings: {city_readings if 'city_readings' in locals() else 'Error'}")
     
     def load_enhanced_city_data(self):     
         try:
@@ -690,20 +730,21 @@ class GraphsAndChartsPanel:
             readings = []            
        
             try:
-                readings = self.db.fetch_recent(city, country, 168)  # 1 week
-                self.logger.info(f"Method 1 (fetch_recent): {len(readings)} readings")
+                # 1 week as NumPy columns; only the temperature column is charted
+                now = datetime.now().timestamp()
+                columns = self.db.read_columns(city, country, start=now - 7 * 86400, fields=("temp",))
+                if len(columns["ts"]):
+                    readings = columns
+                self.logger.info(f"Method 1 (read_columns): {len(columns['ts'])} readings")
             except Exception as e:
-                self.logger.warning(f"fetch_recent failed: {e}")
+                self.logger.warning(f"read_columns failed: {e}")
                        
             if not readings:
                 try:
-                    all_readings = self.db.get_all_readings()
-                    readings = [r for r in all_readings 
-                               if r.get('city', '').lower() == city.lower() 
-                               and r.get('country', '').lower() == country.lower()]
-                    self.logger.info(f"Method 2 (filtered all): {len(readings)} readings")
+                    readings = list(self.db.iter_readings(city, country))
+                    self.logger.info(f"Method 2 (filtered all): {reading_count(readings)} readings")
                 except Exception as e:
-                    self.logger.warning(f"get_all_readings failed: {e}")
+                    self.logger.warning(f"iter_readings failed: {e}")
                   
             if not readings:
                 try:
@@ -715,6 +756,13 @@ class GraphsAndChartsPanel:
                 except Exception as e:
                     self.logger.warning(f"fetch_current_weather failed: {e}")
             
+            try:
+                now = datetime.now().timestamp()
+                self.enhanced_graphs.hourly_rollups = self.db.get_rollups("hourly", now - 10 * 86400, now, city, country)
+            except Exception as e:
+                self.enhanced_graphs.hourly_rollups = None
+                self.logger.warning(f"Hourly rollups unavailable: {e}")
+
             if readings:
                 self.current_readings = readings
                 # Clear existing charts
@@ -725,7 +773,7 @@ class GraphsAndChartsPanel:
                 self.enhanced_graphs.create_enhanced_graph_selector(
                     self.enhanced_charts_container, readings, country)
                 
-                self.logger.info(f"Successfully loaded {len(readings)} readings for {city}, {country}")
+                self.logger.info(f"Successfully loaded {reading_count(readings)} readings for {city}, {country}")
             else:
                 # No data message
                 self._show_enhanced_no_data_message(city, country)
@@ -806,7 +854,7 @@ def fix_dashboard_temperature_graph(graph_container, readings, country="US"):
         for widget in graph_container.winfo_children():
             widget.destroy()
         
-        logger.info(f"Creating dashboard graph with {len(readings)} readings")
+        logger.info(f"Creating dashboard graph with {reading_count(readings)} readings")
         
         if not readings:
             placeholder = tk.Label(graph_container,
@@ -820,7 +868,7 @@ def fix_dashboard_temperature_graph(graph_container, readings, country="US"):
         temps, times = weather_graphs.process_temperature_data(readings, country)
         
         if not temps or len(temps) < 1:
-            logger.warning(f"No valid temperature data found in {len(readings)} readings")
+            logger.warning(f"No valid temperature data found in {reading_count(readings)} readings")
             placeholder = tk.Label(graph_container,
                                 text="📈 No valid temperature data found\nTry fetching weather data first",
                                 font=("Segoe UI", 12), bg="white", fg="#e74c3c")
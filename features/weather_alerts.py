@@ -1,15 +1,33 @@
+import functools
 import os
+import sys
 import tkinter as tk
-import requests
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from config import Config
+from services.transport import get_shared_transport
+
 load_dotenv()
 API_KEY = os.getenv('WEATHER_API_KEY')
 UNITS = 'imperial'
 
+
+@functools.lru_cache(maxsize=None)
+def _load_config():
+    try:
+        return Config.load_from_env()
+    except ValueError:
+        return None
+
+
+def _transport():
+    """The process-wide transport, built on first use with HTTP_POOL_SIZE/HTTP2 from the environment"""
+    return get_shared_transport(_load_config())
+
 def get_coordinates(city_name):
-    geo_url = f"https://api.openweathermap.org/geo/1.0/direct?q={city_name}&limit=1&appid={API_KEY}"
-    response = requests.get(geo_url)
+    geo_url = "https://api.openweathermap.org/geo/1.0/direct"
+    response = _transport().get(geo_url, params={"q": city_name, "limit": 1, "appid": API_KEY}, timeout=10)
     if response.status_code == 200:
         results = response.json()
         if results:
@@ -23,8 +41,8 @@ def get_weather(city_name):
         alert_label.config(text="")
         return
 
-    weather_url = f"https://api.openweathermap.org/data/3.0/onecall?lat={lat}&lon={lon}&appid={API_KEY}&units={UNITS}"
-    response = requests.get(weather_url)
+    weather_url = "https://api.openweathermap.org/data/3.0/onecall"
+    response = _transport().get(weather_url, params={"lat": lat, "lon": lon, "appid": API_KEY, "units": UNITS}, timeout=10)
 
     if response.status_code == 200:
         data = response.json()
@@ -5,10 +5,14 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import numpy as np
 from datetime import datetime, timedelta
-import sqlite3
 import csv
 
+from weather_db import to_epoch
+
 class HistoryTracker:  
+    # Columns the graph, table and statistics read through WeatherDB.read_columns
+    HISTORY_FIELDS = ("temp", "weather_summary", "humidity", "wind_speed")
+
     def __init__(self, parent_tab, db):
         self.db = db
  
@@ -288,36 +292,63 @@ class HistoryTracker:
             else:  
                 start_date = datetime(2020, 1, 1)            
             
-            data = self.fetch_weather_data(start_date, end_date)
+            # Long ranges read pre-aggregated buckets instead of every raw reading
+            grain = {"30 days": "hourly", "90 days": "daily", "All time": "daily"}.get(time_range)
+            columns = self.fetch_weather_columns(start_date, end_date, grain)
                         
-            self.update_graph(data)            
+            self.update_graph(columns)            
          
-            self.update_table(data)            
+            self.update_table(columns)            
            
-            self.update_statistics(data)
+            self.update_statistics(columns)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load data: {str(e)}")
     
+    def fetch_weather_columns(self, start_date, end_date, grain=None):
+        """NumPy arrays for the range: ts, temp, humidity, wind_speed and weather_summary codes/labels"""
+        try:
+            if grain:
+                # Rollup rows carry bucket averages; n and the true extremes ride along for the statistics
+                rows = self.db.get_rollups(grain, start_date.timestamp(), end_date.timestamp())
+                columns = self.rows_to_columns([
+                    (row["bucket"], row["temp_avg"], row["condition"], row["humidity_avg"], row["wind_speed_avg"])
+                    for row in rows
+                ])
+                columns["n"] = np.array([row["n"] or 0 for row in rows], dtype=np.int64)
+                for field in ("temp_min", "temp_max"):
+                    columns[field] = np.array([np.nan if row[field] is None else row[field] for row in rows],
+                                              dtype=np.float32)
+                return columns
+            return self.db.read_columns(start=start_date.timestamp(), end=end_date.timestamp(),
+                                        fields=self.HISTORY_FIELDS)
+
+        except Exception as e:
+            print(f"Database error: {e}")
+            return self.rows_to_columns(self.generate_sample_data())
+
+    @staticmethod
+    def rows_to_columns(rows):
+        """read_columns layout for (timestamp, temp, summary, humidity, wind) tuples; timestamps may be ISO or epoch"""
+        def number(value):
+            return np.nan if value is None else value
+
+        ts = [to_epoch(row[0]) if isinstance(row[0], str) else row[0] for row in rows]
+        labels, codes = np.unique(np.array([row[2] or "" for row in rows], dtype=object), return_inverse=True)
+        return {
+            "ts": np.array(ts, dtype=np.int64),
+            "temp": np.array([number(row[1]) for row in rows], dtype=np.float32),
+            "weather_summary": codes.astype(np.int32),
+            "weather_summary_labels": labels,
+            "humidity": np.array([number(row[3]) for row in rows], dtype=np.float32),
+            "wind_speed": np.array([number(row[4]) for row in rows], dtype=np.float32),
+        }
+
     def fetch_weather_data(self, start_date, end_date):      
+        """Raw (timestamp, temp, summary, humidity, wind) rows for CSV export"""
         try:
-            conn = sqlite3.connect(self.db.db_path)
-            cursor = conn.cursor()
-            
-            # Query data
-            query = """
-                SELECT timestamp, temperature, weather_summary, humidity, wind_speed
-                FROM weather_data 
-                WHERE timestamp BETWEEN ? AND ?
-                ORDER BY timestamp
-            """
-            
-            cursor.execute(query, (start_date.isoformat(), end_date.isoformat()))
-            data = cursor.fetchall()
-            
-            conn.close()
-            
-            return data
+            # Index range scan on the epoch column
+            return self.db.fetch_range(start_date.timestamp(), end_date.timestamp())
             
         except Exception as e:
             print(f"Database error: {e}")
@@ -326,7 +357,7 @@ class HistoryTracker:
     def generate_sample_data(self):
        
         data = []
-        base_date = datetime.now() - timedelta(days=7)
+        base_date = datetime.utcnow() - timedelta(days=7)  # naive UTC, like stored timestamps
         
         for i in range(168):  # 7 days * 24 hours
             timestamp = base_date + timedelta(hours=i)
@@ -339,26 +370,22 @@ class HistoryTracker:
         
         return data
     
-    def update_graph(self, data):
-        if not data:
+    def update_graph(self, columns):
+        if not len(columns["ts"]):
             return
         
         # Clear previous plot
         self.ax.clear()
         
-        timestamps = [datetime.fromisoformat(row[0]) for row in data]
-        temperatures = [float(row[1]) for row in data]
+        # ts is UTC epoch; plot in local time, like graphs_and_charts
+        timestamps = [datetime.fromtimestamp(ts) for ts in columns["ts"].tolist()]
+        temperatures = columns["temp"]
         
         # Convert temperature if needed
         if self.temp_unit_var.get() == "Fahrenheit":
-            temperatures = [(temp) for temp in temperatures]
             unit = "°F"
         else:
             unit = "°C"
-       
-
-        timestamps = np.array(timestamps)
-        temperatures = np.array(temperatures)
 
         # Plot based on graph type
         graph_type = self.graph_type_var.get()
@@ -383,10 +410,12 @@ class HistoryTracker:
         self.fig.autofmt_xdate()
         
         # Add trend line for line graphs
-        if graph_type == "Line" and len(timestamps) > 1:
-            z = np.polyfit(range(len(temperatures)), temperatures, 1)
+        positions = np.arange(len(temperatures))
+        valid = ~np.isnan(temperatures)
+        if graph_type == "Line" and np.count_nonzero(valid) > 1:
+            z = np.polyfit(positions[valid], temperatures[valid], 1)
             p = np.poly1d(z)
-            self.ax.plot(timestamps, p(range(len(temperatures))), 
+            self.ax.plot(timestamps, p(positions), 
                         "--", color='#e74c3c', alpha=0.8, linewidth=2, label='Trend')
             self.ax.legend()
         
@@ -395,52 +424,60 @@ class HistoryTracker:
         # Refresh canvas
         self.canvas.draw()
     
-    def update_table(self, data):
+    def update_table(self, columns):
         # Clear existing items
         for item in self.tree.get_children():
             self.tree.delete(item)
         
+        unit = "°F" if self.temp_unit_var.get() == "Fahrenheit" else "°C"
+        labels = columns["weather_summary_labels"]
+        count = len(columns["ts"])
+        
         # Add new data
-        for row in data[-50:]:  # Show last 50 records
-            timestamp = datetime.fromisoformat(row[0])
+        for i in range(max(0, count - 50), count):  # Show last 50 records
+            timestamp = datetime.fromtimestamp(int(columns["ts"][i]))
             date_str = timestamp.strftime("%Y-%m-%d")
             time_str = timestamp.strftime("%H:%M")
             
-       
-            temp = float(row[1])
-            if self.temp_unit_var.get() == "Fahrenheit":
-                temp = (temp)
-                temp_str = f"{temp:.1f}°F"
-            else:
-                temp_str = f"{temp:.1f}°C"
+            temp = columns["temp"][i]
+            temp_str = "N/A" if np.isnan(temp) else f"{temp:.1f}{unit}"
             
-            condition = row[2]
-            humidity = f"{row[3]}%" if row[3] else "N/A"
-            wind_speed = f"{row[4]} mph" if row[4] else "N/A"
+            condition = labels[columns["weather_summary"][i]]
+            humidity, wind_speed = columns["humidity"][i], columns["wind_speed"][i]
+            humidity = f"{humidity:g}%" if humidity and not np.isnan(humidity) else "N/A"
+            wind_speed = f"{wind_speed:g} mph" if wind_speed and not np.isnan(wind_speed) else "N/A"
             
             self.tree.insert("", "end", values=(date_str, time_str, temp_str, condition, humidity, wind_speed))
     
-    def update_statistics(self, data):
-        if not data:
+    def update_statistics(self, columns):
+        data_points = len(columns["ts"])
+        temperatures = columns["temp"][~np.isnan(columns["temp"])]
+        if not data_points or not len(temperatures):
             return
         
         # Calculate statistics
-        temperatures = [float(row[1]) for row in data]
-        
         if self.temp_unit_var.get() == "Fahrenheit":
-            temperatures = [(temp) for temp in temperatures]
             unit = "°F"
         else:
             unit = "°C"
         
-        avg_temp = np.mean(temperatures)
-        max_temp = np.max(temperatures)
-        min_temp = np.min(temperatures)
-        data_points = len(data)
+        if "n" in columns:
+            # Rollup buckets: weight averages by reading count and take extremes from the bucket min/max
+            valid = ~np.isnan(columns["temp"])
+            weights = columns["n"][valid]
+            data_points = int(columns["n"].sum())
+            avg_temp = np.average(temperatures, weights=weights) if weights.sum() else temperatures.mean(dtype=np.float64)
+            max_temp = np.nanmax(columns["temp_max"])
+            min_temp = np.nanmin(columns["temp_min"])
+        else:
+            avg_temp = temperatures.mean(dtype=np.float64)
+            max_temp = temperatures.max()
+            min_temp = temperatures.min()
         
         # Most common condition
-        conditions = [row[2] for row in data]
-        most_common = max(set(conditions), key=conditions.count) if conditions else "N/A"
+        labels = columns["weather_summary_labels"]
+        counts = np.bincount(columns["weather_summary"], minlength=len(labels))
+        most_common = (labels[counts.argmax()] or "N/A") if len(labels) else "N/A"
         
         # Update statistics
         stats_data = [
@@ -2,6 +2,7 @@ import os
 import logging
 from dotenv import load_dotenv
 from weather_data_fetcher import WeatherDataFetcher
+from async_weather_fetcher import AsyncWeatherDataFetcher
 from weather_db import WeatherDB
 from automated_weather_tracker import AutomatedWeatherTracker
 from weather_display_ui import WeatherAppGUI
@@ -43,20 +44,35 @@ def initialize_system():
     return config, fetcher, db
 
 def run_dashboard(config, fetcher, db):
-    tracker = AutomatedWeatherTracker(collector=fetcher, database=db)
+    async_fetcher = AsyncWeatherDataFetcher(
+        config,
+        geocode_cache=fetcher.geocode_cache,
+        alert_monitor=fetcher.alert_monitor,
+        http_cache=fetcher.http_cache,
+        circuit_breaker=fetcher.circuit_breaker,
+        api_key_status=fetcher.api_key_status,
+        rate_limiter=fetcher.rate_limiter
+    )
+    # Tracker sweeps write one reading and one log row per city; batch them on a writer thread
+    db.start_write_pipeline(config.write_batch_size, config.write_flush_seconds)
+    tracker = AutomatedWeatherTracker(collector=fetcher, database=db, async_collector=async_fetcher)
     
     for city in db.get_all_locations():
         tracker.add_location(city["city"], city["country"])
 
-    threading.Thread(target=tracker.start_scheduled_collection, args=(30,), daemon=True).start()
+    # Sweep before the timers start so their first polls are an interval out, not a second fetch
     tracker.collect_all_locations()
+    threading.Thread(target=tracker.start_scheduled_collection, args=(30,), daemon=True).start()
+    fetcher.alert_monitor.start()
+    if not db.flush_writes():
+        print("⚠️ Some startup readings could not be saved; see the write pipeline errors above")
     db.export_readings_to_csv("weather_readings.csv")
     # Show forecast preview for Knoxville
     city, country = "Knoxville", "US"
-    forecast_data = fetcher.fetch_five_day_forecast(city, country)
+    forecast_table = fetcher.fetch_forecast_table(city, country)
    
-    if forecast_data:
-        five_day_summary = fetcher.extract_five_day_summary(forecast_data)
+    if forecast_table:
+        five_day_summary = fetcher.extract_five_day_summary(forecast_table)
         print(f"\n📅 5-Day Forecast for {city}, {country}:")
         for entry in five_day_summary:
             print(f"{entry['dt_txt']} | {entry['main']['temp']:.1f}°C | {entry['weather'][0]['description']}")
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Hashable, List, Optional
+
+from weather_data_fetcher import GROUP_BATCH_SIZE
+
+
+class AdaptivePollPolicy:
+    """Per-location polling intervals under a global hourly request budget.
+
+    Each location starts at ``base_interval``. After every reading the
+    interval is halved (down to ``min_interval``) when conditions moved
+    noticeably or alerts are active, grown by half (up to ``max_interval``)
+    when they barely changed, and otherwise drifts back toward the base.
+    ``select`` hands out due locations, most overdue first, until the
+    requests spent in the last hour would exceed ``hourly_budget``; a
+    location with a provider city ID costs 1/GROUP_BATCH_SIZE of a request
+    because it is collected through /group.
+    """
+
+    def __init__(self, base_interval: float = 1800, min_interval: float = 300,
+                 max_interval: float = 7200, hourly_budget: float = 1000):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.hourly_budget = hourly_budget
+        self.intervals: Dict[Hashable, float] = {}
+        self.next_due: Dict[Hashable, float] = {}
+        self._last: Dict[Hashable, Dict] = {}
+        self._spent: deque = deque()  # (timestamp, cost)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cost(location: Dict) -> float:
+        return 1.0 / GROUP_BATCH_SIZE if location.get("owm_id") else 1.0
+
+    @staticmethod
+    def change_score(previous: Optional[Dict], reading: Dict) -> float:
+        """How much conditions moved between two readings; ~1 is a noticeable change"""
+        if not previous:
+            return 0.5
+        scale = 1.8 if reading.get("units") == "imperial" else 1.0  # compare temperatures in °C
+        score = abs((reading.get("temp") or 0) - (previous.get("temp") or 0)) / scale / 2.0
+        score += abs((reading.get("pressure") or 0) - (previous.get("pressure") or 0)) / 3.0
+        score += abs((reading.get("humidity") or 0) - (previous.get("humidity") or 0)) / 15.0
+        if reading.get("weather_summary") != previous.get("weather_summary"):
+            score += 1.0
+        return score
+
+    def observe(self, key: Hashable, reading: Dict, alerts_active: bool = False, now: Optional[float] = None) -> float:
+        """Record a new reading and return the location's next polling interval"""
+        now = time.time() if now is None else now
+        with self._lock:
+            interval = self.intervals.get(key, self.base_interval)
+            score = self.change_score(self._last.get(key), reading)
+            if alerts_active or score >= 1.0:
+                interval = max(self.min_interval, interval / 2)
+            elif score < 0.3:
+                interval = min(self.max_interval, interval * 1.5)
+            else:
+                interval = (interval + self.base_interval) / 2
+            self.intervals[key] = interval
+            self._last[key] = {k: reading.get(k) for k in ("temp", "pressure", "humidity", "weather_summary")}
+            self.next_due[key] = now + interval
+            return interval
+
+    def postpone(self, key: Hashable, now: Optional[float] = None) -> None:
+        """Push a location back one interval without learning from it (e.g. after a failure)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.next_due[key] = now + self.intervals.get(key, self.base_interval)
+
+    def _prune(self, now: float) -> None:
+        while self._spent and self._spent[0][0] <= now - 3600:
+            self._spent.popleft()
+
+    def remaining_budget(self, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._prune(now)
+            return self.hourly_budget - sum(cost for _, cost in self._spent)
+
+    def charge(self, locations: List[Dict], now: Optional[float] = None) -> None:
+        """Count requests for locations collected outside ``select`` (e.g. a manual sweep).
+
+        The locations also become due one interval from now, so the timers do
+        not fetch them again right away; ``observe`` refines this per reading.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._spent.append((now, sum(self.cost(loc) for loc in locations)))
+            for loc in locations:
+                self.next_due[loc["id"]] = now + self.intervals.get(loc["id"], self.base_interval)
+
+    def select(self, locations: List[Dict], now: Optional[float] = None) -> List[Dict]:
+        """Due locations that fit in the remaining hourly budget, most overdue first"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._prune(now)
+            remaining = self.hourly_budget - sum(cost for _, cost in self._spent)
+            due = sorted(
+                (loc for loc in locations if self.next_due.get(loc["id"], 0) <= now),
+                key=lambda loc: self.next_due.get(loc["id"], 0)
+            )
+            selected, spent = [], 0.0
+            for loc in due:
+                cost = self.cost(loc)
+                if spent + cost > remaining + 1e-9:  # fractional /group costs accumulate rounding error
+                    break
+                selected.append(loc)
+                spent += cost
+            if selected:
+                self._spent.append((now, spent))
+            return selected
+
+    def next_wakeup(self) -> Optional[float]:
+        with self._lock:
+            return min(self.next_due.values()) if self.next_due else None
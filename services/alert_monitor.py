@@ -0,0 +1,108 @@
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class AlertMonitor:
+    """Weather alerts pipeline, scheduled independently of current conditions.
+
+    Alerts cost a geocode plus a One Call request, and change on the scale of
+    tens of minutes, so they are kept in a TTL cache keyed by location and
+    refreshed in the background for every location the fetcher has seen.
+    ``peek`` never touches the network; ``get_alerts`` refreshes on a miss.
+    A location that is neither fetched nor peeked for ``watch_ttl`` seconds
+    (a one-off search, a removed favorite) stops being refreshed and its
+    alerts are dropped.
+    """
+
+    def __init__(self, fetcher, refresh_interval: float = 600, ttl: Optional[float] = None,
+                 watch_ttl: float = 86400, clock: Callable[[], float] = time.time):
+        self.fetcher = fetcher
+        self.refresh_interval = refresh_interval
+        self.ttl = ttl if ttl is not None else refresh_interval
+        self.watch_ttl = watch_ttl
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self._alerts: Dict[Tuple[str, str], Tuple[float, List[Dict]]] = {}
+        self._watched: Dict[Tuple[str, str], Tuple[str, str, float]] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(city: str, country: Optional[str]) -> Tuple[str, str]:
+        return city.strip().lower(), (country or "").strip().upper()
+
+    def watch(self, city: str, country: Optional[str] = None) -> None:
+        """Add a location to the background refresh set, or keep it there for another ``watch_ttl``"""
+        with self._lock:
+            self._watched[self._key(city, country)] = (city, country or "", self.clock())
+
+    def peek(self, city: str, country: Optional[str] = None) -> List[Dict]:
+        """Cached alerts for a location, or an empty list; never blocks on the network"""
+        key = self._key(city, country)
+        now = self.clock()
+        with self._lock:
+            entry = self._alerts.get(key)
+            if key in self._watched:
+                self._watched[key] = (*self._watched[key][:2], now)
+        if entry and now - entry[0] < self.ttl:
+            return entry[1]
+        return []
+
+    def get_alerts(self, city: str, country: Optional[str] = None) -> List[Dict]:
+        """Cached alerts if still fresh, otherwise fetch them now"""
+        self.watch(city, country)
+        with self._lock:
+            entry = self._alerts.get(self._key(city, country))
+        if entry and self.clock() - entry[0] < self.ttl:
+            return entry[1]
+        return self.refresh(city, country)
+
+    def refresh(self, city: str, country: Optional[str] = None) -> List[Dict]:
+        try:
+            alerts = self.fetcher.fetch_weather_alerts(city, country) or []
+        except Exception as e:
+            self.logger.error(f"Error refreshing alerts for {city}: {e}")
+            return self.peek(city, country)
+        with self._lock:
+            self._alerts[self._key(city, country)] = (self.clock(), alerts)
+        return alerts
+
+    def refresh_due(self) -> int:
+        """Refresh every watched location whose alerts are older than the refresh interval"""
+        now = self.clock()
+        with self._lock:
+            for key in [key for key, (_, _, seen) in self._watched.items() if now - seen >= self.watch_ttl]:
+                del self._watched[key]
+                self._alerts.pop(key, None)
+            due = [
+                (city, country) for key, (city, country, _) in self._watched.items()
+                if now - self._alerts.get(key, (0, []))[0] >= self.refresh_interval
+            ]
+        for city, country in due:
+            if self._stop_event.is_set():
+                break
+            self.refresh(city, country)
+        return len(due)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def loop():
+            while not self._stop_event.is_set():
+                self.refresh_due()
+                self._stop_event.wait(min(60, self.refresh_interval))
+
+        self._thread = threading.Thread(target=loop, daemon=True)
+        self._thread.start()
+        self.logger.info(f"⚠️ Alert monitor started — refreshing every {self.refresh_interval / 60:.0f} min")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+
+class APIKeyStatus:
+    """Remembers whether the API key was accepted, persisted to a small JSON file.
+
+    Only a SHA-256 fingerprint of the key is written to disk. A recorded result
+    is trusted for ``max_age`` seconds; after that (or for a different key) the
+    status is unknown again until the next real request reports back. With an
+    empty ``path`` the status is kept in memory only.
+    """
+
+    def __init__(self, api_key: Optional[str], path: str = "", max_age: float = 86400):
+        self.fingerprint = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()
+        self.path = path
+        self.max_age = max_age
+        self._valid: Optional[bool] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return
+        if entry.get("fingerprint") == self.fingerprint:
+            self._valid = entry.get("valid")
+            self._checked_at = entry.get("checked_at", 0.0)
+
+    @property
+    def valid(self) -> Optional[bool]:
+        """True/False from a recent check, None if the key hasn't been checked recently"""
+        if self._valid is None or time.time() - self._checked_at > self.max_age:
+            return None
+        return self._valid
+
+    def record(self, valid: bool) -> None:
+        with self._lock:
+            # Every successful request would otherwise rewrite the file
+            if self.valid == valid:
+                return
+            self._valid = valid
+            self._checked_at = time.time()
+            if self.path:
+                self._save()
+
+    def _save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": self.fingerprint, "valid": self._valid, "checked_at": self._checked_at}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
@@ -0,0 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from services.weather_stats import get_weather_stats
+from weather_data_fetcher import units_for_country
+
+
+def parse_locations(text: str, default_country: str = "US") -> List[Tuple[str, str]]:
+    """Parse "Tokyo, JP; Paris, FR; Denver" into (city, country) pairs"""
+    locations = []
+    for part in text.split(";"):
+        city, _, country = part.partition(",")
+        if city.strip():
+            locations.append((city.strip(), country.strip().upper() or default_country))
+    return locations
+
+
+def load_city(fetcher, db, city: str, country: str, max_age: Optional[float] = None) -> Optional[Dict]:
+    """Current reading plus stored stats for one city.
+
+    A stored reading fetched within ``max_age`` seconds is served instead of
+    calling the API; the result's ``cached`` flag says which path was taken.
+    """
+    data = db.get_latest_reading(city, country, max_age) if max_age else None
+    cached = data is not None
+    if not cached:
+        data = fetcher.fetch_current_weather(city, country, units_for_country(country))
+        if not data:
+            return None
+    stats = get_weather_stats(db, data.get("city") or city, country=data.get("country") or country)
+    return {"data": data, "stats": stats, "cached": cached}
+
+
+def iter_city_comparisons(fetcher, db, locations: List[Tuple[str, str]], max_age: Optional[float] = None,
+                          max_workers: int = 8) -> Iterator[Tuple[int, Optional[Dict]]]:
+    """Load every location concurrently, yielding ``(index, result)`` as each one finishes.
+
+    Results arrive in completion order, so callers can render each city as
+    soon as it is ready; the whole comparison takes about as long as the
+    slowest single fetch. ``result`` is None when a city could not be loaded.
+    """
+    if not locations:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(locations))) as pool:
+        futures = {
+            pool.submit(load_city, fetcher, db, city, country, max_age): index
+            for index, (city, country) in enumerate(locations)
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception:
+                result = None
+            yield futures[future], result
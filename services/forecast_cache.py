@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class _Flight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+
+
+class ForecastCache:
+    """TTL cache for parsed forecasts with request coalescing.
+
+    Concurrent callers asking for the same key while a download is in flight
+    wait for that one request instead of issuing their own. Failed fetches
+    (``None``) are handed to the waiters but never cached.
+    """
+
+    def __init__(self, ttl: float = 600, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, allow_stale: bool = False) -> Optional[Any]:
+        """Cached value without fetching; ``allow_stale`` also returns expired entries"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and (allow_stale or time.time() - entry[0] < self.ttl):
+                return entry[1]
+        return None
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                return entry[1]
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            return flight.result
+
+        result = None
+        try:
+            result = fetch()
+            return result
+        finally:
+            with self._lock:
+                if result is not None:
+                    self._entries[key] = (time.time(), result)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+                self._in_flight.pop(key, None)
+            flight.result = result
+            flight.event.set()
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -0,0 +1,178 @@
+import copy
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+FLOAT_COLUMNS = ("temp", "feels_like", "temp_min", "temp_max", "wind_speed", "pop")
+INT_COLUMNS = ("dt", "humidity", "pressure", "wind_deg", "clouds", "visibility")
+TEXT_COLUMNS = ("dt_txt", "weather_main", "weather_desc", "weather_icon")
+TEMPERATURE_COLUMNS = ("temp", "feels_like", "temp_min", "temp_max")
+MPS_TO_MPH = 2.236936
+
+
+class ForecastTable:
+    """Column-oriented view of a 5-day/3-hour forecast payload.
+
+    The payload is walked exactly once, into one array per field, and every
+    derived view (hourly cards, daily summaries, the enhanced 5-day payload,
+    recent windows) reads from those columns. Entries are in time order, so
+    each day is a contiguous ``[start, end)`` slice computed up front.
+
+    Tables are parsed from metric payloads; ``in_units("imperial")`` gives
+    the °F/mph view of the same download.
+    """
+
+    def __init__(self, meta: Optional[Dict[str, Any]] = None):
+        self.meta = meta or {}
+        self.units = "metric"
+        self._imperial: Optional["ForecastTable"] = None
+        for name in FLOAT_COLUMNS:
+            setattr(self, name, array("d"))
+        for name in INT_COLUMNS:
+            setattr(self, name, array("q"))
+        for name in TEXT_COLUMNS:
+            setattr(self, name, [])
+        self.day_slices: List[Tuple[str, int, int]] = []
+
+    @classmethod
+    def from_payload(cls, payload: Optional[Dict]) -> Optional["ForecastTable"]:
+        if not payload or "list" not in payload:
+            return None
+        table = cls({k: v for k, v in payload.items() if k != "list"})
+        for entry in payload["list"]:
+            main = entry.get("main")
+            if not main or "dt" not in entry:
+                continue
+            weather = (entry.get("weather") or [{}])[0]
+            wind = entry.get("wind", {})
+            temp = main["temp"]
+            table.dt.append(int(entry["dt"]))
+            table.dt_txt.append(entry.get("dt_txt") or datetime.utcfromtimestamp(entry["dt"]).strftime("%Y-%m-%d %H:%M:%S"))
+            table.temp.append(temp)
+            table.feels_like.append(main.get("feels_like", temp))
+            table.temp_min.append(main.get("temp_min", temp))
+            table.temp_max.append(main.get("temp_max", temp))
+            table.humidity.append(int(main.get("humidity", 0)))
+            table.pressure.append(int(main.get("pressure", 0)))
+            table.weather_main.append(weather.get("main", ""))
+            table.weather_desc.append(weather.get("description", ""))
+            table.weather_icon.append(weather.get("icon", ""))
+            table.wind_speed.append(wind.get("speed", 0))
+            table.wind_deg.append(int(wind.get("deg", 0)))
+            table.clouds.append(int(entry.get("clouds", {}).get("all", 0)))
+            table.visibility.append(int(entry.get("visibility", 10000)))
+            table.pop.append(entry.get("pop", 0))
+
+        start = 0
+        for i in range(1, len(table.dt_txt) + 1):
+            if i == len(table.dt_txt) or table.dt_txt[i][:10] != table.dt_txt[start][:10]:
+                table.day_slices.append((table.dt_txt[start][:10], start, i))
+                start = i
+        return table
+
+    def __len__(self) -> int:
+        return len(self.dt)
+
+    def in_units(self, units: str) -> "ForecastTable":
+        """This table with temperatures and wind speed in ``units``; the imperial copy is built once"""
+        if units != "imperial" or self.units == "imperial":
+            return self
+        if self._imperial is None:
+            table = copy.copy(self)  # the other columns are read-only and shared
+            for name in TEMPERATURE_COLUMNS:
+                setattr(table, name, array("d", (round(value * 9 / 5 + 32, 2) for value in getattr(self, name))))
+            table.wind_speed = array("d", (round(value * MPS_TO_MPH, 2) for value in self.wind_speed))
+            table.units = "imperial"
+            self._imperial = table
+        return self._imperial
+
+    def entry(self, i: int) -> Dict:
+        """Rebuild entry ``i`` in the provider's payload shape"""
+        return {
+            "dt": self.dt[i],
+            "dt_txt": self.dt_txt[i],
+            "main": {
+                "temp": self.temp[i],
+                "feels_like": self.feels_like[i],
+                "temp_min": self.temp_min[i],
+                "temp_max": self.temp_max[i],
+                "pressure": self.pressure[i],
+                "humidity": self.humidity[i]
+            },
+            "weather": [{"main": self.weather_main[i], "description": self.weather_desc[i], "icon": self.weather_icon[i]}],
+            "clouds": {"all": self.clouds[i]},
+            "wind": {"speed": self.wind_speed[i], "deg": self.wind_deg[i]},
+            "visibility": self.visibility[i],
+            "pop": self.pop[i]
+        }
+
+    def preferred_index(self, start: int, end: int) -> int:
+        """Representative entry for a day: midday if present, else the middle one"""
+        for i in range(start, end):
+            if self.dt_txt[i].endswith("12:00:00"):
+                return i
+        return start + (end - start) // 2
+
+    def hourly(self, count: int = 8) -> List[Dict]:
+        """The next ``count`` 3-hour slots as hourly card dicts"""
+        hourly_data = []
+        for i in range(min(count, len(self))):
+            dt = datetime.utcfromtimestamp(self.dt[i])
+            hourly_data.append({
+                "datetime": dt,
+                "time": dt.strftime("%H:%M"),
+                "date": dt.strftime("%m/%d"),
+                "temp": self.temp[i],
+                "feels_like": self.feels_like[i],
+                "temp_min": self.temp_min[i],
+                "temp_max": self.temp_max[i],
+                "humidity": self.humidity[i],
+                "pressure": self.pressure[i],
+                "weather_main": self.weather_main[i],
+                "weather_desc": self.weather_desc[i],
+                "wind_speed": self.wind_speed[i],
+                "wind_deg": self.wind_deg[i],
+                "clouds": self.clouds[i],
+                "visibility": self.visibility[i],
+                "pop": self.pop[i] * 100  # Probability of precipitation
+            })
+        return hourly_data
+
+    def daily_summary(self, days: int = 5) -> List[Dict]:
+        """One summary per day with the real high/low across that day's slots"""
+        summaries = []
+        for date, start, end in self.day_slices[:days]:
+            temp_max = max(self.temp[start:end])
+            temp_min = min(self.temp[start:end])
+            entry = self.entry(self.preferred_index(start, end))
+            entry["main"]["temp_min"] = temp_min
+            entry["main"]["temp_max"] = temp_max
+            entry.update(date=date, daily_range=temp_max - temp_min, entries_count=end - start)
+            summaries.append(entry)
+        return summaries
+
+    def enhanced_payload(self, days: int = 5) -> Dict:
+        """Payload-shaped daily forecast with highs/lows and averaged feels-like/humidity"""
+        enhanced_list = []
+        for _, start, end in self.day_slices[:days]:
+            temp_max = max(self.temp[start:end])
+            temp_min = min(self.temp[start:end])
+            entry = self.entry(self.preferred_index(start, end))
+            entry["main"].update(
+                temp_max=temp_max,
+                temp_min=temp_min,
+                feels_like=sum(self.feels_like[start:end]) / (end - start),
+                humidity=sum(self.humidity[start:end]) / (end - start)
+            )
+            entry["daily_stats"] = {
+                "temp_max": temp_max,
+                "temp_min": temp_min,
+                "temp_range": temp_max - temp_min,
+                "entries_count": end - start
+            }
+            enhanced_list.append(entry)
+        return dict(self.meta, list=enhanced_list, enhanced=True)
+
+    def window(self, center: float, seconds: float) -> List[int]:
+        """Indices of entries within ``seconds`` of the epoch time ``center``"""
+        return [i for i, dt in enumerate(self.dt) if abs(dt - center) <= seconds]
@@ -0,0 +1,48 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class GeocodeCache:
+    """In-memory LRU of city coordinates, backed by the ``locations`` table.
+
+    Coordinates never change, so once a city has been geocoded it is served
+    from memory, or from the database after a restart, instead of the geo API.
+    """
+
+    def __init__(self, db=None, maxsize: int = 1024):
+        self.db = db
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(city: str, country: str) -> Tuple[str, str]:
+        return city.strip().lower(), (country or "").strip().upper()
+
+    def get(self, city: str, country: str) -> Optional[Tuple[float, float]]:
+        key = self._key(city, country)
+        with self._lock:
+            coords = self._entries.get(key)
+            if coords is not None:
+                self._entries.move_to_end(key)
+                return coords
+
+        if self.db is None:
+            return None
+        coords = self.db.get_coordinates(city, country)
+        if coords:
+            self._remember(key, coords)
+        return coords
+
+    def put(self, city: str, country: str, lat: float, lon: float) -> None:
+        self._remember(self._key(city, country), (lat, lon))
+        if self.db is not None:
+            self.db.save_coordinates(city, country, lat, lon)
+
+    def _remember(self, key: Tuple[str, str], coords: Tuple[float, float]) -> None:
+        with self._lock:
+            self._entries[key] = coords
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
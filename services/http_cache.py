@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+
+class HTTPResponseCache:
+    """On-disk cache of JSON API responses keyed by URL + query params.
+
+    Freshness follows ``Cache-Control: max-age``/``no-store``/``no-cache`` and
+    ``Expires`` when the provider sends them, falling back to ``default_ttl``
+    (OpenWeatherMap refreshes roughly every 10 minutes and sends no validators
+    for most endpoints; the default stays under the tracker's 5-minute minimum
+    poll interval so a poll always asks the provider). Stale entries carrying an ``ETag`` or
+    ``Last-Modified`` are revalidated with a conditional request, so a 304
+    costs no body download.
+    """
+
+    IGNORED_PARAMS = {"appid"}
+
+    def __init__(self, cache_dir: str = "./data/http_cache", default_ttl: float = 240):
+        self.cache_dir = cache_dir
+        self.default_ttl = default_ttl
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _key(self, url: str, params: Mapping) -> str:
+        items = sorted((k, str(v)) for k, v in params.items() if k not in self.IGNORED_PARAMS)
+        raw = url + "?" + "&".join(f"{k}={v}" for k, v in items)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def lookup(self, url: str, params: Mapping) -> Optional[Dict]:
+        try:
+            with open(self._path(self._key(url, params)), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def is_fresh(entry: Optional[Dict]) -> bool:
+        return bool(entry) and time.time() < entry.get("expires_at", 0)
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _expiry(self, headers: Mapping) -> Optional[float]:
+        """Absolute expiry time for a response, or None if it must not be stored"""
+        cache_control = (headers.get("Cache-Control") or "").lower()
+        if "no-store" in cache_control:
+            return None
+        if "no-cache" in cache_control:
+            return time.time()
+        match = re.search(r"max-age=(\d+)", cache_control)
+        if match:
+            return time.time() + int(match.group(1))
+        if headers.get("Expires"):
+            try:
+                return parsedate_to_datetime(headers["Expires"]).timestamp()
+            except (TypeError, ValueError):
+                return time.time()
+        return time.time() + self.default_ttl
+
+    def store(self, url: str, params: Mapping, headers: Mapping, data) -> None:
+        expires_at = self._expiry(headers)
+        if expires_at is None:
+            return
+        self._write(self._key(url, params), {
+            "url": url,
+            "stored_at": time.time(),
+            "expires_at": expires_at,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "data": data
+        })
+
+    def revalidated(self, url: str, params: Mapping, entry: Dict, headers: Mapping) -> None:
+        """Extend a stale entry after the server answered 304 Not Modified"""
+        expires_at = self._expiry(headers)
+        if expires_at is None:
+            return
+        entry = dict(entry, stored_at=time.time(), expires_at=expires_at)
+        entry["etag"] = headers.get("ETag") or entry.get("etag")
+        entry["last_modified"] = headers.get("Last-Modified") or entry.get("last_modified")
+        self._write(self._key(url, params), entry)
+
+    def _write(self, key: str, entry: Dict) -> None:
+        # Write-then-rename so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,141 @@
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class JobScheduler:
+    """Heap-ordered timer that runs keyed jobs on one background thread.
+
+    The thread sleeps until the earliest job is due (or until a new job is
+    scheduled ahead of it) instead of waking on a fixed tick. Jobs are keyed,
+    so rescheduling a key replaces its pending run; ``every`` makes a job
+    repeat and ``jitter`` adds up to that many random seconds to each run so
+    jobs scheduled together do not all fire in the same instant. State is
+    per instance: stopping one scheduler never affects another.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time, seed: Optional[int] = None):
+        self.clock = clock
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._jobs: Dict[Hashable, Tuple[float, int, Callable, Optional[float], float]] = {}
+        self._counter = itertools.count()
+        self._random = random.Random(seed)
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def schedule(self, key: Hashable, fn: Callable[[], None], at: Optional[float] = None, delay: float = 0.0,
+                 every: Optional[float] = None, jitter: float = 0.0, replace: bool = True) -> float:
+        """Run ``fn`` at ``at`` (or ``delay`` seconds from now) and return the chosen time.
+
+        With ``replace=False`` an already pending job for ``key`` is kept as is.
+        """
+        with self._cond:
+            if not replace and key in self._jobs:
+                return self._jobs[key][0]
+            when = (self.clock() + delay if at is None else at) + (self._random.uniform(0, jitter) if jitter else 0.0)
+            seq = next(self._counter)
+            self._jobs[key] = (when, seq, fn, every, jitter)
+            heapq.heappush(self._heap, (when, seq, key))
+            if self._heap[0][1] == seq:
+                self._cond.notify()
+            return when
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._cond:
+            return self._jobs.pop(key, None) is not None
+
+    def due_at(self, key: Hashable) -> Optional[float]:
+        with self._cond:
+            job = self._jobs.get(key)
+            return job[0] if job else None
+
+    def next_run_at(self, exclude: Tuple[Hashable, ...] = ()) -> Optional[float]:
+        """Earliest pending run time across all jobs except those keyed in ``exclude``"""
+        with self._cond:
+            times = [job[0] for key, job in self._jobs.items() if key not in exclude]
+            return min(times) if times else None
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._cond:
+            return key in self._jobs
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._jobs)
+
+    def _next_entry(self) -> Optional[Tuple[float, int, Hashable]]:
+        """Earliest live heap entry; entries for cancelled or replaced jobs are dropped lazily"""
+        while self._heap:
+            when, seq, key = self._heap[0]
+            job = self._jobs.get(key)
+            if job and job[1] == seq:
+                return self._heap[0]
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: float) -> List[Tuple[Hashable, Callable]]:
+        due = []
+        entry = self._next_entry()
+        while entry and entry[0] <= now:
+            heapq.heappop(self._heap)
+            key = entry[2]
+            _, _, fn, every, jitter = self._jobs.pop(key)
+            due.append((key, fn))
+            if every:
+                when = now + every + (self._random.uniform(0, jitter) if jitter else 0.0)
+                seq = next(self._counter)
+                self._jobs[key] = (when, seq, fn, every, jitter)
+                heapq.heappush(self._heap, (when, seq, key))
+            entry = self._next_entry()
+        return due
+
+    @staticmethod
+    def _run(jobs: List[Tuple[Hashable, Callable]]) -> None:
+        for key, fn in jobs:
+            try:
+                fn()
+            except Exception as e:
+                logger.error(f"Scheduled job {key!r} failed: {e}")
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """Run every job due at ``now`` on the calling thread; returns how many ran"""
+        with self._cond:
+            due = self._pop_due(self.clock() if now is None else now)
+        self._run(due)
+        return len(due)
+
+    def start(self) -> None:
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._loop, name="job-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                entry = self._next_entry()
+                now = self.clock()
+                if entry is None or entry[0] > now:
+                    self._cond.wait(None if entry is None else entry[0] - now)
+                    continue
+                due = self._pop_due(now)
+            self._run(due)
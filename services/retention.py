@@ -0,0 +1,207 @@
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from weather_db import READINGS_TABLE_SQL
+
+logger = logging.getLogger(__name__)
+
+DAY = 86400
+LOCATION_COLUMNS = ("city", "country", "state")
+
+
+def month_bounds(ts: float) -> Tuple[int, int]:
+    """Epoch start of the UTC month containing ``ts`` and of the month after it"""
+    start = datetime.fromtimestamp(ts, timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+class RetentionManager:
+    """Keeps the raw readings table to a fixed time window and the file compact.
+
+    Every insert already folds its reading into the hourly and daily rollups,
+    so raw rows older than ``raw_days`` are deleted outright and history past
+    the window is served from the rollups; hourly buckets older than
+    ``hourly_days`` are trimmed too, while daily buckets are kept forever.
+    Both windows default to 0, which keeps everything: pruning is opt-in.
+    Because the hot table stays the same size, recent-window queries on
+    ``idx_readings_location_ts`` cost the same however long the tracker runs.
+    Note that ``rebuild_rollups`` only sees raw rows, so buckets past the
+    window cannot be recomputed once pruned.
+
+    With ``archive_dir`` set, rows are copied (with city/country/state) into
+    one SQLite file per UTC month, ``readings_YYYY_MM.db``, before they are
+    deleted; ``fetch_archived`` reads them back.
+
+    Work is done in ``batch_size`` chunks, each its own short transaction, and
+    ``keep_going`` is checked between chunks so a caller can stop as soon as
+    collection needs the database again.
+    """
+
+    def __init__(self, database, raw_days: int = 0, hourly_days: int = 0, archive_dir: Optional[str] = None,
+                 batch_size: int = 5000, vacuum_pages: int = 2000, clock: Callable[[], float] = time.time):
+        self.database = database
+        self.raw_days = raw_days
+        self.hourly_days = hourly_days
+        self.archive_dir = archive_dir or None
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+        self.clock = clock
+
+    @classmethod
+    def from_config(cls, database, config) -> "RetentionManager":
+        return cls(database, raw_days=config.raw_retention_days, hourly_days=config.hourly_rollup_retention_days,
+                   archive_dir=config.archive_dir)
+
+    def _connection(self) -> sqlite3.Connection:
+        # ATTACH, VACUUM and checkpoints must run outside a transaction
+        conn = self.database.connections.connection()
+        conn.commit()
+        return conn
+
+    def partition_path(self, month_start: float) -> str:
+        month = datetime.fromtimestamp(month_start, timezone.utc)
+        return os.path.join(self.archive_dir, f"readings_{month.year:04d}_{month.month:02d}.db")
+
+    def run(self, now: Optional[float] = None, keep_going: Callable[[], bool] = lambda: True) -> Dict[str, int]:
+        """Prune raw readings and hourly buckets, then vacuum/analyze if there is still time"""
+        now = self.clock() if now is None else now
+        result = self.compact(now, keep_going)
+        if keep_going():
+            self.optimize()
+        return result
+
+    def compact(self, now: Optional[float] = None, keep_going: Callable[[], bool] = lambda: True) -> Dict[str, int]:
+        """Delete (after archiving, if enabled) raw readings older than the window.
+
+        Returns counts of ``archived`` and ``deleted`` readings and of
+        ``hourly_deleted`` rollup buckets.
+        """
+        now = self.clock() if now is None else now
+        cutoff = int(now - self.raw_days * DAY)
+        result = {"archived": 0, "deleted": 0, "hourly_deleted": 0}
+        conn = self._connection()
+
+        while self.raw_days and keep_going():
+            oldest = conn.execute("SELECT MIN(ts) FROM readings WHERE ts < ?", (cutoff,)).fetchone()[0]
+            if oldest is None:
+                break
+            month_start, month_end = month_bounds(oldest)
+            finished = self._compact_segment(conn, month_start, min(month_end, cutoff), result, keep_going)
+            if not finished:
+                return result
+
+        if keep_going() and self.hourly_days:
+            hourly_cutoff = int(now - self.hourly_days * DAY)
+            with self.database.get_connection() as conn:
+                for table in ("readings_hourly", "conditions_hourly"):
+                    result["hourly_deleted"] += conn.execute(
+                        f"DELETE FROM {table} WHERE bucket < ?", (hourly_cutoff,)
+                    ).rowcount
+        if any(result.values()):
+            logger.info(f"Retention: archived {result['archived']}, deleted {result['deleted']} readings "
+                        f"and {result['hourly_deleted']} hourly buckets")
+        return result
+
+    def _compact_segment(self, conn: sqlite3.Connection, month_start: int, end: int, result: Dict[str, int],
+                         keep_going: Callable[[], bool]) -> bool:
+        """Move every reading with ``ts < end`` (all within one month) out of the table; False if interrupted"""
+        if self.archive_dir:
+            self._attach_partition(conn, month_start)
+        try:
+            while True:
+                if not keep_going():
+                    return False
+                ids = [row[0] for row in conn.execute(
+                    "SELECT id FROM readings WHERE ts < ? ORDER BY ts LIMIT ?", (end, self.batch_size)
+                )]
+                if not ids:
+                    return True
+                marks = ",".join("?" * len(ids))
+                if self.archive_dir:
+                    # Committed before the delete; a crash in between only re-copies rows, which are ignored
+                    result["archived"] += conn.execute(
+                        f"INSERT OR IGNORE INTO archive.readings SELECT * FROM main.reading_details WHERE id IN ({marks})",
+                        ids
+                    ).rowcount
+                    conn.commit()
+                result["deleted"] += conn.execute(f"DELETE FROM main.readings WHERE id IN ({marks})", ids).rowcount
+                conn.commit()
+        finally:
+            if self.archive_dir:
+                conn.rollback()  # a no-op unless a batch failed; DETACH needs no open transaction
+                conn.execute("DETACH DATABASE archive")
+
+    def _attach_partition(self, conn: sqlite3.Connection, month_start: int) -> None:
+        os.makedirs(self.archive_dir, exist_ok=True)
+        conn.execute("ATTACH DATABASE ? AS archive", (self.partition_path(month_start),))
+        try:
+            conn.execute(READINGS_TABLE_SQL.format(name="archive.readings"))
+            columns = [row[1] for row in conn.execute("PRAGMA archive.table_info(readings)")]
+            # Same column order as the reading_details view, so rows copy with SELECT *
+            for column in LOCATION_COLUMNS:
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE archive.readings ADD COLUMN {column} TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS archive.idx_readings_location_ts ON readings(location_id, ts)")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            conn.execute("DETACH DATABASE archive")
+            raise
+
+    def fetch_archived(self, start: float, end: float, city: Optional[str] = None,
+                       country: Optional[str] = None) -> List[Dict]:
+        """Archived readings with ``start <= ts <= end``, oldest first, read from the monthly partitions"""
+        if not self.archive_dir:
+            return []
+        query = "SELECT * FROM readings WHERE ts BETWEEN ? AND ?"
+        params: list = [int(start), int(end)]
+        if city is not None:
+            location_id = self.database.get_location_id(city, country)
+            if location_id is None:
+                return []
+            query += " AND location_id = ?"
+            params.append(location_id)
+        query += " ORDER BY ts"
+
+        rows: List[Dict] = []
+        month_start = month_bounds(start)[0]
+        while month_start <= end:
+            path = self.partition_path(month_start)
+            if os.path.exists(path):
+                conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+                conn.row_factory = sqlite3.Row
+                try:
+                    rows.extend(dict(row) for row in conn.execute(query, params))
+                finally:
+                    conn.close()
+            month_start = month_bounds(month_start)[1]
+        return rows
+
+    def optimize(self) -> None:
+        """Return free pages to the OS, refresh planner statistics and checkpoint the WAL.
+
+        Databases created before incremental auto-vacuum was enabled get one
+        full VACUUM to switch modes; after that each call frees at most
+        ``vacuum_pages`` pages so it never holds the write lock for long.
+        """
+        # A private autocommit connection: VACUUM refuses to run on one with unfinished cursors
+        conn = sqlite3.connect(self.database.connections.path, timeout=5, isolation_level=None)
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+                logger.info("Retention: converted database to incremental auto-vacuum")
+            else:
+                conn.execute(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)})").fetchall()
+            conn.execute("PRAGMA analysis_limit = 400")
+            conn.execute("PRAGMA optimize")
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error as e:
+            logger.warning(f"Retention: database maintenance skipped: {e}")
+        finally:
+            conn.close()
@@ -0,0 +1,151 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Hashable, List, Optional
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 300.0) -> float:
+    """Exponential backoff with full jitter: uniform in [0, min(cap, base * 2**attempt)]"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker.
+
+    After ``failure_threshold`` consecutive failures a host is "open" and calls
+    are refused for ``reset_timeout`` seconds. After that the host is
+    half-open: the first caller is let through as the single probe and
+    everyone else is refused until ``record_success`` closes the circuit or
+    ``record_failure`` re-opens it (a probe that never reports back is given
+    up on after another ``reset_timeout``). A host can also be held
+    explicitly, e.g. for the duration of a 429's Retry-After.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures: Dict[str, int] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._probe_started: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host: str) -> bool:
+        now = time.time()
+        with self._lock:
+            if now < self._blocked_until.get(host, 0):
+                return False
+            if self._failures.get(host, 0) < self.failure_threshold:
+                return True
+            started = self._probe_started.get(host)
+            if started is not None and now - started < self.reset_timeout:
+                return False  # half-open and another caller's probe is still out
+            self._probe_started[host] = now
+            return True
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            return self._failures.get(host, 0) >= self.failure_threshold
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+            self._blocked_until.pop(host, None)
+            self._probe_started.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            self._probe_started.pop(host, None)
+            if failures >= self.failure_threshold:
+                self._blocked_until[host] = max(self._blocked_until.get(host, 0), time.time() + self.reset_timeout)
+
+    def hold(self, host: str, seconds: float) -> None:
+        with self._lock:
+            self._probe_started.pop(host, None)
+            self._blocked_until[host] = max(self._blocked_until.get(host, 0), time.time() + seconds)
+
+    def retry_in(self, host: Optional[str] = None) -> float:
+        """Seconds until ``host`` (or every host, if None) accepts requests again"""
+        now = time.time()
+        with self._lock:
+            if host is not None:
+                return max(0.0, self._blocked_until.get(host, 0) - now)
+            return max([0.0] + [until - now for until in self._blocked_until.values()])
+
+
+class RetryScheduler:
+    """Parks failed work items until their jittered backoff expires.
+
+    Items are ordered in a min-heap by due time; ``pop_due`` hands back the
+    ones whose time has come so the caller can retry them while everything
+    else keeps moving. Items are dropped after ``max_attempts`` parks.
+    """
+
+    def __init__(self, base_delay: float = 5.0, max_delay: float = 900.0, max_attempts: int = 5):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self._heap: List[tuple] = []
+        self._attempts: Dict[Hashable, int] = {}
+        self._due: Dict[Hashable, float] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def park(self, key: Hashable, item: Any, min_delay: float = 0.0) -> Optional[float]:
+        """Schedule ``item`` for retry; returns the delay, or None once attempts are exhausted"""
+        with self._lock:
+            attempt = self._attempts.get(key, 0)
+            if attempt >= self.max_attempts:
+                self._attempts.pop(key, None)
+                self._due.pop(key, None)
+                return None
+            self._attempts[key] = attempt + 1
+            delay = max(min_delay, backoff_delay(attempt, self.base_delay, self.max_delay))
+            due = time.time() + delay
+            self._due[key] = due
+            heapq.heappush(self._heap, (due, next(self._counter), key, item))
+            return delay
+
+    def pop_due(self, now: Optional[float] = None) -> List[Any]:
+        now = time.time() if now is None else now
+        items = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due, _, key, item = heapq.heappop(self._heap)
+                # Skip entries superseded by a later park() or cleared by forget()
+                if self._due.get(key) == due:
+                    del self._due[key]
+                    items.append(item)
+        return items
+
+    def forget(self, key: Hashable) -> None:
+        """Reset a key after it succeeds"""
+        with self._lock:
+            self._attempts.pop(key, None)
+            self._due.pop(key, None)
+
+    def next_due(self) -> Optional[float]:
+        with self._lock:
+            return min(self._due.values()) if self._due else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._due)
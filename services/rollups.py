@@ -0,0 +1,129 @@
+import math
+from typing import Dict, List, Optional
+
+# Rolled-up reading columns; each gets n/sum/min/max/sum-of-squares per bucket
+ROLLUP_METRICS = ("temp", "humidity", "pressure", "wind_speed", "display_temp")
+# Metrics aggregated from an expression rather than the column of the same name. display_temp
+# is the temperature the stats and charts show: US readings under 50 are taken to be Celsius.
+# A bucket can mix both, so the conversion has to happen per reading, before aggregating.
+METRIC_EXPRESSIONS = {
+    "display_temp": "CASE WHEN upper(locations.country) = 'US' AND temp < 50 THEN temp * 9.0 / 5 + 32 ELSE temp END",
+}
+GRAINS = {"hourly": 3600, "daily": 86400}
+STAT_FIELDS = ("n", "sum", "min", "max", "sq")
+
+
+def _metric_columns() -> List[str]:
+    return [f"{metric}_{field}" for metric in ROLLUP_METRICS for field in STAT_FIELDS]
+
+
+def rollup_schema() -> str:
+    """DDL for readings_hourly / readings_daily and their condition histograms"""
+    columns = ",\n    ".join(
+        f"{column} {'INTEGER NOT NULL DEFAULT 0' if column.endswith('_n') else 'REAL'}" for column in _metric_columns()
+    )
+    statements = []
+    for grain in GRAINS:
+        statements.append(f"""
+CREATE TABLE IF NOT EXISTS readings_{grain} (
+    location_id INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    {columns},
+    PRIMARY KEY (location_id, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_readings_{grain}_bucket ON readings_{grain}(bucket);
+CREATE TABLE IF NOT EXISTS conditions_{grain} (
+    location_id INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    condition TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (location_id, bucket, condition)
+) WITHOUT ROWID;""")
+    return "\n".join(statements)
+
+
+def _upsert_sql(grain: str, width: int) -> str:
+    """Aggregate a range of reading ids into ``readings_<grain>``, merging into existing buckets"""
+    columns = _metric_columns()
+    aggregates = ", ".join(
+        f"COUNT({value}), SUM({value}), MIN({value}), MAX({value}), SUM(({value}) * ({value}))"
+        for value in (METRIC_EXPRESSIONS.get(metric, metric) for metric in ROLLUP_METRICS)
+    )
+    updates = []
+    for column in columns:
+        if column.endswith(("_n", "_sum", "_sq")):
+            updates.append(f"{column} = coalesce({column}, 0) + coalesce(excluded.{column}, 0)")
+        else:
+            # Multi-argument min()/max() return NULL if any argument is NULL
+            fn = "min" if column.endswith("_min") else "max"
+            updates.append(f"{column} = coalesce({fn}({column}, excluded.{column}), {column}, excluded.{column})")
+    return (
+        f"INSERT INTO readings_{grain} (location_id, bucket, {', '.join(columns)}) "
+        f"SELECT readings.location_id, ts / {width} * {width}, {aggregates} "
+        f"FROM readings JOIN locations ON locations.id = readings.location_id "
+        f"WHERE readings.id BETWEEN ? AND ? AND ts IS NOT NULL GROUP BY readings.location_id, ts / {width} "
+        f"ON CONFLICT(location_id, bucket) DO UPDATE SET {', '.join(updates)}"
+    )
+
+
+def _condition_sql(grain: str, width: int) -> str:
+    return (
+        f"INSERT INTO conditions_{grain} (location_id, bucket, condition, n) "
+        f"SELECT location_id, ts / {width} * {width}, weather_summary, COUNT(*) FROM readings "
+        f"WHERE id BETWEEN ? AND ? AND ts IS NOT NULL AND weather_summary IS NOT NULL AND weather_summary != '' "
+        f"GROUP BY location_id, ts / {width}, weather_summary "
+        f"ON CONFLICT(location_id, bucket, condition) DO UPDATE SET n = n + excluded.n"
+    )
+
+
+ROLLUP_SQL = [
+    statement
+    for grain, width in GRAINS.items()
+    for statement in (_upsert_sql(grain, width), _condition_sql(grain, width))
+]
+
+
+def apply_rollups(conn, first_id: int, last_id: Optional[int] = None) -> None:
+    """Fold the readings with ids in ``[first_id, last_id]`` into every rollup table.
+
+    The aggregation runs inside SQLite over the freshly inserted id range, one
+    statement per table, and inside the caller's transaction so rollups
+    commit (or roll back) together with the readings. ``last_id`` defaults to
+    ``first_id``.
+    """
+    params = (first_id, first_id if last_id is None else last_id)
+    for statement in ROLLUP_SQL:
+        conn.execute(statement, params)
+
+
+def ensure_rollups(conn) -> None:
+    """Create the rollup tables, rebuilding them from readings when missing or lacking a metric"""
+    existing = [row[1] for row in conn.execute("PRAGMA table_info(readings_hourly)")]
+    if existing and not set(_metric_columns()) <= set(existing):
+        for grain in GRAINS:
+            conn.execute(f"DROP TABLE readings_{grain}")
+            conn.execute(f"DROP TABLE conditions_{grain}")
+        existing = []
+    conn.executescript(rollup_schema())
+    if not existing:
+        rebuild_rollups(conn)
+
+
+def rebuild_rollups(conn) -> None:
+    """Recompute every rollup bucket from the raw readings table"""
+    for grain in GRAINS:
+        conn.execute(f"DELETE FROM readings_{grain}")
+        conn.execute(f"DELETE FROM conditions_{grain}")
+    last_id = conn.execute("SELECT MAX(id) FROM readings").fetchone()[0]
+    if last_id is not None:
+        apply_rollups(conn, 0, last_id)
+
+
+def metric_summary(n: int, total: Optional[float], low: Optional[float], high: Optional[float],
+                   squares: Optional[float]) -> Optional[Dict]:
+    """count/avg/min/max/stddev for one metric from its summed rollup columns"""
+    if not n:
+        return None
+    avg = total / n
+    variance = max(0.0, squares / n - avg * avg)
+    return {"count": n, "avg": avg, "min": low, "max": high, "stddev": math.sqrt(variance)}
@@ -0,0 +1,183 @@
+import bisect
+import hashlib
+import multiprocessing
+import os
+import queue
+from dataclasses import replace
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+from automated_weather_tracker import AutomatedWeatherTracker
+from services.write_pipeline import WritePipeline
+from weather_data_fetcher import WeatherDataFetcher
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent-hash ring mapping keys onto a fixed set of nodes.
+
+    Each node is placed at ``replicas`` points on the ring, which keeps the
+    split even; adding or removing a node only moves the keys adjacent to its
+    points (about 1/N of them) instead of reshuffling everything.
+    """
+
+    def __init__(self, nodes: Iterable[Hashable], replicas: int = 64):
+        self._points = sorted((_hash(f"{node}:{i}"), node) for node in nodes for i in range(replicas))
+        self._hashes = [point for point, _ in self._points]
+        if not self._points:
+            raise ValueError("HashRing needs at least one node")
+
+    def node_for(self, key: Hashable) -> Hashable:
+        index = bisect.bisect(self._hashes, _hash(str(key))) % len(self._points)
+        return self._points[index][1]
+
+
+class QueueSink:
+    """Stands in for WeatherDB inside a shard: every write becomes a message for the parent's writer"""
+
+    def __init__(self, results):
+        self.results = results
+
+    def insert_reading(self, data: Dict) -> bool:
+        self.results.put(("reading", data))
+        return True
+
+    def log_request(self, url: str, location_id: Optional[int], status: str,
+                    error: Optional[str] = None, latency_ms: Optional[int] = None) -> None:
+        self.results.put(("log", (url, location_id, status, error, latency_ms)))
+
+    def save_city_id(self, location_id: int, owm_id: int) -> None:
+        self.results.put(("city_id", (location_id, owm_id)))
+
+
+def _run_shard(index: int, config, transport_factory: Optional[Callable], fetcher_overrides: Dict,
+               tasks, results) -> None:
+    """Worker process: collect each list of locations it is sent until it receives None"""
+    fetcher = WeatherDataFetcher(config, transport=transport_factory() if transport_factory else None)
+    for name, value in fetcher_overrides.items():
+        setattr(fetcher, name, value)
+    tracker = AutomatedWeatherTracker(collector=fetcher, database=QueueSink(results))
+    while True:
+        locations = tasks.get()
+        if locations is None:
+            break
+        try:
+            tracker.retry_parked_locations()
+            tracker.collect_locations(locations)
+        except Exception as e:
+            results.put(("log", ("auto_fetch", None, "error", f"shard {index}: {e}", None)))
+        results.put(("done", index))
+
+
+class ShardedCollector:
+    """Collect the ``locations`` table across N worker processes.
+
+    Locations are assigned to shards by consistent hashing on their id, so a
+    city always lands on the same worker and that worker's caches (geocoding,
+    /group name resolution, retry queue) stay warm between sweeps. Each worker
+    has its own fetcher and transport, and gets an equal slice of the
+    configured request rate and hourly budget so the process as a whole stays
+    within them. Workers never touch SQLite: readings, request-log rows and
+    resolved city IDs come back over a queue and the parent feeds them to a
+    single ``WritePipeline``, which commits every ``batch_size`` rows or
+    ``flush_interval`` seconds.
+
+    ``transport_factory`` (e.g. ``ReplayTransport``) is called inside each
+    worker and must be picklable; ``fetcher_overrides`` are set as attributes
+    on each worker's fetcher.
+    """
+
+    def __init__(self, config, database, workers: Optional[int] = None,
+                 transport_factory: Optional[Callable] = None, fetcher_overrides: Optional[Dict] = None,
+                 batch_size: int = 500, flush_interval: float = 1.0, start_method: str = "spawn"):
+        self.database = database
+        self.workers = workers or os.cpu_count() or 1
+        self.ring = HashRing(range(self.workers))
+        self.shard_config = replace(
+            config,
+            requests_per_second=config.requests_per_second / self.workers,
+            rate_limit_burst=max(1, config.rate_limit_burst // self.workers),
+            hourly_request_budget=max(1, config.hourly_request_budget // self.workers)
+        )
+        self.transport_factory = transport_factory
+        self.fetcher_overrides = fetcher_overrides or {}
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.writer = WritePipeline(database, batch_size, flush_interval)
+        self._context = multiprocessing.get_context(start_method)
+        self._processes: List = []
+        self._tasks: List = []
+        self._results = None
+
+    def partition(self, locations: List[Dict]) -> List[List[Dict]]:
+        shards = [[] for _ in range(self.workers)]
+        for loc in locations:
+            shards[self.ring.node_for(loc["id"])].append(loc)
+        return shards
+
+    def start(self) -> None:
+        if self._processes:
+            return
+        if not self.writer.running:
+            self.writer = WritePipeline(self.database, self.batch_size, self.flush_interval)
+        self._results = self._context.Queue()
+        for index in range(self.workers):
+            tasks = self._context.Queue()
+            process = self._context.Process(
+                target=_run_shard,
+                args=(index, self.shard_config, self.transport_factory, self.fetcher_overrides, tasks, self._results),
+                daemon=True
+            )
+            process.start()
+            self._tasks.append(tasks)
+            self._processes.append(process)
+
+    def stop(self) -> None:
+        """Stop the workers, then commit whatever the writer still holds and stop its thread"""
+        for tasks in self._tasks:
+            tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self._processes, self._tasks, self._results = [], [], None
+        self.writer.close(timeout=10)
+
+    def __enter__(self) -> "ShardedCollector":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def collect_all_locations(self, locations: Optional[List[Dict]] = None) -> int:
+        """Run one sweep across all shards and return the number of readings written"""
+        if locations is None:
+            with self.database.get_connection() as conn:
+                cursor = conn.execute("SELECT id, city, country, owm_id FROM locations WHERE is_active = 1")
+                locations = [dict(row) for row in cursor.fetchall()]
+        self.start()
+
+        pending = 0
+        for tasks, shard in zip(self._tasks, self.partition(locations)):
+            if shard:
+                tasks.put(shard)
+                pending += 1
+
+        written_before = self.writer.written
+        while pending:
+            try:
+                kind, payload = self._results.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if not all(process.is_alive() for process in self._processes):
+                    raise RuntimeError("A collection shard exited unexpectedly")
+                continue
+            if kind == "done":
+                pending -= 1
+            else:
+                self.writer.put(kind, payload)
+
+        self.writer.flush()
+        return self.writer.written - written_before
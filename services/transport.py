@@ -0,0 +1,222 @@
+import copy
+import json
+import logging
+import os
+import random
+import threading
+import time
+import zlib
+from typing import Any, Dict, Mapping, Optional, Protocol
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # only needed for the optional HTTP/2 transport
+    httpx = None
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "fixtures")
+
+
+class Transport(Protocol):
+    """What WeatherDataFetcher needs from an HTTP client.
+
+    ``requests.Session`` satisfies it as-is; anything else only has to return
+    an object with ``status_code``, ``headers`` and ``json()`` and raise a
+    ``requests.RequestException`` for network-level failures. Transports are
+    shared by every thread using a fetcher, so ``get`` must be thread-safe.
+    """
+
+    def get(self, url: str, params: Optional[Mapping] = None, headers: Optional[Mapping] = None,
+            timeout: Optional[float] = None) -> Any:
+        ...
+
+
+class PooledSessionTransport:
+    """requests-based transport: one ``requests.Session`` per thread, one shared pool.
+
+    Sessions carry mutable per-request state (cookies, redirect handling) and
+    are not safe to share between threads, so each thread lazily gets its own.
+    They all mount the same ``HTTPAdapter``, whose urllib3 pool is
+    thread-safe and keeps ``pool_size`` connections per host alive, so
+    threads still reuse each other's TLS connections.
+    """
+
+    def __init__(self, pool_size: int = 20, keep_alive: bool = True):
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.keep_alive = keep_alive
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's session"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+            if not self.keep_alive:
+                session.headers["Connection"] = "close"
+            self._local.session = session
+        return session
+
+    def get(self, url: str, params: Optional[Mapping] = None, headers: Optional[Mapping] = None,
+            timeout: Optional[float] = None) -> requests.Response:
+        return self.session.get(url, params=params, headers=headers, timeout=timeout)
+
+    def close(self) -> None:
+        self.adapter.close()
+
+
+class HTTPXTransport:
+    """HTTP/2-capable transport backed by a pooled ``httpx.Client``.
+
+    Concurrent requests to one host are multiplexed over a single TLS
+    connection. httpx errors are re-raised as ``requests.RequestException`` so
+    callers only handle one exception family.
+    """
+
+    def __init__(self, pool_size: int = 20, keep_alive: bool = True, http2: bool = True):
+        if httpx is None:
+            raise ImportError("httpx is required for HTTPXTransport (pip install 'httpx[http2]')")
+        limits = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size if keep_alive else 0
+        )
+        self.client = httpx.Client(http2=http2, limits=limits)
+
+    def get(self, url: str, params: Optional[Mapping] = None, headers: Optional[Mapping] = None,
+            timeout: Optional[float] = None):
+        try:
+            return self.client.get(url, params=params, headers=headers, timeout=timeout)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.ConnectionError(str(e)) from e
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def create_transport(config=None) -> Transport:
+    """Build the transport described by ``config`` (pool size, keep-alive, HTTP/2)"""
+    pool_size = getattr(config, "http_pool_size", 20)
+    keep_alive = getattr(config, "http_keep_alive", True)
+    if getattr(config, "http2", False):
+        try:
+            return HTTPXTransport(pool_size, keep_alive, http2=True)
+        except ImportError as e:
+            logging.getLogger(__name__).warning(f"⚠️ HTTP/2 unavailable, using requests: {e}")
+    return PooledSessionTransport(pool_size, keep_alive)
+
+
+_shared_transport: Optional[Transport] = None
+_shared_pid: Optional[int] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_transport(config=None) -> Transport:
+    """The process-wide transport, created from ``config`` on first use.
+
+    Every network call site shares it so TLS connections are reused across
+    the fetcher, alerts and sunrise lookups. A forked child builds its own,
+    since pooled sockets must not be shared across processes.
+    """
+    global _shared_transport, _shared_pid
+    with _shared_lock:
+        if _shared_transport is None or _shared_pid != os.getpid():
+            _shared_transport = create_transport(config)
+            _shared_pid = os.getpid()
+        return _shared_transport
+
+
+class ReplayResponse:
+    def __init__(self, status_code: int, data: Any = None, headers: Optional[Dict[str, str]] = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+ENDPOINT_ALIASES = {"json": "sunrise_sunset"}
+
+
+class ReplayTransport:
+    """In-process stand-in for the OpenWeatherMap API, served from recorded fixtures.
+
+    Requests are matched on the last path segment of the URL (``weather``,
+    ``forecast``, ``group``, ``onecall``, ``direct`` for geocoding) to
+    ``<fixtures_dir>/<segment>.json``; sunrise-sunset.org maps to
+    ``sunrise_sunset.json``. Per-city payloads get the requested name and a
+    stable city ID so lookups, /group batching and storage behave as they would
+    live. ``latency`` (plus up to ``jitter``) is
+    slept per call; ``error_rate``, ``rate_limit_rate`` and ``timeout_rate``
+    inject 500s, 429s and ``requests.Timeout`` respectively.
+    """
+
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, timeout_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.timeout_rate = timeout_rate
+        self.fixtures: Dict[str, Any] = {}
+        for name in os.listdir(fixtures_dir):
+            if name.endswith(".json"):
+                with open(os.path.join(fixtures_dir, name), encoding="utf-8") as f:
+                    self.fixtures[name[:-5]] = json.load(f)
+        self.calls: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def city_id(name: str) -> int:
+        return zlib.crc32(name.strip().lower().encode("utf-8")) % 10_000_000
+
+    def get(self, url: str, params: Optional[Mapping] = None, headers: Optional[Mapping] = None,
+            timeout: Optional[float] = None) -> ReplayResponse:
+        params = params or {}
+        endpoint = url.rstrip("/").rsplit("/", 1)[-1]
+        endpoint = ENDPOINT_ALIASES.get(endpoint, endpoint)
+        with self._lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+            roll = self._random.random()
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+        if roll < self.timeout_rate:
+            raise requests.Timeout(f"Replay timeout for {endpoint}")
+        roll -= self.timeout_rate
+        if roll < self.rate_limit_rate:
+            return ReplayResponse(429, {"cod": 429, "message": "rate limited"}, {"Retry-After": "1"})
+        roll -= self.rate_limit_rate
+        if roll < self.error_rate:
+            return ReplayResponse(500, {"cod": 500, "message": "replay error"})
+
+        if endpoint not in self.fixtures:
+            return ReplayResponse(404, {"cod": "404", "message": f"no fixture for {endpoint}"})
+        return ReplayResponse(200, self._payload(endpoint, params))
+
+    def _payload(self, endpoint: str, params: Mapping) -> Any:
+        data = copy.deepcopy(self.fixtures[endpoint])
+        city = str(params.get("q", "")).split(",")[0]
+        if endpoint == "weather" and city:
+            data["name"], data["id"] = city, self.city_id(city)
+            self._names[data["id"]] = city
+        elif endpoint == "forecast" and city:
+            data["city"].update(name=city, id=self.city_id(city))
+        elif endpoint == "direct" and city:
+            data[0]["name"] = city
+        elif endpoint == "group":
+            template = data["list"][0]
+            ids = [int(i) for i in str(params.get("id", "")).split(",") if i]
+            data["list"] = [dict(copy.deepcopy(template), id=i, name=self._names.get(i, f"City {i}")) for i in ids]
+            data["cnt"] = len(ids)
+        return data
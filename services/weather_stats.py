@@ -1,9 +1,131 @@
 from datetime import datetime, timedelta
 import csv
 import logging
+import time
 from typing import Dict, Optional, List
+
+import numpy as np
+
 from config import Config
 
+# Columns get_weather_stats reads through WeatherDB.read_columns
+STAT_FIELDS = ("temp", "humidity", "pressure", "wind_speed", "weather_summary")
+
+
+def assess_coverage(stats: Dict, count: int, hours: int) -> None:
+    """Fill coverage_percentage/data_quality assuming one reading per hour is ideal"""
+    coverage = min(100.0, (count / hours) * 100)
+    stats["coverage_percentage"] = round(coverage, 1)
+    if coverage > 80:
+        stats["data_quality"] = "Excellent"
+    elif coverage > 60:
+        stats["data_quality"] = "Good"
+    elif coverage > 30:
+        stats["data_quality"] = "Fair"
+    else:
+        stats["data_quality"] = "Poor"
+
+
+def stats_from_rollups(db, city: str, country: str, days: int) -> Optional[Dict]:
+    """Stats for the last ``days`` from the hourly rollup table, or None when it has nothing for the city"""
+    hours = days * 24
+    summary = db.get_rollup_summary(city, country, time.time() - hours * 3600)
+    # Already US-converted per reading, matching stats_from_columns
+    temp = summary.get("display_temp")
+    if not temp:
+        return None
+
+    def pick(metric, field):
+        values = summary.get(metric)
+        return round(values[field], 1) if values else "N/A"
+
+    stats = {
+        "total_readings": temp["count"],
+        "period_days": days,
+        "temp_unit": "°F" if country.upper() == "US" else "°C",
+        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "avg_temp": round(temp["avg"], 1),
+        "min_temp": round(temp["min"], 1),
+        "max_temp": round(temp["max"], 1),
+        "temp_range": round(temp["max"] - temp["min"], 1),
+        "humidity_avg": pick("humidity", "avg"),
+        "humidity_min": pick("humidity", "min"),
+        "humidity_max": pick("humidity", "max"),
+        "pressure_avg": pick("pressure", "avg"),
+        "wind_avg": pick("wind_speed", "avg"),
+        "wind_min": pick("wind_speed", "min"),
+        "wind_max": pick("wind_speed", "max"),
+    }
+    conditions = {}
+    for condition, n in summary["conditions"].items():
+        conditions[condition.title()] = conditions.get(condition.title(), 0) + n
+    if conditions:
+        stats["common_conditions"] = max(conditions, key=conditions.get)
+        stats["condition_count"] = len(conditions)
+    else:
+        stats["common_conditions"] = stats["condition_count"] = "N/A"
+    assess_coverage(stats, temp["count"], hours)
+    return stats
+
+
+def columns_from_readings(readings: List[Dict]) -> Dict[str, np.ndarray]:
+    """The read_columns layout for a few reading dicts (e.g. a fresh current-weather fetch)"""
+    columns = {}
+    for field in STAT_FIELDS[:-1]:
+        values = [reading.get(field) for reading in readings]
+        columns[field] = np.array([v if isinstance(v, (int, float)) else np.nan for v in values], dtype=np.float32)
+    summaries = [reading.get("weather_summary") or reading.get("weather_detail") or "" for reading in readings]
+    labels, codes = np.unique(np.array(summaries, dtype=object), return_inverse=True)
+    columns["weather_summary"], columns["weather_summary_labels"] = codes.astype(np.int32), labels
+    return columns
+
+
+def stats_from_columns(columns: Dict[str, np.ndarray], country: str, days: int) -> Dict:
+    """Stats over read_columns arrays, vectorized; NaN entries are skipped and missing fields read N/A"""
+    temps = columns["temp"]
+    count = len(temps)
+    if country.upper() == "US":
+        # Values under 50 are assumed to be Celsius readings
+        temps = np.where(temps < 50, temps * 9 / 5 + 32, temps)
+
+    stats = {
+        "total_readings": count,
+        "period_days": days,
+        "temp_unit": "°F" if country.upper() == "US" else "°C",
+        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+    def summarize(values):
+        if values is None:
+            return "N/A", "N/A", "N/A"
+        values = values[~np.isnan(values)].astype(np.float64)
+        if not len(values):
+            return "N/A", "N/A", "N/A"
+        return round(float(values.mean()), 1), round(float(values.min()), 1), round(float(values.max()), 1)
+
+    stats["avg_temp"], stats["min_temp"], stats["max_temp"] = summarize(temps)
+    stats["temp_range"] = "N/A" if stats["avg_temp"] == "N/A" else round(stats["max_temp"] - stats["min_temp"], 1)
+    stats["humidity_avg"], stats["humidity_min"], stats["humidity_max"] = summarize(columns.get("humidity"))
+    stats["pressure_avg"] = summarize(columns.get("pressure"))[0]
+    stats["wind_avg"], stats["wind_min"], stats["wind_max"] = summarize(columns.get("wind_speed"))
+
+    # Fold labels that differ only in case, ignoring the '' (NULL) label
+    labels = columns.get("weather_summary_labels", ())
+    counts = np.bincount(columns.get("weather_summary", np.empty(0, np.int32)), minlength=len(labels))
+    conditions = {}
+    for label, n in zip(labels, counts):
+        if label and n:
+            conditions[label.title()] = conditions.get(label.title(), 0) + int(n)
+    if conditions:
+        stats["common_conditions"] = max(conditions, key=conditions.get)
+        stats["condition_count"] = len(conditions)
+    else:
+        stats["common_conditions"] = stats["condition_count"] = "N/A"
+
+    assess_coverage(stats, count, days * 24)
+    return stats
+
+
 def get_weather_stats(db, city: str, state: str = "", country: str = "US", days: int = 7) -> Dict:
     """
     Enhanced weather statistics with better data handling and validation
@@ -13,63 +135,35 @@ def get_weather_stats(db, city: str, state: str = "", country: str = "US", days:
     
     try:
         # Try multiple methods to get data
-        readings = []
-        
-        # Method 1: Try fetch_recent
+        stats = None
+
+        # Method 0: Hourly rollups — a few hundred rows however many readings they cover
         try:
-            readings = db.fetch_recent(city, country, hours)
-            logger.info(f"Method 1 - fetch_recent: Found {len(readings)} readings")
+            stats = stats_from_rollups(db, city, country, days)
         except Exception as e:
-            logger.warning(f"fetch_recent failed: {e}")
-        
-        # Method 2: If no data, try get_all_readings and filter
-        if not readings:
+            logger.warning(f"Rollup stats failed: {e}")
+
+        # Method 1: Raw readings as NumPy columns (case-insensitive match, filtered in SQL)
+        if stats is None:
             try:
-                all_readings = db.get_all_readings()
-                cutoff_time = datetime.now() - timedelta(hours=hours)
-                
-                readings = []
-                for reading in all_readings:
-                    try:
-                        # Handle different timestamp formats
-                        timestamp_str = reading.get('timestamp', '')
-                        if isinstance(timestamp_str, str):
-                            if 'T' in timestamp_str:
-                                timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                            else:
-                                timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                        else:
-                            timestamp = timestamp_str
-                        
-                        # Check location match
-                        reading_city = reading.get('city', '').lower()
-                        reading_country = reading.get('country', '').lower()
-                        
-                        if (reading_city == city.lower() and 
-                            reading_country == country.lower() and 
-                            timestamp >= cutoff_time):
-                            readings.append(reading)
-                    except Exception as parse_error:
-                        logger.debug(f"Error parsing reading: {parse_error}")
-                        continue
-                
-                logger.info(f"Method 2 - filtered readings: Found {len(readings)} readings")
+                columns = db.read_columns(city, country, start=time.time() - hours * 3600, fields=STAT_FIELDS)
+                logger.info(f"Method 1 - read_columns: Found {len(columns['ts'])} readings")
+                if len(columns["ts"]):
+                    stats = stats_from_columns(columns, country, days)
             except Exception as e:
-                logger.warning(f"get_all_readings failed: {e}")
+                logger.warning(f"read_columns failed: {e}")
         
-        # Method 3: Try to get current weather if no historical data
-        if not readings:
+        # Method 2: Try to get current weather if no historical data
+        if stats is None:
             try:
                 current_weather = db.fetch_current_weather(city, country)
                 if current_weather:
-                    readings = [current_weather]
-                    logger.info(f"Method 3 - current weather: Found 1 reading")
+                    stats = stats_from_columns(columns_from_readings([current_weather]), country, days)
+                    logger.info(f"Method 2 - current weather: Found 1 reading")
             except Exception as e:
                 logger.warning(f"fetch_current_weather failed: {e}")
         
-        logger.info(f"Total readings found for {city}, {country}: {len(readings)}")
-        
-        if not readings:
+        if stats is None:
             # Return empty stats structure
             stats = {
                 "avg_temp": "N/A", "min_temp": "N/A", "max_temp": "N/A", "temp_range": "N/A",
@@ -81,123 +175,6 @@ def get_weather_stats(db, city: str, state: str = "", country: str = "US", days:
                 "coverage_percentage": 0, "data_quality": "Missing",
                 "last_updated": "N/A"
             }
-        else:
-            # Process the readings
-            temps = []
-            humidities = []
-            pressures = []
-            winds = []
-            conditions = []
-            
-            for reading in readings:
-                # Temperature
-                temp = reading.get("temp")
-                if temp is not None and isinstance(temp, (int, float)):
-                    # Convert to Fahrenheit if needed
-                    if country.upper() == "US":
-                        if temp < 50:  # Assume it's Celsius and convert
-                            temp = (temp * 9/5) + 32
-                    temps.append(float(temp))
-                
-                # Humidity
-                humidity = reading.get("humidity")
-                if humidity is not None and isinstance(humidity, (int, float)):
-                    humidities.append(float(humidity))
-                
-                # Pressure
-                pressure = reading.get("pressure")
-                if pressure is not None and isinstance(pressure, (int, float)):
-                    pressures.append(float(pressure))
-                
-                # Wind speed
-                wind_speed = reading.get("wind_speed")
-                if wind_speed is not None and isinstance(wind_speed, (int, float)):
-                    winds.append(float(wind_speed))
-                
-                # Weather conditions
-                condition = reading.get("weather_summary") or reading.get("weather_detail")
-                if condition and isinstance(condition, str):
-                    conditions.append(condition.title())
-            
-            # Calculate statistics
-            stats = {
-                "total_readings": len(readings),
-                "period_days": days,
-                "temp_unit": "°F" if country.upper() == "US" else "°C",
-                "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            # Temperature stats
-            if temps:
-                stats.update({
-                    "avg_temp": round(sum(temps) / len(temps), 1),
-                    "min_temp": round(min(temps), 1),
-                    "max_temp": round(max(temps), 1),
-                    "temp_range": round(max(temps) - min(temps), 1)
-                })
-            else:
-                stats.update({
-                    "avg_temp": "N/A", "min_temp": "N/A", "max_temp": "N/A", "temp_range": "N/A"
-                })
-            
-            # Humidity stats
-            if humidities:
-                stats.update({
-                    "humidity_avg": round(sum(humidities) / len(humidities), 1),
-                    "humidity_min": round(min(humidities), 1),
-                    "humidity_max": round(max(humidities), 1)
-                })
-            else:
-                stats.update({
-                    "humidity_avg": "N/A", "humidity_min": "N/A", "humidity_max": "N/A"
-                })
-            
-            # Pressure stats
-            if pressures:
-                stats["pressure_avg"] = round(sum(pressures) / len(pressures), 1)
-            else:
-                stats["pressure_avg"] = "N/A"
-            
-            # Wind stats
-            if winds:
-                stats.update({
-                    "wind_avg": round(sum(winds) / len(winds), 1),
-                    "wind_min": round(min(winds), 1),
-                    "wind_max": round(max(winds), 1)
-                })
-            else:
-                stats.update({
-                    "wind_avg": "N/A", "wind_min": "N/A", "wind_max": "N/A"
-                })
-            
-            # Condition stats
-            if conditions:
-                from collections import Counter
-                condition_counter = Counter(conditions)
-                most_common = condition_counter.most_common(1)[0]
-                stats.update({
-                    "common_conditions": most_common[0],
-                    "condition_count": len(set(conditions))
-                })
-            else:
-                stats.update({
-                    "common_conditions": "N/A",
-                    "condition_count": "N/A"
-                })
-            
-            # Data quality assessment
-            expected_readings = hours  # One reading per hour would be ideal
-            coverage = min(100.0, (len(readings) / expected_readings) * 100)
-            stats["coverage_percentage"] = round(coverage, 1)
-            
-            if coverage > 80:
-                stats["data_quality"] = "Excellent"
-            elif coverage > 60:
-                stats["data_quality"] = "Good"
-            elif coverage > 30:
-                stats["data_quality"] = "Fair"
-            else:
-                stats["data_quality"] = "Poor"
         
         # Save to CSV and database
         try:
@@ -271,19 +248,20 @@ def debug_database_contents(db, city: str, country: str):
     logger = logging.getLogger(__name__)
     
     try:
-        # Check all readings
-        all_readings = db.get_all_readings()
-        logger.info(f"Total readings in database: {len(all_readings)}")
+        # Count rows without loading the table
+        total = sum(1 for _ in db.iter_readings(columns=("id",)))
+        logger.info(f"Total readings in database: {total}")
         
         # Check for specific city
-        city_readings = [r for r in all_readings 
-                        if r.get('city', '').lower() == city.lower() 
-                        and r.get('country', '').lower() == country.lower()]
-        logger.info(f"Readings for {city}, {country}: {len(city_readings)}")
+        city_readings = 0
+        sample = None
+        for reading in db.iter_readings(city, country):
+            city_readings += 1
+            sample = sample or reading
+        logger.info(f"Readings for {city}, {country}: {city_readings}")
         
         # Show sample data
-        if city_readings:
-            sample = city_readings[0]
+        if sample:
             logger.info(f"Sample reading: {sample}")
         
         # Check recent data
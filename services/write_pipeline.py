@@ -0,0 +1,143 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROW_KINDS = ("reading", "log", "city_id")
+
+
+class WritePipeline:
+    """Queue plus a single writer thread that batches database writes.
+
+    Producers enqueue readings, request-log rows and ``(location_id, owm_id)``
+    pairs and return immediately; the writer hands them to
+    ``database.write_batch`` as one ``executemany`` transaction once
+    ``batch_size`` rows are pending or the oldest pending row is
+    ``flush_interval`` seconds old. ``flush()`` blocks until everything queued
+    before it is committed, which is what tests and read-after-write callers
+    need. A queued row is not yet stored: a batch that fails is retried one
+    row per transaction so a single bad row only loses itself, ``failed``
+    counts the readings that still were not written, and the next ``flush()``
+    returns False.
+    """
+
+    def __init__(self, database, batch_size: int = 500, flush_interval: float = 1.0):
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self._failed_batches = 0
+        self._reported_failures = 0
+        self._failures_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, kind: str, payload) -> None:
+        if kind not in ROW_KINDS:
+            raise ValueError(f"Unknown row kind: {kind}")
+        self._queue.put((kind, payload))
+
+    def put_reading(self, data: Dict) -> None:
+        self._queue.put(("reading", data))
+
+    def put_log(self, url: str, location_id: Optional[int], status: str,
+                error: Optional[str] = None, latency_ms: Optional[int] = None) -> None:
+        self._queue.put(("log", (url, location_id, status, error, latency_ms)))
+
+    def put_city_id(self, location_id: int, owm_id: int) -> None:
+        self._queue.put(("city_id", (location_id, owm_id)))
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every row queued so far is written.
+
+        False if ``timeout`` ran out first or a queued row was not written since the previous flush.
+        """
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        finished = done.wait(timeout)
+        with self._failures_lock:
+            failures = self._failed_batches - self._reported_failures
+            self._reported_failures = self._failed_batches
+        return finished and not failures
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush what is pending and stop the writer thread"""
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(("stop", done))
+        done.wait(timeout)
+        self._thread.join(timeout)
+
+    def _write(self, pending: Dict) -> None:
+        if not any(pending.values()):
+            return
+        readings = pending["reading"]
+        try:
+            written = self.database.write_batch(readings, pending["log"], pending["city_id"])
+            self.batches += 1
+            complete = written == len(readings)  # malformed readings are skipped, not written
+        except Exception as e:
+            logger.warning(f"[Write Pipeline] batch of {len(readings)} readings failed, retrying row by row: {e}")
+            written, complete = self._write_rows(pending)
+        self.written += written
+        if not complete:
+            with self._failures_lock:
+                self.failed += len(readings) - written
+                self._failed_batches += 1
+        for rows in pending.values():
+            rows.clear()
+
+    def _write_rows(self, pending: Dict) -> Tuple[int, bool]:
+        """Write a failed batch one reading per transaction; returns (readings written, whether every row was)"""
+        written = 0
+        for data in pending["reading"]:
+            try:
+                written += self.database.write_batch([data], [], [])
+            except Exception as e:
+                logger.error(f"[Write Pipeline Error] dropped reading for {data.get('city')}: {e}")
+        try:
+            self.database.write_batch([], pending["log"], pending["city_id"])
+            return written, written == len(pending["reading"])
+        except Exception as e:
+            logger.error(f"[Write Pipeline Error] dropped {len(pending['log'])} log rows: {e}")
+            return written, False
+
+    def _run(self) -> None:
+        pending = {kind: [] for kind in ROW_KINDS}
+        count = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                kind, payload = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write(pending)
+                count, deadline = 0, None
+                continue
+
+            if kind in pending:
+                pending[kind].append(payload)
+                count += 1
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if count >= self.batch_size:
+                    self._write(pending)
+                    count, deadline = 0, None
+                continue
+
+            self._write(pending)
+            count, deadline = 0, None
+            payload.set()
+            if kind == "stop":
+                return
@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from automated_weather_tracker import AutomatedWeatherTracker
+from services.adaptive_poller import AdaptivePollPolicy
+from weather_data_fetcher import GROUP_BATCH_SIZE, build_weather_reading
+from weather_db import WeatherDB
+
+
+def reading(temp, summary="Clear", pressure=1013, humidity=50):
+    return {"temp": temp, "pressure": pressure, "humidity": humidity, "weather_summary": summary, "units": "metric"}
+
+
+def test_interval_tightens_on_change_and_relaxes_when_stable():
+    policy = AdaptivePollPolicy(base_interval=1800, min_interval=300, max_interval=7200)
+    policy.observe(1, reading(20.0), now=0)
+    policy.observe(2, reading(20.0), now=0)
+
+    assert policy.observe(1, reading(26.0, "Thunderstorm"), now=1800) == 900, "❌ Rapid change should halve the interval"
+    assert policy.observe(1, reading(19.0, "Rain"), now=2700) == 450, "❌ Interval did not keep tightening"
+    assert policy.observe(1, reading(12.0, "Snow"), now=3150) == 300, "❌ Interval went below the minimum"
+
+    intervals = [policy.observe(2, reading(20.1), now=1800 * i) for i in range(1, 6)]
+    assert intervals[0] == 2700 and intervals[-1] == 7200, f"❌ Stable location did not relax: {intervals}"
+
+    assert policy.observe(3, reading(20.0), alerts_active=True, now=0) == 900, "❌ Active alerts should tighten the interval"
+    print("✅ Adaptive interval test passed")
+
+
+def test_select_respects_due_times_and_hourly_budget():
+    policy = AdaptivePollPolicy(base_interval=1800, hourly_budget=3)
+    locations = [{"id": i, "city": f"City{i}", "country": "US", "owm_id": None} for i in range(5)]
+
+    first = policy.select(locations, now=0)
+    assert [loc["id"] for loc in first] == [0, 1, 2], "❌ Budget should cap the first sweep"
+    assert policy.select(locations, now=10) == [], "❌ Budget was exceeded within the hour"
+
+    for loc in first:
+        policy.observe(loc["id"], reading(20.0), now=0)
+    later = policy.select(locations, now=3601)
+    assert [loc["id"] for loc in later] == [3, 4, 0], "❌ Never-polled locations should go first once budget frees up"
+
+    grouped = [{"id": i, "owm_id": 100 + i} for i in range(GROUP_BATCH_SIZE * 2)]
+    assert len(AdaptivePollPolicy(hourly_budget=2).select(grouped, now=0)) == GROUP_BATCH_SIZE * 2, \
+        "❌ /group locations should cost a fraction of a request"
+    print("✅ Poll budget test passed")
+
+
+class StepFetcher:
+    def __init__(self):
+        self.calls = []
+        self.temps = {}
+
+    def fetch_current_weather(self, city, country=None, units="metric"):
+        self.calls.append(city)
+        raw = {
+            "id": 5000 + sum(map(ord, city)), "dt": 1700000000, "name": city, "sys": {"country": country},
+            "main": {"temp": self.temps.get(city, 20.0), "feels_like": 20.0, "humidity": 50, "pressure": 1013},
+            "weather": [{"main": "Clear", "description": "clear sky"}],
+            "wind": {"speed": 1.0, "deg": 0}, "clouds": {"all": 0}
+        }
+        return build_weather_reading(raw, city, units)
+
+
+def test_tracker_collects_only_due_locations(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    fetcher = StepFetcher()
+    tracker = AutomatedWeatherTracker(collector=fetcher, database=db, poll_policy=AdaptivePollPolicy())
+    for city in ("Austin", "Boston"):
+        tracker.add_location(city, "US")
+
+    assert tracker.collect_due_locations() == 2, "❌ New locations should be due immediately"
+    assert tracker.collect_due_locations() == 0, "❌ Locations were polled again before their interval"
+
+    for loc in tracker.get_active_locations():
+        tracker.poll_policy.next_due[loc["id"]] = 0
+    fetcher.temps["Austin"] = 28.0
+    tracker.collect_due_locations()
+    intervals = {loc["city"]: tracker.poll_policy.intervals[loc["id"]] for loc in tracker.get_active_locations()}
+    assert intervals["Austin"] < intervals["Boston"], f"❌ Changing city should be polled more often: {intervals}"
+    print("✅ Tracker adaptive polling test passed")
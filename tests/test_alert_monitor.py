@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.alert_monitor import AlertMonitor
+
+
+class CountingAlertsFetcher:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_weather_alerts(self, city, country=None):
+        self.calls += 1
+        return [{"event": "Heat Advisory", "sender_name": city}]
+
+
+def test_alert_monitor_caches_per_location():
+    fetcher = CountingAlertsFetcher()
+    monitor = AlertMonitor(fetcher, refresh_interval=600)
+
+    assert monitor.peek("Knoxville", "US") == [], "❌ peek should not fetch"
+    assert fetcher.calls == 0, "❌ peek hit the network"
+
+    alerts = monitor.get_alerts("Knoxville", "US")
+    monitor.get_alerts("knoxville", "us")
+    assert alerts[0]["event"] == "Heat Advisory", "❌ Alerts not returned"
+    assert fetcher.calls == 1, f"❌ Expected one fetch within TTL, got {fetcher.calls}"
+    assert monitor.peek("Knoxville", "US") == alerts, "❌ Cached alerts not visible to peek"
+
+    print("✅ Alert monitor TTL cache test passed")
+
+
+def test_alert_monitor_refreshes_watched_locations():
+    fetcher = CountingAlertsFetcher()
+    monitor = AlertMonitor(fetcher, refresh_interval=0)
+    monitor.watch("Tokyo", "JP")
+    monitor.watch("Knoxville", "US")
+
+    assert monitor.refresh_due() == 2, "❌ Watched locations were not refreshed"
+    assert fetcher.calls == 2, "❌ Expected one fetch per watched location"
+
+    print("✅ Alert monitor refresh test passed")
+
+
+def test_alert_monitor_forgets_locations_nobody_asks_about():
+    fetcher = CountingAlertsFetcher()
+    clock = [1_000_000.0]
+    monitor = AlertMonitor(fetcher, refresh_interval=600, watch_ttl=3600, clock=lambda: clock[0])
+    monitor.watch("Tokyo", "JP")
+    monitor.watch("Knoxville", "US")
+    assert monitor.refresh_due() == 2, "❌ Watched locations were not refreshed"
+
+    clock[0] += 3000
+    monitor.peek("Knoxville", "US")  # the tracker still checks Knoxville's alerts
+    clock[0] += 1000
+    assert monitor.refresh_due() == 1 and fetcher.calls == 3, "❌ Only the location still in use should refresh"
+    assert monitor.peek("Tokyo", "JP") == [], "❌ Alerts for a forgotten location should be dropped"
+    assert list(monitor._watched) == [("knoxville", "US")], f"❌ Watch set keeps growing: {list(monitor._watched)}"
+
+    print("✅ Alert monitor watch expiry test passed")
@@ -0,0 +1,57 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import Config
+from weather_data_fetcher import WeatherDataFetcher
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+
+    def json(self):
+        return {"name": "Knoxville"}
+
+
+class FakeSession:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.calls = 0
+
+    def get(self, *args, **kwargs):
+        self.calls += 1
+        return FakeResponse(self.status_code)
+
+
+def make_fetcher(tmp_path, status_code):
+    config = Config(api_key="test-key", db_file_path=str(tmp_path / "weather.db"),
+                    api_key_status_path=str(tmp_path / "api_key_status.json"))
+    fetcher = WeatherDataFetcher(config)
+    fetcher.session = FakeSession(status_code)
+    fetcher.min_request_interval = 0
+    return fetcher
+
+
+def test_api_key_is_validated_by_first_request(tmp_path):
+    fetcher = make_fetcher(tmp_path, 200)
+    assert fetcher.api_key_valid is None, "❌ Key status should be unknown before any request"
+
+    assert fetcher._api_request("weather", {"q": "Knoxville,US"}) == {"name": "Knoxville"}
+    assert fetcher.api_key_valid is True, "❌ Successful request did not validate the key"
+    assert "test-key" not in (tmp_path / "api_key_status.json").read_text(), "❌ Raw API key written to disk"
+
+    # A fresh process trusts the cached result without a validation call
+    restarted = make_fetcher(tmp_path, 200)
+    assert restarted._validate_api_key() is True and restarted.session.calls == 0, "❌ Cached key status ignored"
+
+    print("✅ Lazy API key validation test passed")
+
+
+def test_rejected_api_key_is_remembered(tmp_path):
+    fetcher = make_fetcher(tmp_path, 401)
+    assert fetcher._api_request("weather", {"q": "Knoxville,US"}) is None
+    assert make_fetcher(tmp_path, 200).api_key_valid is False, "❌ 401 was not persisted"
+
+    print("✅ Rejected API key test passed")
@@ -0,0 +1,108 @@
+import sys
+import os
+import asyncio
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from config import Config
+from async_weather_fetcher import AsyncWeatherDataFetcher
+
+
+def sample_weather(city):
+    return {
+        "dt": 1700000000, "name": city,
+        "sys": {"country": "US", "sunrise": 1699990000, "sunset": 1700030000},
+        "main": {"temp": 70.0, "feels_like": 69.0, "humidity": 50, "pressure": 1013},
+        "weather": [{"main": "Clouds", "description": "overcast clouds"}],
+        "wind": {"speed": 3.2, "deg": 100}, "clouds": {"all": 90}, "visibility": 10000
+    }
+
+
+def test_async_fetcher_collects_cities_concurrently():
+    async def weather(request):
+        await asyncio.sleep(0.05)
+        return web.json_response(sample_weather(request.query["q"].split(",")[0]))
+
+    async def onecall(request):
+        return web.json_response({"alerts": []})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/weather", weather)
+        app.router.add_get("/onecall", onecall)
+        async with TestServer(app) as server:
+            config = Config(api_key="test", db_file_path=":memory:", base_url=str(server.make_url("")).rstrip("/"))
+            fetcher = AsyncWeatherDataFetcher(config, requests_per_second=1000, burst=1000, max_concurrency=50)
+            fetcher.get_coordinates = lambda city, country: asyncio.sleep(0, result=None)
+            locations = [{"city": f"City{i}", "country": "US"} for i in range(50)]
+            async with fetcher:
+                start = time.perf_counter()
+                results = await fetcher.fetch_many_current(locations)
+                return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(run())
+
+    assert len(results) == 50 and all(results), "❌ Missing readings"
+    assert [r["city"] for r in results] == [f"City{i}" for i in range(50)], "❌ Results out of order"
+    assert results[0]["wind_direction"] == 100 and results[0]["temp_unit"] == "°F", "❌ Reading not normalized"
+    assert elapsed < 1.0, f"❌ Requests were not concurrent ({elapsed:.2f}s)"
+
+    print("✅ Async concurrent fetch test passed")
+
+
+def test_collect_current_weather_from_two_threads():
+    async def weather(request):
+        await asyncio.sleep(0.01)
+        return web.json_response(sample_weather(request.query["q"].split(",")[0]))
+
+    # Serve from a loop on its own thread, as the real API would be independent of the callers' loops
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    app = web.Application()
+    app.router.add_get("/weather", weather)
+    server = TestServer(app)
+    asyncio.run_coroutine_threadsafe(server.start_server(), loop).result(5)
+    try:
+        config = Config(api_key="test", db_file_path=":memory:", base_url=str(server.make_url("")).rstrip("/"))
+        fetcher = AsyncWeatherDataFetcher(config, requests_per_second=1000, burst=1000)
+        fetcher.get_coordinates = lambda city, country: asyncio.sleep(0, result=None)
+        locations = [{"city": f"City{i}", "country": "US"} for i in range(10)]
+        results, errors = [], []
+
+        def collect():
+            try:
+                results.append(fetcher.collect_current_weather(locations))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=collect) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+    finally:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+
+    assert not errors, f"❌ Concurrent collection raised: {errors}"
+    assert [sum(1 for r in batch if r) for batch in results] == [10, 10], "❌ A concurrent sweep lost readings"
+
+    print("✅ Async fetcher thread-safety test passed")
+
+
+def test_token_bucket_paces_requests():
+    from utils.rate_limiter import TokenBucket
+
+    bucket = TokenBucket(rate=100, capacity=1)
+    start = time.perf_counter()
+    for _ in range(11):
+        bucket.acquire()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed >= 0.09, f"❌ Token bucket did not throttle ({elapsed:.3f}s)"
+
+    print("✅ Token bucket pacing test passed")
@@ -0,0 +1,62 @@
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.city_comparison import iter_city_comparisons, parse_locations
+from weather_data_fetcher import build_weather_reading
+from weather_db import WeatherDB
+
+
+def raw_weather(city):
+    return {
+        "id": 1, "dt": 1700000000, "name": city,
+        "sys": {"country": "US"},
+        "main": {"temp": 70.0, "feels_like": 69.0, "humidity": 50, "pressure": 1013},
+        "weather": [{"main": "Clear", "description": "clear sky"}],
+        "wind": {"speed": 3.2, "deg": 100}, "clouds": {"all": 0}
+    }
+
+
+class SlowFetcher:
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = []
+
+    def fetch_current_weather(self, city, country=None, units="metric"):
+        self.calls.append(city)
+        time.sleep(self.delay)
+        return build_weather_reading(raw_weather(city), city, units)
+
+
+def test_comparison_fetches_cities_concurrently(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    monkeypatch.chdir(tmp_path)  # get_weather_stats appends to weather_log.csv in the working directory
+    db = WeatherDB()
+    fetcher = SlowFetcher(delay=0.3)
+    locations = [(f"City{i}", "US") for i in range(8)]
+
+    start = time.perf_counter()
+    results = dict(iter_city_comparisons(fetcher, db, locations))
+    elapsed = time.perf_counter() - start
+
+    assert sorted(results) == list(range(8)) and all(results.values()), "❌ Missing comparison results"
+    assert elapsed < 0.3 * 3, f"❌ 8 cities took {elapsed:.2f}s, expected about one fetch"
+
+    print("✅ Concurrent comparison test passed")
+
+
+def test_comparison_serves_recent_readings_from_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    monkeypatch.chdir(tmp_path)  # get_weather_stats appends to weather_log.csv in the working directory
+    db = WeatherDB()
+    fetcher = SlowFetcher(delay=0)
+    db.insert_reading(build_weather_reading(raw_weather("Knoxville"), "Knoxville", "imperial"))
+
+    results = dict(iter_city_comparisons(fetcher, db, [("knoxville", "US"), ("Tokyo", "JP")], max_age=600))
+    assert results[0]["cached"] and results[0]["data"]["city"] == "Knoxville", "❌ Fresh stored reading not used"
+    assert not results[1]["cached"] and fetcher.calls == ["Tokyo"], "❌ Only the uncached city should be fetched"
+
+    assert parse_locations("Tokyo, jp; Paris,FR ; Denver") == [("Tokyo", "JP"), ("Paris", "FR"), ("Denver", "US")]
+
+    print("✅ Comparison cache test passed")
@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import sqlite3
+from datetime import datetime, timedelta
+
+from weather_db import WeatherDB, to_epoch
+
+
+def reading(city, when, temp=20.0):
+    return {
+        "timestamp": when.isoformat(timespec="seconds"), "city": city, "country": "US", "temp": temp,
+        "feels_like": temp, "humidity": 50, "pressure": 1013, "weather_summary": "Clear",
+        "weather_detail": "clear sky", "wind_speed": 1.0, "wind_direction": 90, "cloudiness": 0,
+        "visibility": 10000, "api_timestamp": when.isoformat()
+    }
+
+
+def test_migration_backfills_epoch_column(tmp_path, monkeypatch):
+    path = tmp_path / "weather.db"
+    legacy = sqlite3.connect(path)
+    legacy.executescript("""
+        CREATE TABLE readings (id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, city TEXT NOT NULL,
+            country TEXT NOT NULL, temp REAL NOT NULL, humidity INTEGER, pressure REAL, wind_speed REAL,
+            weather_summary TEXT, weather_detail TEXT);
+        CREATE INDEX idx_readings_time ON readings(timestamp);
+        INSERT INTO readings (timestamp, city, country, temp) VALUES ('2024-03-01T12:00:00', 'Austin', 'US', 20);
+    """)
+    legacy.commit()
+    legacy.close()
+
+    monkeypatch.setenv("DB_PATH", str(path))
+    db = WeatherDB()
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT ts FROM readings").fetchone()[0] == to_epoch("2024-03-01T12:00:00") == 1709294400, \
+            "❌ ts was not backfilled as UTC epoch seconds"
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(readings)")}
+    assert {"idx_readings_ts", "idx_readings_location_ts"} <= indexes, f"❌ Missing time indexes: {indexes}"
+    assert "idx_readings_time" not in indexes, "❌ Superseded timestamp index was not dropped"
+    db.close()
+    print("✅ Epoch migration test passed")
+
+
+def test_range_queries_use_index_scans(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    now = datetime.utcnow().replace(microsecond=0)
+    # Half-hour offsets keep every reading clear of the window edges
+    db.write_batch([reading("Austin", now - timedelta(hours=h, minutes=30), temp=h) for h in range(48)] +
+                   [reading("Boston", now - timedelta(hours=h, minutes=30)) for h in range(48)])
+
+    recent = db.fetch_recent("Austin", "US", hours=6)
+    assert [r["temp"] for r in recent] == [0, 1, 2, 3, 4, 5], f"❌ Wrong 6-hour window: {recent}"
+
+    start = (now - timedelta(hours=10)).timestamp()
+    rows = db.fetch_range(start, now.timestamp(), "Austin", "US")
+    assert [r[1] for r in rows] == list(range(9, -1, -1)), "❌ fetch_range should return oldest first"
+    assert len(db.fetch_range(start, now.timestamp())) == 20, "❌ Cross-city range is wrong"
+
+    with db.get_connection() as conn:
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT temp FROM readings WHERE location_id = ? AND ts >= ? ORDER BY ts DESC",
+            (db.get_location_id("Austin", "US"), 0)))
+    assert "idx_readings_location_ts (location_id=? AND ts>?)" in plan, f"❌ Not an index range scan: {plan}"
+    db.close()
+    print("✅ Range query index test passed")
@@ -0,0 +1,43 @@
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import Config
+from services.transport import PooledSessionTransport, ReplayTransport
+from weather_data_fetcher import WeatherDataFetcher
+
+
+def test_fetcher_fans_out_across_threads():
+    transport = ReplayTransport(latency=0.01, seed=1)
+    config = Config(api_key="test-key", db_file_path=":memory:", requests_per_second=1000, rate_limit_burst=1000)
+    fetcher = WeatherDataFetcher(config, transport=transport)
+    cities = [f"City{i}" for i in range(64)]
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        readings = list(pool.map(lambda city: fetcher.fetch_current_weather(city, "US"), cities))
+
+    assert [r["city"] for r in readings] == cities, "❌ Readings mixed up between threads"
+    assert transport.calls["weather"] == 64, "❌ Unexpected number of requests"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: fetcher.register_failure("Nowhere"), range(4000)))
+    assert fetcher.failed_cities["Nowhere"] == 4000, "❌ Failure counter lost updates"
+
+    print("✅ Fetcher thread fan-out test passed")
+
+
+def test_pooled_transport_gives_each_thread_its_own_session():
+    transport = PooledSessionTransport(pool_size=4)
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(transport.session)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(s) for s in sessions}) == 4, "❌ Threads shared a requests.Session"
+    assert all(s.get_adapter("https://x") is transport.adapter for s in sessions), "❌ Sessions not on the shared pool"
+
+    print("✅ Per-thread session test passed")
@@ -0,0 +1,42 @@
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.forecast_cache import ForecastCache
+
+
+def test_forecast_cache_coalesces_concurrent_requests():
+    cache = ForecastCache(ttl=600)
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"list": [{"dt": 1}]}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_fetch(("knoxville", "US", "imperial"), slow_fetch)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1, f"❌ Expected one download, got {len(calls)}"
+    assert len(results) == 8 and all(r is results[0] for r in results), "❌ Callers did not share the payload"
+    assert cache.get_or_fetch(("knoxville", "US", "imperial"), slow_fetch) is results[0], "❌ Payload not cached"
+    assert len(calls) == 1, "❌ Cached payload was downloaded again"
+
+    print("✅ Forecast single-flight test passed")
+
+
+def test_forecast_cache_does_not_store_failures():
+    cache = ForecastCache(ttl=600)
+    assert cache.get_or_fetch("key", lambda: None) is None
+    assert cache.get_or_fetch("key", lambda: {"list": []}) == {"list": []}, "❌ Failed fetch was cached"
+
+    print("✅ Forecast failure caching test passed")
@@ -0,0 +1,66 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import Config
+from services.forecast_table import ForecastTable
+from services.transport import FIXTURES_DIR, ReplayTransport
+from weather_data_fetcher import WeatherDataFetcher
+
+
+def load_forecast():
+    with open(os.path.join(FIXTURES_DIR, "forecast.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_forecast_table_daily_summary_matches_payload():
+    payload = load_forecast()
+    table = ForecastTable.from_payload(payload)
+    assert len(table) == len(payload["list"]), "❌ Entries dropped while parsing"
+
+    first_day = payload["list"][0]["dt_txt"][:10]
+    day_temps = [e["main"]["temp"] for e in payload["list"] if e["dt_txt"].startswith(first_day)]
+    summary = table.daily_summary(5)
+    assert len(summary) == 5 and summary[0]["date"] == first_day, "❌ Wrong day grouping"
+    assert summary[0]["main"]["temp_max"] == max(day_temps), "❌ Daily high not taken across the day"
+    assert summary[0]["main"]["temp_min"] == min(day_temps), "❌ Daily low not taken across the day"
+    raw, rebuilt = payload["list"][3], table.entry(3)
+    assert rebuilt["main"]["humidity"] == raw["main"]["humidity"], "❌ Column values out of order"
+    assert rebuilt["weather"][0]["description"] == raw["weather"][0]["description"], "❌ Text columns out of order"
+
+    print("✅ Forecast table summary test passed")
+
+
+def test_forecast_views_share_one_parsed_download():
+    transport = ReplayTransport(seed=1)
+    fetcher = WeatherDataFetcher(Config(api_key="test-key", db_file_path=":memory:"), transport=transport)
+    fetcher.min_request_interval = 0
+
+    hourly = fetcher.fetch_hourly_forecast("Knoxville", "US", "imperial")
+    five_day = fetcher.fetch_five_day_forecast("Knoxville", "US", "imperial")
+    summary = fetcher.extract_five_day_summary(fetcher.fetch_forecast_table("Knoxville", "US", "imperial"))
+
+    assert len(hourly) == 8 and hourly[0]["pop"] == 0, "❌ Hourly view wrong"
+    assert five_day["enhanced"] and len(five_day["list"]) == 5, "❌ Enhanced payload wrong"
+    assert five_day["list"][0]["daily_stats"]["temp_max"] == summary[0]["main"]["temp_max"], "❌ Views disagree"
+    assert transport.calls == {"forecast": 1}, f"❌ Forecast downloaded more than once: {transport.calls}"
+
+    print("✅ Shared forecast table test passed")
+
+
+def test_forecast_units_share_one_metric_download():
+    transport = ReplayTransport(seed=1)
+    fetcher = WeatherDataFetcher(Config(api_key="test-key", db_file_path=":memory:"), transport=transport)
+    fetcher.min_request_interval = 0
+
+    metric = fetcher.fetch_forecast_table("Knoxville", "US")
+    recent = fetcher.fetch_recent("Knoxville", "US", hours=24 * 365 * 50)  # US locations are shown in °F
+    imperial = fetcher.peek_forecast_table("Knoxville", "US", "imperial")
+
+    assert transport.calls == {"forecast": 1}, f"❌ Each unit system downloaded its own forecast: {transport.calls}"
+    assert imperial is fetcher.fetch_forecast_table("Knoxville", "US", "imperial"), "❌ Imperial view rebuilt"
+    assert recent[0]["main"]["temp"] == round(metric.temp[0] * 9 / 5 + 32, 2), "❌ Recent view not converted to °F"
+    assert metric.temp[0] < imperial.temp[0] and metric.dt is imperial.dt, "❌ Conversion should only touch units"
+
+    print("✅ Forecast unit conversion test passed")
@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.geocode_cache import GeocodeCache
+from weather_db import WeatherDB
+
+
+def test_geocode_cache_persists_to_locations(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+
+    GeocodeCache(db).put("Knoxville", "US", 35.96, -83.92)
+
+    # A fresh cache (e.g. after restart) reads the coordinates back from the table
+    coords = GeocodeCache(db).get("knoxville", "us")
+    assert coords == (35.96, -83.92), f"❌ Coordinates not read back: {coords}"
+
+    with db.get_connection() as conn:
+        row = conn.execute("SELECT is_active FROM locations WHERE city = 'Knoxville'").fetchone()
+    assert row["is_active"] == 0, "❌ Geocoding should not start tracking a location"
+
+    print("✅ Geocode cache persistence test passed")
+
+
+def test_geocode_cache_evicts_least_recently_used():
+    cache = GeocodeCache(maxsize=2)
+    cache.put("A", "US", 1, 1)
+    cache.put("B", "US", 2, 2)
+    cache.get("A", "US")
+    cache.put("C", "US", 3, 3)
+
+    assert cache.get("B", "US") is None, "❌ LRU entry was not evicted"
+    assert cache.get("A", "US") == (1, 1), "❌ Recently used entry was evicted"
+
+    print("✅ Geocode cache LRU test passed")
@@ -0,0 +1,38 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.http_cache import HTTPResponseCache
+
+URL = "https://api.openweathermap.org/data/2.5/weather"
+
+
+def test_http_cache_honors_cache_control(tmp_path):
+    cache = HTTPResponseCache(str(tmp_path), default_ttl=600)
+    params = {"q": "Knoxville,US", "units": "imperial", "appid": "secret"}
+
+    cache.store(URL, params, {"Cache-Control": "max-age=300"}, {"name": "Knoxville"})
+    entry = cache.lookup(URL, {"q": "Knoxville,US", "units": "imperial", "appid": "other-key"})
+    assert cache.is_fresh(entry), "❌ max-age response should be fresh"
+    assert entry["data"] == {"name": "Knoxville"}, "❌ Cached body mismatch"
+
+    cache.store(URL, {"q": "Tokyo,JP"}, {"Cache-Control": "no-store"}, {"name": "Tokyo"})
+    assert cache.lookup(URL, {"q": "Tokyo,JP"}) is None, "❌ no-store response was cached"
+
+    print("✅ HTTP cache Cache-Control test passed")
+
+
+def test_http_cache_revalidates_stale_entries(tmp_path):
+    cache = HTTPResponseCache(str(tmp_path), default_ttl=600)
+    params = {"q": "Knoxville,US"}
+
+    cache.store(URL, params, {"Cache-Control": "no-cache", "ETag": '"abc"'}, {"name": "Knoxville"})
+    entry = cache.lookup(URL, params)
+    assert not cache.is_fresh(entry), "❌ no-cache response should need revalidation"
+    assert cache.conditional_headers(entry) == {"If-None-Match": '"abc"'}, "❌ Missing conditional header"
+
+    cache.revalidated(URL, params, entry, {"Cache-Control": "max-age=60"})
+    entry = cache.lookup(URL, params)
+    assert cache.is_fresh(entry) and entry["etag"] == '"abc"', "❌ 304 did not refresh the entry"
+
+    print("✅ HTTP cache revalidation test passed")
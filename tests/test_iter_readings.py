@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from weather_db import WeatherDB
+
+
+def reading(city, when, temp=20.0):
+    return {
+        "timestamp": when.isoformat(timespec="seconds"), "city": city, "country": "US", "temp": temp,
+        "feels_like": temp, "humidity": 50, "pressure": 1013, "weather_summary": "Clear",
+        "weather_detail": "clear sky", "wind_speed": 1.0, "wind_direction": 90, "cloudiness": 0,
+        "visibility": 10000, "api_timestamp": when.isoformat()
+    }
+
+
+def test_iter_readings_filters_in_sql_and_streams_chunks(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    now = datetime.utcnow().replace(microsecond=0)
+    db.write_batch([reading("Austin", now - timedelta(hours=h, minutes=30), temp=h) for h in range(30)] +
+                   [reading("Boston", now - timedelta(hours=h, minutes=30)) for h in range(30)])
+
+    rows = db.iter_readings("austin", "us", chunk_size=7)
+    assert iter(rows) is rows, "❌ iter_readings should be a generator"
+    temps = [r["temp"] for r in rows]
+    assert temps == list(range(30)), "❌ City match should be case-insensitive and newest first"
+
+    recent = list(db.iter_readings("Austin", "US", since=time.time() - 5 * 3600, newest_first=False))
+    assert [r["temp"] for r in recent] == [4, 3, 2, 1, 0], f"❌ since bound not applied: {recent}"
+
+    slim = next(db.iter_readings(columns=("city", "temp")))
+    assert set(slim) == {"city", "temp"}, f"❌ Column projection ignored: {slim}"
+    assert sum(1 for _ in db.iter_readings(columns=("id",), chunk_size=4)) == 60, "❌ Rows lost across chunks"
+    assert len(db.get_all_readings()) == 60, "❌ get_all_readings should still return everything"
+
+    with pytest.raises(ValueError):
+        next(db.iter_readings(columns=("temp; DROP TABLE readings",)))
+    db.close()
+    print("✅ Streaming readings test passed")
@@ -0,0 +1,142 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import threading
+import time
+
+from automated_weather_tracker import AutomatedWeatherTracker
+from services.adaptive_poller import AdaptivePollPolicy
+from services.job_scheduler import JobScheduler
+from weather_data_fetcher import build_weather_reading
+from weather_db import WeatherDB
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_jobs_run_in_time_order_and_can_be_replaced_or_cancelled():
+    clock = FakeClock()
+    scheduler = JobScheduler(clock=clock, seed=1)
+    ran = []
+    scheduler.schedule("b", lambda: ran.append("b"), delay=20)
+    scheduler.schedule("a", lambda: ran.append("a"), delay=10)
+    scheduler.schedule("c", lambda: ran.append("c"), delay=5)
+    scheduler.schedule("c", lambda: ran.append("c2"), delay=30)  # replaces the pending "c"
+    scheduler.schedule("a", lambda: ran.append("a2"), delay=1, replace=False)  # keeps the pending "a"
+    scheduler.schedule("d", lambda: ran.append("d"), delay=15)
+    assert scheduler.cancel("d"), "❌ Pending job could not be cancelled"
+
+    clock.now += 25
+    assert scheduler.run_pending() == 2, "❌ Wrong number of due jobs"
+    assert ran == ["a", "b"], f"❌ Jobs ran out of order or stale entries fired: {ran}"
+    clock.now += 10
+    scheduler.run_pending()
+    assert ran == ["a", "b", "c2"] and len(scheduler) == 0, f"❌ Replaced job did not run: {ran}"
+    print("✅ Job ordering test passed")
+
+
+def test_repeating_jobs_get_jitter():
+    clock = FakeClock()
+    scheduler = JobScheduler(clock=clock, seed=7)
+    due = [scheduler.schedule(i, lambda: None, delay=60, every=60, jitter=10) for i in range(20)]
+    assert len(set(due)) == 20 and all(1060 <= d <= 1070 for d in due), "❌ Jitter should spread identical jobs"
+    clock.now = 1070
+    assert scheduler.run_pending() == 20, "❌ Jittered jobs did not all run"
+    assert all(1130 <= scheduler.due_at(i) <= 1140 for i in range(20)), "❌ Repeating jobs were not re-armed"
+    print("✅ Jitter test passed")
+
+
+def test_thread_wakes_for_new_earlier_job_and_stops_independently():
+    first, second = JobScheduler(), JobScheduler()
+    fired = threading.Event()
+    first.start()
+    second.start()
+    first.schedule("late", lambda: None, delay=3600)
+    start = time.monotonic()
+    first.schedule("soon", fired.set, delay=0.05)
+    assert fired.wait(2), "❌ Scheduler did not wake for an earlier job"
+    assert time.monotonic() - start < 1, "❌ Scheduler overslept"
+
+    second.stop(timeout=1)
+    assert "late" in first, "❌ Stopping one scheduler cleared another"
+    first.stop(timeout=1)
+    print("✅ Scheduler thread test passed")
+
+
+class CannedFetcher:
+    def __init__(self):
+        self.calls = []
+
+    def fetch_current_weather(self, city, country=None, units="metric"):
+        self.calls.append(city)
+        raw = {
+            "id": 7000 + len(self.calls), "dt": 1700000000, "name": city, "sys": {"country": country},
+            "main": {"temp": 20.0, "feels_like": 20.0, "humidity": 50, "pressure": 1013},
+            "weather": [{"main": "Clear", "description": "clear sky"}],
+            "wind": {"speed": 1.0, "deg": 0}, "clouds": {"all": 0}
+        }
+        return build_weather_reading(raw, city, units)
+
+    def fetch_current_weather_group(self, city_ids, units="metric"):
+        raise RuntimeError("group endpoint unavailable")
+
+
+def test_tracker_polls_each_location_on_its_own_timer(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    clock = FakeClock()
+    db = WeatherDB()
+    fetcher = CannedFetcher()
+    tracker = AutomatedWeatherTracker(collector=fetcher, database=db, poll_policy=AdaptivePollPolicy())
+    tracker.scheduler = JobScheduler(clock=clock, seed=3)
+    monkeypatch.setattr("time.time", clock)
+    for city in ("Austin", "Boston"):
+        tracker.add_location(city, "US")
+
+    tracker.schedule_locations()
+    clock.now += 30
+    tracker.scheduler.run_pending()  # poll jobs fire and arm the sweep
+    clock.now += tracker.SWEEP_WINDOW
+    tracker.scheduler.run_pending()
+    assert sorted(fetcher.calls) == ["Austin", "Boston"], f"❌ Initial sweep missed locations: {fetcher.calls}"
+
+    ids = [loc["id"] for loc in tracker.get_active_locations()]
+    due = [tracker.scheduler.due_at(("poll", i)) for i in ids]
+    assert all(d >= clock.now + 1800 for d in due), f"❌ Poll jobs were not re-armed on the adaptive interval: {due}"
+
+    with db.get_connection() as conn:
+        conn.execute("UPDATE locations SET is_active = 0 WHERE city = 'Boston'")
+    tracker.schedule_locations()
+    assert len([k for k in ids if ("poll", k) in tracker.scheduler]) == 1, "❌ Deactivated location kept its job"
+    print("✅ Tracker timer test passed")
+
+
+def test_manual_sweep_pushes_first_polls_out(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    clock = FakeClock()
+    db = WeatherDB()
+    fetcher = CannedFetcher()
+    tracker = AutomatedWeatherTracker(collector=fetcher, database=db, poll_policy=AdaptivePollPolicy())
+    tracker.scheduler = JobScheduler(clock=clock, seed=3)
+    monkeypatch.setattr("time.time", clock)
+    tracker.add_location("Austin", "US")
+    fetch = fetcher.fetch_current_weather
+
+    def fetch_during_discovery(*args, **kwargs):
+        tracker.schedule_locations()  # the scheduler thread's discovery job runs mid-sweep
+        return fetch(*args, **kwargs)
+
+    fetcher.fetch_current_weather = fetch_during_discovery
+    tracker.collect_all_locations()
+    location_id = tracker.get_active_locations()[0]["id"]
+    assert tracker.scheduler.due_at(("poll", location_id)) >= clock.now + 1800, \
+        "❌ The startup sweep should not be followed by an immediate poll"
+    clock.now += 60
+    tracker.scheduler.run_pending()
+    assert fetcher.calls == ["Austin"], f"❌ Location was fetched twice at startup: {fetcher.calls}"
+    print("✅ Startup sweep scheduling test passed")
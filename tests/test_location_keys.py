@@ -0,0 +1,154 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import sqlite3
+from datetime import datetime, timedelta
+
+from automated_weather_tracker import AutomatedWeatherTracker
+from weather_db import WeatherDB, location_key
+
+
+def reading(city, country, when, temp=20.0):
+    return {
+        "timestamp": when.isoformat(timespec="seconds"), "city": city, "country": country, "temp": temp,
+        "feels_like": temp, "humidity": 50, "pressure": 1013, "weather_summary": "Clear",
+        "weather_detail": "clear sky", "wind_speed": 1.0, "wind_direction": 90, "cloudiness": 0,
+        "visibility": 10000, "api_timestamp": when.isoformat()
+    }
+
+
+def test_location_key_folds_case_accents_and_spacing():
+    assert location_key(" São  Paulo ", "br") == location_key("SAO PAULO", "BR") == "sao paulo|br", \
+        "❌ Spellings of one city should share a key"
+    assert location_key("Paris", "FR") != location_key("Paris", "US"), "❌ Country must stay part of the key"
+    print("✅ Location key test passed")
+
+
+def test_readings_reference_locations_by_id(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    now = datetime.utcnow().replace(microsecond=0)
+    db.insert_reading(reading("Austin", "US", now - timedelta(minutes=30), 70.0))
+    db.write_batch([reading("austin", "us", now - timedelta(minutes=20), 71.0),
+                    reading("AUSTIN", "US", now - timedelta(minutes=10), 72.0)])
+
+    with db.get_connection() as conn:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(readings)")]
+        locations = conn.execute("SELECT id, city, is_active FROM locations").fetchall()
+    assert "city" not in columns and "location_id" in columns, f"❌ readings still carries text keys: {columns}"
+    assert len(locations) == 1 and locations[0]["city"] == "Austin", "❌ Case variants created extra locations"
+    assert locations[0]["is_active"] == 0, "❌ Locations created by readings should not be tracked"
+
+    for city, country in (("Austin", "US"), ("austin", "us"), ("  AUSTIN ", "Us")):
+        assert [r["temp"] for r in db.fetch_recent(city, country)] == [72.0, 71.0, 70.0], \
+            f"❌ {city!r} did not resolve to the stored readings"
+    assert db.get_latest_reading("austin", "us")["city"] == "Austin", "❌ Latest reading lost its location name"
+
+    assert not db.add_location_alias("ATX", "US", "Nowhere", "US"), "❌ Alias to an unknown location accepted"
+    assert db.add_location_alias("ATX", "US", "Austin", "US"), "❌ Alias was not stored"
+    assert db.get_location_id("atx", "us") == locations[0]["id"], "❌ Alias does not resolve"
+    assert len(db.fetch_recent("ATX", "US")) == 3, "❌ Reads through an alias should find the readings"
+    db.close()
+    print("✅ Location foreign key test passed")
+
+
+def test_city_or_country_alone_resolve_through_keys(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    now = datetime.utcnow().replace(microsecond=0)
+    db.write_batch([reading("São Paulo", "BR", now - timedelta(minutes=3)),
+                    reading("Austin", "US", now - timedelta(minutes=2)),
+                    reading("Paris", "FR", now - timedelta(minutes=1))])
+    db.add_location_alias("ATX", "US", "Austin", "US")
+
+    def cities(**kwargs):
+        return sorted(row["city"] for row in db.iter_readings(**kwargs))
+
+    assert cities(city="sao paulo") == ["São Paulo"], "❌ City alone should match on the folded key"
+    assert cities(city="ATX") == ["Austin"], "❌ City alone should resolve aliases"
+    assert cities(country="us") == ["Austin"] and cities(country="br") == ["São Paulo"], \
+        "❌ Country alone should match on the folded key"
+    assert cities(city="Austi") == [] and cities(country="X") == [], "❌ Partial names must not match"
+    assert len(db.read_columns(country="FR")["ts"]) == 1, "❌ read_columns should share the key lookup"
+    db.close()
+    print("✅ Partial location filter test passed")
+
+
+def test_favoriting_a_looked_up_city_activates_it(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    tracker = AutomatedWeatherTracker(collector=object(), database=db)
+    db.save_coordinates("Austin", "US", 30.27, -97.74)  # a geocode lookup stores the city inactive
+    assert tracker.get_active_locations() == [], "❌ Geocoding alone should not start tracking"
+
+    assert tracker.add_location("austin", "us"), "❌ add_location failed"
+    active = tracker.get_active_locations()
+    assert [loc["city"] for loc in active] == ["Austin"], f"❌ Favorited city is not active: {active}"
+    assert db.get_coordinates("Austin", "US") == (30.27, -97.74), "❌ Activation lost the stored coordinates"
+    db.close()
+    print("✅ Favorite activation test passed")
+
+
+def test_tracked_readings_keep_the_favorite_id(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    tracker = AutomatedWeatherTracker(collector=object(), database=db)
+    tracker.add_location("Munich", "DE")
+    favorite = tracker.get_active_locations()[0]
+    now = datetime.utcnow().replace(microsecond=0)
+
+    tracker.store_reading(favorite, reading("München", "DE", now - timedelta(minutes=10)))  # provider's spelling
+    db.write_batch([{**reading("Muenchen", "DE", now - timedelta(minutes=5)), "location_id": favorite["id"]}])
+    db.insert_reading(reading("Graz", "AT", now))  # ad-hoc search: resolved by name
+
+    with db.get_connection() as conn:
+        locations = conn.execute("SELECT city, is_active FROM locations ORDER BY id").fetchall()
+    assert [tuple(row) for row in locations] == [("Munich", 1), ("Graz", 0)], \
+        f"❌ Provider spellings should not create locations: {[tuple(row) for row in locations]}"
+    assert len(db.fetch_recent("Munich", "DE")) == 2, "❌ Tracked readings should be stored under the favorite"
+    db.close()
+    print("✅ Tracked location id test passed")
+
+
+def test_legacy_text_readings_are_migrated(tmp_path, monkeypatch):
+    path = tmp_path / "weather.db"
+    legacy = sqlite3.connect(path)
+    legacy.executescript("""
+        CREATE TABLE locations (id INTEGER PRIMARY KEY, city TEXT NOT NULL, country TEXT NOT NULL,
+            lat REAL, lon REAL, tz TEXT, is_active INTEGER DEFAULT 1, created_at TEXT, UNIQUE(city, country));
+        CREATE TABLE request_log (id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, url TEXT NOT NULL,
+            location_id INTEGER, status TEXT NOT NULL, error TEXT, latency_ms INTEGER, created_at TEXT);
+        CREATE TABLE readings (id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, city TEXT NOT NULL,
+            country TEXT NOT NULL, state TEXT, temp REAL NOT NULL, humidity INTEGER, pressure REAL,
+            wind_speed REAL, weather_summary TEXT, weather_detail TEXT);
+        INSERT INTO locations (id, city, country, lat, lon, is_active) VALUES (1, 'Austin', 'US', 30.3, -97.7, 0);
+        INSERT INTO locations (id, city, country, is_active) VALUES (2, 'austin', 'us', 1);
+        INSERT INTO request_log (timestamp, url, location_id, status) VALUES ('2024-03-01T12:00:00', 'x', 2, 'success');
+        INSERT INTO readings (timestamp, city, country, state, temp) VALUES
+            ('2024-03-01T12:00:00', 'Austin', 'US', 'TX', 20),
+            ('2024-03-01T13:00:00', 'austin', 'us', 'TX', 21),
+            ('2024-03-01T14:00:00', 'Paris', 'FR', '', 15);
+    """)
+    legacy.commit()
+    legacy.close()
+
+    monkeypatch.setenv("DB_PATH", str(path))
+    db = WeatherDB()
+    with db.get_connection() as conn:
+        locations = {row["city"]: dict(row) for row in conn.execute("SELECT * FROM locations")}
+        log_location = conn.execute("SELECT location_id FROM request_log").fetchone()[0]
+        hourly = conn.execute("SELECT COUNT(*) FROM readings_hourly").fetchone()[0]
+    assert sorted(locations) == ["Austin", "Paris"], f"❌ Duplicate spellings were not merged: {locations}"
+    austin = locations["Austin"]
+    assert austin["id"] == 1 and austin["is_active"] == 1 and austin["lat"] == 30.3, "❌ Merged location lost its fields"
+    assert austin["state"] == "TX", "❌ State was not carried over from the readings"
+    assert log_location == 1, "❌ request_log still points at the merged-away location"
+    assert locations["Paris"]["is_active"] == 0, "❌ Locations only seen in readings should be inactive"
+
+    start = datetime(2024, 3, 1).timestamp()
+    assert [r[1] for r in db.fetch_range(start, start + 86400, "AUSTIN", "US")] == [20, 21], \
+        "❌ Migrated readings are not reachable through the location id"
+    assert hourly == 3, "❌ Rollups were not rebuilt for the migrated readings"
+    db.close()
+    print("✅ Legacy location migration test passed")
@@ -0,0 +1,76 @@
+import sys
+import os
+import logging
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from components.get_weather import GetWeather
+from weather_data_fetcher import build_weather_reading
+from weather_db import WeatherDB
+
+
+def reading(city, age_minutes):
+    raw = {
+        "id": 1, "dt": 1700000000, "name": city, "sys": {"country": "US"},
+        "main": {"temp": 70.0, "feels_like": 69.0, "humidity": 50, "pressure": 1013},
+        "weather": [{"main": "Clear", "description": "clear sky"}],
+        "wind": {"speed": 3.2, "deg": 100}, "clouds": {"all": 0}
+    }
+    data = build_weather_reading(raw, city, "imperial")
+    data["api_timestamp"] = (datetime.utcnow() - timedelta(minutes=age_minutes)).isoformat()
+    return data
+
+
+class OfflineFetcher:
+    """Fetcher whose API is down"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_current_weather(self, city, country=None, units="metric"):
+        self.calls += 1
+        return None
+
+    def fetch_forecast_table(self, city, country=None, units="metric"):
+        return None
+
+    def peek_forecast_table(self, city, country=None, units="metric"):
+        return None
+
+
+def make_component(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    monkeypatch.chdir(tmp_path)  # get_weather_stats appends to weather_log.csv in the working directory
+    db = WeatherDB()
+    fetcher = OfflineFetcher()
+    component = GetWeather(fetcher, db, logging.getLogger("test"))
+    events = []
+    component.register_callback('on_weather_success', lambda data, units: events.append(("success", data)))
+    component.register_callback('on_weather_error', lambda msg: events.append(("error", msg)))
+    return component, db, fetcher, events
+
+
+def test_stale_reading_is_shown_when_api_is_down(tmp_path, monkeypatch):
+    component, db, fetcher, events = make_component(tmp_path, monkeypatch)
+    db.insert_reading(reading("Knoxville", age_minutes=90))
+
+    component.get_weather("Knoxville", "US")
+    assert fetcher.calls == 1, "❌ Stale reading should trigger a background refresh"
+    assert [kind for kind, _ in events] == ["success"], f"❌ Expected only the stored reading, got {events}"
+    assert events[0][1]["stale"] and events[0][1]["stale_label"] == "🕒 Updated 1 h ago", "❌ Staleness not marked"
+
+    print("✅ Offline stale reading test passed")
+
+
+def test_fresh_reading_skips_the_api(tmp_path, monkeypatch):
+    component, db, fetcher, events = make_component(tmp_path, monkeypatch)
+    db.insert_reading(reading("Knoxville", age_minutes=2))
+
+    component.get_weather("Knoxville", "US")
+    assert fetcher.calls == 0, "❌ Fresh stored reading should not call the API"
+    assert events[0][0] == "success" and not events[0][1]["stale"], "❌ Fresh reading not served"
+
+    component.get_weather("Tokyo", "JP")
+    assert events[-1][0] == "error", "❌ Unknown city with API down should report an error"
+
+    print("✅ Offline fresh reading test passed")
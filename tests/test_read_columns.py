@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from services.weather_stats import get_weather_stats, stats_from_columns
+from weather_db import WeatherDB
+
+
+def reading(city, when, temp, summary="Clear", humidity=50):
+    return {
+        "timestamp": when.isoformat(timespec="seconds"), "city": city, "country": "GB", "temp": temp,
+        "feels_like": temp, "humidity": humidity, "pressure": 1013, "weather_summary": summary,
+        "weather_detail": summary.lower(), "wind_speed": 2.0, "wind_direction": 90, "cloudiness": 0,
+        "visibility": 10000, "api_timestamp": when.isoformat()
+    }
+
+
+def test_read_columns_returns_typed_arrays(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    now = datetime.utcnow().replace(microsecond=0)
+    db.write_batch([
+        reading("London", now - timedelta(hours=3, minutes=30), 10.0, "Rain"),
+        reading("London", now - timedelta(hours=2, minutes=30), 12.0, "Clear", humidity=None),
+        reading("London", now - timedelta(hours=1, minutes=30), 14.0, "Rain"),
+        reading("Paris", now - timedelta(hours=1, minutes=30), 30.0),
+    ])
+
+    columns = db.read_columns("london", "gb", fields=("temp", "humidity", "weather_summary"))
+    assert columns["ts"].dtype == np.int64 and columns["temp"].dtype == np.float32, "❌ Wrong column dtypes"
+    assert columns["temp"].flags["C_CONTIGUOUS"], "❌ Measure arrays should be contiguous"
+    assert columns["temp"].tolist() == [10.0, 12.0, 14.0], "❌ Rows should be the city's, oldest first"
+    assert np.isnan(columns["humidity"][1]) and columns["humidity"][0] == 50, "❌ NULL should read back as NaN"
+    labels = columns["weather_summary_labels"]
+    assert [labels[code] for code in columns["weather_summary"]] == ["Rain", "Clear", "Rain"], \
+        "❌ Categorical codes do not map back to their labels"
+
+    start = (now - timedelta(hours=2)).timestamp()
+    assert len(db.read_columns(start=start)["ts"]) == 2, "❌ start bound not applied across cities"
+
+    stats = stats_from_columns(columns, "GB", days=1)
+    assert stats["avg_temp"] == 12.0 and stats["min_temp"] == 10.0 and stats["temp_range"] == 4.0, \
+        f"❌ Wrong temperature stats: {stats}"
+    assert stats["humidity_avg"] == 50.0, "❌ NaN humidity should be skipped"
+    assert stats["common_conditions"] == "Rain" and stats["condition_count"] == 2, "❌ Wrong condition stats"
+    db.close()
+    print("✅ Columnar read test passed")
+
+
+def test_weather_stats_falls_back_to_columns(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    monkeypatch.chdir(tmp_path)
+    db = WeatherDB()
+    now = datetime.utcnow().replace(microsecond=0)
+    db.write_batch([reading("London", now - timedelta(hours=h, minutes=30), 10.0 + h) for h in range(6)])
+    # Without rollups get_weather_stats has to read the raw columns
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM readings_hourly")
+
+    stats = get_weather_stats(db, "London", country="GB", days=1)
+    assert stats["total_readings"] == 6 and stats["avg_temp"] == 12.5, f"❌ Raw-column stats are wrong: {stats}"
+    db.close()
+    print("✅ Columnar stats fallback test passed")
@@ -0,0 +1,61 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import Config
+from services.transport import ReplayTransport
+from weather_data_fetcher import WeatherDataFetcher
+
+
+def make_fetcher(transport):
+    config = Config(api_key="test-key", db_file_path=":memory:")
+    fetcher = WeatherDataFetcher(config, transport=transport)
+    fetcher.min_request_interval = 0
+    return fetcher
+
+
+def test_fetcher_runs_offline_against_replay_transport():
+    transport = ReplayTransport(seed=1)
+    fetcher = make_fetcher(transport)
+
+    reading = fetcher.fetch_current_weather("Springfield", "US")
+    assert reading["city"] == "Springfield", "❌ Replay payload not personalized"
+    assert reading["city_id"] == ReplayTransport.city_id("Springfield"), "❌ City ID not stable"
+
+    group = fetcher.fetch_current_weather_group([reading["city_id"]], units="imperial")
+    assert group[reading["city_id"]]["city"] == "Springfield", "❌ /group replay lost the city name"
+
+    assert fetcher.get_coordinates("Springfield", "US") == (35.9606, -83.9207), "❌ Geocoding fixture not served"
+    assert "daily" in fetcher.fetch_extended_forecast("Springfield", "US"), "❌ One Call fixture not served"
+    assert transport.calls == {"weather": 1, "group": 1, "direct": 1, "onecall": 1}, f"❌ Unexpected calls: {transport.calls}"
+
+    print("✅ Replay transport test passed")
+
+
+def test_replay_transport_injects_errors():
+    transport = ReplayTransport(error_rate=1.0, seed=1)
+    fetcher = make_fetcher(transport)
+    fetcher.max_inline_retry_wait = 0
+
+    assert fetcher.fetch_current_weather("Springfield", "US") is None, "❌ Injected 500 should fail the fetch"
+    assert transport.calls["weather"] == 1, "❌ Failed request should be parked, not retried inline"
+
+    print("✅ Replay error injection test passed")
+
+
+def test_coordinate_requests_share_the_api_safeguards(tmp_path):
+    transport = ReplayTransport(seed=1)
+    config = Config(api_key="test-key", db_file_path=":memory:", http_cache_dir=str(tmp_path))
+    fetcher = WeatherDataFetcher(config, transport=transport)
+    fetcher.min_request_interval = 0
+
+    fetcher.circuit_breaker.hold("api.openweathermap.org", 60)
+    assert fetcher.fetch_weather_alerts("Springfield", "US") == [], "❌ An open breaker should block alert lookups"
+    assert transport.calls == {}, f"❌ Geocoding or One Call bypassed the circuit breaker: {transport.calls}"
+
+    fetcher.circuit_breaker.record_success("api.openweathermap.org")  # closes the breaker again
+    fetcher.fetch_weather_alerts("Springfield", "US")
+    fetcher.fetch_weather_alerts("Springfield", "US")
+    assert transport.calls == {"direct": 1, "onecall": 1}, f"❌ One Call responses should be cached: {transport.calls}"
+
+    print("✅ Coordinate request safeguard test passed")
@@ -0,0 +1,89 @@
+import sys
+import os
+import sqlite3
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from datetime import datetime, timedelta
+
+from automated_weather_tracker import AutomatedWeatherTracker
+from services.job_scheduler import JobScheduler
+from services.retention import RetentionManager
+from weather_db import WeatherDB
+
+
+def reading(city, when, temp):
+    return {
+        "timestamp": when.isoformat(timespec="seconds"), "city": city, "country": "US", "temp": temp,
+        "feels_like": temp, "humidity": 50, "pressure": 1013, "weather_summary": "Clear",
+        "weather_detail": "clear sky", "wind_speed": 2.0, "wind_direction": 90, "cloudiness": 0,
+        "visibility": 10000, "api_timestamp": when.isoformat()
+    }
+
+
+def test_compact_archives_and_prunes_old_readings(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    now = datetime(2024, 6, 15, 12)
+    old = [now - timedelta(days=200, hours=i) for i in range(3)] + [now - timedelta(days=120)]
+    recent = [now - timedelta(days=1, hours=i) for i in range(2)]
+    db.write_batch([reading("Austin", when, 60.0 + i) for i, when in enumerate(old + recent)])
+    with db.get_connection() as conn:
+        old_end = conn.execute("SELECT MAX(ts) FROM readings WHERE temp < 64").fetchone()[0]
+    daily_before = db.get_rollups("daily", 0, old_end, "Austin", "US")
+
+    assert RetentionManager(db).compact(now.timestamp()) == {"archived": 0, "deleted": 0, "hourly_deleted": 0}, \
+        "❌ Pruning must be opt-in"
+    retention = RetentionManager(db, raw_days=90, hourly_days=150, archive_dir=str(tmp_path / "archive"),
+                                 batch_size=2)
+    result = retention.compact(now.timestamp())
+
+    assert result["deleted"] == 4 and result["archived"] == 4, f"❌ Unexpected compaction counts: {result}"
+    assert len(db.get_all_readings()) == 2, "❌ Recent readings should stay in the raw table"
+    assert db.get_rollups("daily", 0, old_end, "Austin", "US") == daily_before, "❌ Daily rollups must survive"
+    hourly = db.get_rollups("hourly", 0, old_end, "Austin", "US")
+    assert len(hourly) == 1, f"❌ Only hourly buckets inside the hourly window should remain: {hourly}"
+    assert len(os.listdir(tmp_path / "archive")) == 2, "❌ Expected one partition per month"
+
+    archived = retention.fetch_archived(0, now.timestamp(), "austin", "us")
+    assert [row["temp"] for row in archived] == [62.0, 61.0, 60.0, 63.0], "❌ Archived rows missing or unordered"
+    assert archived[0]["city"] == "Austin", "❌ Archived rows should carry the location name"
+    assert retention.compact(now.timestamp())["deleted"] == 0, "❌ A second pass should find nothing to do"
+
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2, "❌ New databases should use incremental vacuum"
+        conn.execute("PRAGMA auto_vacuum = NONE")
+        conn.execute("VACUUM")
+    pending = db.connections.connection().execute("SELECT id FROM readings")
+    pending.fetchone()  # an unfinished cursor on this thread must not block the VACUUM
+    retention.optimize()
+    pending.close()
+    db.close()
+    conn = sqlite3.connect(tmp_path / "weather.db")
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2, "❌ optimize() should convert to incremental vacuum"
+    conn.close()
+
+    print("✅ Retention compaction test passed")
+
+
+def test_maintenance_waits_for_idle_scheduler(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    clock = [1_000_000.0]
+    calls = []
+
+    class StubRetention:
+        def run(self, now, keep_going):
+            calls.append(now)
+
+    tracker = AutomatedWeatherTracker(collector=object(), database=db, retention=StubRetention())
+    tracker.scheduler = JobScheduler(clock=lambda: clock[0])
+    tracker.scheduler.schedule(("poll", 1), lambda: None, delay=10)
+
+    assert not tracker.run_maintenance(), "❌ Maintenance must not start with a poll due soon"
+    clock[0] += 20
+    tracker.scheduler.run_pending()
+    tracker.scheduler.schedule(("poll", 1), lambda: None, delay=600)
+    assert tracker.run_maintenance() and calls == [clock[0]], "❌ Maintenance should run once idle"
+    assert not tracker.run_maintenance(), "❌ Maintenance should wait for its next interval"
+
+    print("✅ Idle maintenance test passed")
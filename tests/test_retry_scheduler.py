@@ -0,0 +1,63 @@
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.retry_scheduler import CircuitBreaker, RetryScheduler, parse_retry_after
+
+HOST = "api.openweathermap.org"
+
+
+def test_circuit_breaker_opens_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.1)
+    for _ in range(2):
+        breaker.record_failure(HOST)
+    assert breaker.allow(HOST), "❌ Breaker opened before the threshold"
+
+    breaker.record_failure(HOST)
+    assert not breaker.allow(HOST) and breaker.is_open(HOST), "❌ Breaker did not open"
+    assert breaker.allow("other.example.com"), "❌ Breaker blocked an unrelated host"
+
+    time.sleep(0.15)
+    assert breaker.allow(HOST), "❌ Breaker did not allow a half-open probe"
+    assert not breaker.allow(HOST), "❌ Half-open breaker let a second caller through"
+    breaker.record_failure(HOST)
+    assert not breaker.allow(HOST), "❌ A failed probe should re-open the breaker"
+
+    time.sleep(0.15)
+    assert breaker.allow(HOST) and not breaker.allow(HOST), "❌ Expected exactly one probe"
+    breaker.record_success(HOST)
+    assert not breaker.is_open(HOST), "❌ Success did not close the breaker"
+    assert breaker.allow(HOST) and breaker.allow(HOST), "❌ A closed breaker should let every caller through"
+
+    breaker.hold(HOST, 30)
+    assert not breaker.allow(HOST) and 29 < breaker.retry_in() <= 30, "❌ Retry-After hold not applied"
+
+    print("✅ Circuit breaker test passed")
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0, "❌ Delta-seconds not parsed"
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0, "❌ Past HTTP-date should be 0"
+    assert parse_retry_after(None) is None and parse_retry_after("soon") is None, "❌ Invalid value accepted"
+
+    print("✅ Retry-After parsing test passed")
+
+
+def test_retry_scheduler_parks_until_due():
+    queue = RetryScheduler(base_delay=1.0, max_delay=10.0, max_attempts=2)
+    queue.park("a", {"city": "A"}, min_delay=5)
+    queue.park("b", {"city": "B"}, min_delay=1)
+    assert queue.pop_due() == [], "❌ Items released before their delay"
+
+    due = queue.pop_due(now=time.time() + 20)
+    assert due == [{"city": "B"}, {"city": "A"}], f"❌ Items not released in due order: {due}"
+
+    queue.park("a", {"city": "A"})
+    queue.forget("a")
+    assert len(queue) == 0 and queue.pop_due(now=time.time() + 20) == [], "❌ forget() left the item queued"
+
+    assert queue.park("c", {}) is not None and queue.park("c", {}) is not None
+    assert queue.park("c", {}) is None, "❌ Item not dropped after max_attempts"
+
+    print("✅ Retry scheduler test passed")
@@ -0,0 +1,120 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from datetime import datetime, timedelta
+
+from services.rollups import rebuild_rollups
+from services.weather_stats import STAT_FIELDS, stats_from_columns, stats_from_rollups
+from weather_db import WeatherDB
+
+
+def reading(city, when, temp, summary="Clear", humidity=50, wind=2.0):
+    return {
+        "timestamp": when.isoformat(timespec="seconds"), "city": city, "country": "US", "temp": temp,
+        "feels_like": temp, "humidity": humidity, "pressure": 1013, "weather_summary": summary,
+        "weather_detail": summary.lower(), "wind_speed": wind, "wind_direction": 90, "cloudiness": 0,
+        "visibility": 10000, "api_timestamp": when.isoformat()
+    }
+
+
+def snapshot(db):
+    with db.get_connection() as conn:
+        return [
+            [tuple(row) for row in conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2, 3, 4")]
+            for table in ("readings_hourly", "readings_daily", "conditions_hourly", "conditions_daily")
+        ]
+
+
+def test_rollups_track_every_write_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    day = datetime(2024, 5, 1)
+
+    db.insert_reading(reading("Austin", day + timedelta(hours=9, minutes=5), 60.0, "Clear"))
+    db.write_batch([
+        reading("Austin", day + timedelta(hours=9, minutes=35), 64.0, "Clouds", humidity=70),
+        reading("Austin", day + timedelta(hours=15), 80.0, "Clear"),
+        reading("Boston", day + timedelta(hours=9), 50.0, "Rain"),
+    ])
+    db.start_write_pipeline()
+    db.insert_reading(reading("Austin", day + timedelta(days=1, hours=2), 55.0, "Rain"))
+    db.flush_writes()
+    db.stop_write_pipeline()
+
+    start, end = day.timestamp() - 86400, day.timestamp() + 3 * 86400
+    hourly = db.get_rollups("hourly", start, end, "Austin", "US")
+    assert [row["n"] for row in hourly] == [2, 1, 1], f"❌ Wrong hourly buckets: {hourly}"
+    assert hourly[0]["temp_avg"] == 62.0 and hourly[0]["temp_min"] == 60.0 and hourly[0]["temp_max"] == 64.0, \
+        "❌ Hourly temp aggregates are wrong"
+    assert hourly[0]["humidity_avg"] == 60.0, "❌ Humidity was not rolled up"
+
+    daily = db.get_rollups("daily", start, end, "Austin", "US")
+    assert [(row["n"], row["temp_max"], row["condition"]) for row in daily] == [(3, 80.0, "Clear"), (1, 55.0, "Rain")], \
+        f"❌ Wrong daily buckets: {daily}"
+    combined = db.get_rollups("daily", start, end)
+    assert combined[0]["n"] == 4 and combined[0]["temp_min"] == 50.0, "❌ Cross-city buckets were not combined"
+
+    incremental = snapshot(db)
+    with db.get_connection() as conn:
+        rebuild_rollups(conn)
+    assert snapshot(db) == incremental, "❌ Incremental rollups drifted from a full rebuild"
+    db.close()
+    print("✅ Rollup maintenance test passed")
+
+
+def test_weather_stats_come_from_rollups(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    now = datetime.utcnow().replace(microsecond=0)
+    db.write_batch([
+        reading("Austin", now - timedelta(hours=h), 70.0 + h % 5, "Rain" if h % 3 == 0 else "Clear", wind=h % 4)
+        for h in range(1, 49)
+    ])
+
+    stats = stats_from_rollups(db, "Austin", "US", days=1)
+    temps = [70.0 + h % 5 for h in range(1, 24)]
+    assert stats["total_readings"] in (23, 24), f"❌ Wrong window size: {stats['total_readings']}"
+    assert stats["min_temp"] == min(temps) and stats["max_temp"] == max(temps), "❌ Temperature range is wrong"
+    assert stats["common_conditions"] == "Clear" and stats["condition_count"] == 2, "❌ Condition histogram is wrong"
+    assert stats["wind_max"] == 3.0 and stats["data_quality"] == "Excellent", "❌ Wind or coverage stats are wrong"
+    assert stats_from_rollups(db, "Nowhere", "US", days=1) is None, "❌ Missing city should fall back to raw readings"
+    db.close()
+    print("✅ Rollup stats test passed")
+
+
+def test_rollup_stats_match_raw_stats_for_mixed_units(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    now = datetime.now().replace(minute=30, second=0, microsecond=0)
+    # US rows under 50 are Celsius readings; several share an hour with Fahrenheit ones
+    temps = [20.0, 70.0, 18.5, 88.0, 25.0, 64.0, 31.0, 55.0]
+    db.write_batch([reading("Knoxville", now - timedelta(hours=2 + i // 2, minutes=i % 2), temp)
+                    for i, temp in enumerate(temps)])
+
+    rollup = stats_from_rollups(db, "Knoxville", "US", days=1)
+    raw = stats_from_columns(db.read_columns("Knoxville", "US", start=now.timestamp() - 86400, fields=STAT_FIELDS),
+                             "US", days=1)
+    for key in ("total_readings", "avg_temp", "min_temp", "max_temp", "temp_range"):
+        assert rollup[key] == raw[key], f"❌ {key} differs: rollups {rollup[key]} vs raw {raw[key]}"
+    assert raw["min_temp"] == 55.0 and raw["avg_temp"] == 71.9, "❌ Celsius readings were not converted"
+    db.close()
+    print("✅ Mixed-unit rollup stats test passed")
+
+
+def test_repeated_observations_are_stored_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    when = datetime(2024, 5, 1, 9, 10)
+
+    assert db.insert_reading(reading("Austin", when, 60.0)), "❌ First reading should be stored"
+    assert db.insert_reading(reading("Austin", when, 60.0)), "❌ A repeated observation is not an error"
+    assert db.write_batch([reading("Austin", when, 60.0), reading("Austin", when + timedelta(minutes=10), 62.0),
+                           reading("Austin", when + timedelta(minutes=10), 62.0)]) == 3, \
+        "❌ Repeated observations should count as stored"
+
+    assert len(db.get_all_readings()) == 2, "❌ A poll served the same observation twice and it was stored twice"
+    hourly = db.get_rollups("hourly", 0, when.timestamp() + 86400, "Austin", "US")
+    assert [row["n"] for row in hourly] == [2], f"❌ Rollups counted repeated observations: {hourly}"
+    db.close()
+    print("✅ Duplicate observation test passed")
@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from collections import Counter
+
+from automated_weather_tracker import AutomatedWeatherTracker
+from config import Config
+from services.sharded_collector import HashRing, ShardedCollector
+from services.transport import ReplayTransport
+from weather_db import WeatherDB
+
+
+def test_hash_ring_is_balanced_and_stable():
+    ring = HashRing(range(4))
+    owners = {key: ring.node_for(key) for key in range(4000)}
+    counts = Counter(owners.values())
+    assert min(counts.values()) > 600, f"❌ Uneven split across shards: {counts}"
+
+    grown = HashRing(range(5))
+    moved = sum(1 for key, node in owners.items() if grown.node_for(key) != node)
+    assert moved < 4000 * 0.35, f"❌ Adding a shard moved {moved} of 4000 keys"
+    assert all(grown.node_for(key) == 4 for key, node in owners.items() if grown.node_for(key) != node), \
+        "❌ Keys should only move to the new shard"
+    print("✅ Hash ring test passed")
+
+
+def test_sharded_sweeps_write_through_single_writer(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    config = Config(api_key="test-key", db_file_path=str(tmp_path / "weather.db"), requests_per_second=1000)
+    tracker = AutomatedWeatherTracker(collector=None, database=db)
+    for i in range(30):
+        tracker.add_location(f"Shard City {i}", "US")
+
+    with ShardedCollector(config, db, workers=2, transport_factory=ReplayTransport,
+                          fetcher_overrides={"max_inline_retry_wait": 0}, batch_size=8) as collector:
+        shards = collector.partition(tracker.get_active_locations())
+        assert sum(map(len, shards)) == 30 and all(shards), f"❌ Bad partition: {list(map(len, shards))}"
+
+        assert collector.collect_all_locations() == 30, "❌ First sweep did not store every city"
+        assert all(loc["owm_id"] for loc in tracker.get_active_locations()), "❌ Resolved city IDs were not written back"
+        assert collector.collect_all_locations() == 30, "❌ Grouped sweep did not store every city"
+
+    assert not collector.writer.running, "❌ stop() should close the write pipeline"
+    # Replay serves the same observation time on both sweeps, so each city is stored once
+    assert len(db.get_all_readings()) == 30, "❌ Readings missing or stored twice"
+    with db.get_connection() as conn:
+        logged = conn.execute("SELECT COUNT(*) FROM request_log WHERE status = 'success'").fetchone()[0]
+    assert logged == 60, f"❌ Expected 60 request-log rows, got {logged}"
+    print("✅ Sharded collection test passed")
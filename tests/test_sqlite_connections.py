@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import threading
+
+from weather_db import WeatherDB
+
+
+def test_connections_are_persistent_per_thread_and_tuned(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+
+    main_conn = db._conn()
+    assert db._conn() is main_conn, "❌ Same thread should reuse its connection"
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db._conn()))
+    thread.start()
+    thread.join()
+    assert other[0] is not main_conn, "❌ Threads must not share a connection"
+
+    assert main_conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal", "❌ WAL not enabled"
+    assert main_conn.execute("PRAGMA synchronous").fetchone()[0] == 1, "❌ synchronous should be NORMAL"
+    assert main_conn.execute("PRAGMA temp_store").fetchone()[0] == 2, "❌ temp_store should be MEMORY"
+    db.close()
+    print("✅ Connection manager test passed")
+
+
+def test_readers_are_not_blocked_by_an_open_write(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    db.update_location("Austin", "US")
+
+    writing = threading.Event()
+    release = threading.Event()
+
+    def writer():
+        with db.get_connection() as conn:
+            conn.execute("BEGIN EXCLUSIVE")  # locks readers out entirely in rollback-journal mode
+            conn.execute("UPDATE locations SET is_active = 0 WHERE city = 'Austin'")
+            writing.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    assert writing.wait(5), "❌ Writer did not start"
+    locations = db.get_all_locations()
+    release.set()
+    thread.join()
+
+    assert locations and locations[0]["is_active"] == 1, "❌ Reader should see the last committed state"
+    assert db.get_all_locations()[0]["is_active"] == 0, "❌ Write was not committed"
+    db.close()
+    print("✅ Concurrent read test passed")
@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from automated_weather_tracker import AutomatedWeatherTracker
+from weather_data_fetcher import build_weather_reading
+from weather_db import WeatherDB
+
+
+def raw_weather(city, city_id, dt=1700000000):
+    return {
+        "id": city_id, "dt": dt, "name": city,
+        "sys": {"country": "US"},
+        "main": {"temp": 70.0, "feels_like": 69.0, "humidity": 50, "pressure": 1013},
+        "weather": [{"main": "Clear", "description": "clear sky"}],
+        "wind": {"speed": 3.2, "deg": 100}, "clouds": {"all": 0}
+    }
+
+
+class RecordingFetcher:
+    """Serves canned readings and records which endpoint each city went through"""
+
+    def __init__(self, ids):
+        self.ids = ids
+        self.single_calls = []
+        self.group_calls = []
+
+    def fetch_current_weather(self, city, country=None, units="metric"):
+        self.single_calls.append(city)
+        return build_weather_reading(raw_weather(city, self.ids[city]), city, "imperial")
+
+    def fetch_current_weather_group(self, city_ids, units="metric"):
+        self.group_calls.append(list(city_ids))
+        names = {city_id: city for city, city_id in self.ids.items()}
+        # Ten minutes on: the provider has published a new observation
+        return {i: build_weather_reading(raw_weather(names[i], i, 1700000600), names[i], units) for i in city_ids}
+
+
+def test_tracker_batches_known_city_ids(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    ids = {f"City{i}": 1000 + i for i in range(25)}
+    fetcher = RecordingFetcher(ids)
+    tracker = AutomatedWeatherTracker(collector=fetcher, database=db)
+    for city in ids:
+        tracker.add_location(city, "US")
+
+    # First sweep resolves and stores provider IDs through per-city calls
+    tracker.collect_all_locations()
+    assert len(fetcher.single_calls) == 25, "❌ Unresolved cities should use /weather"
+    assert all(loc["owm_id"] for loc in tracker.get_active_locations()), "❌ City IDs not persisted"
+
+    # Later sweeps go through /group in batches of 20
+    tracker.collect_all_locations()
+    assert len(fetcher.single_calls) == 25, "❌ Known cities were fetched individually"
+    assert [len(batch) for batch in fetcher.group_calls] == [20, 5], f"❌ Unexpected batches: {fetcher.group_calls}"
+    assert len(db.get_all_readings()) == 50, "❌ Group readings were not stored"
+
+    print("✅ Tracker group collection test passed")
@@ -0,0 +1,31 @@
+import sys
+import os
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import Config
+from services.transport import HTTPXTransport, create_transport, get_shared_transport
+from weather_data_fetcher import WeatherDataFetcher
+
+
+def test_transport_pool_is_configurable_and_shared():
+    config = Config(api_key="test-key", db_file_path=":memory:", http_pool_size=32, http_keep_alive=False)
+    transport = create_transport(config)
+    adapter = transport.session.get_adapter("https://api.openweathermap.org")
+    assert adapter is transport.adapter and adapter._pool_maxsize == 32, "❌ Pool size not applied"
+    assert transport.session.headers["Connection"] == "close", "❌ Keep-alive not disabled"
+
+    first = WeatherDataFetcher(config)
+    second = WeatherDataFetcher(config)
+    assert first.session is second.session is get_shared_transport(), "❌ Fetchers did not share the transport"
+
+    print("✅ Transport pool test passed")
+
+
+def test_http2_transport_uses_httpx():
+    pytest.importorskip("h2")
+    transport = create_transport(Config(api_key="test-key", db_file_path=":memory:", http2=True))
+    assert isinstance(transport, HTTPXTransport), "❌ HTTP/2 config did not select httpx"
+    transport.close()
+
+    print("✅ HTTP/2 transport test passed")
@@ -0,0 +1,123 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import threading
+import time
+
+from services.write_pipeline import WritePipeline
+from weather_db import WeatherDB
+
+
+def reading(city, temp=20.0):
+    return {
+        "timestamp": "2024-01-01T00:00:00", "city": city, "country": "US", "temp": temp, "feels_like": temp,
+        "humidity": 50, "pressure": 1013, "weather_summary": "Clear", "weather_detail": "clear sky",
+        "wind_speed": 1.0, "wind_direction": 90, "cloudiness": 0, "visibility": 10000,
+        "api_timestamp": "2024-01-01T00:00:00"
+    }
+
+
+class RecordingDB:
+    def __init__(self):
+        self.batches = []
+        self.written = threading.Event()
+
+    def write_batch(self, readings, request_logs, city_ids):
+        self.batches.append((list(readings), list(request_logs), list(city_ids)))
+        self.written.set()
+        return len(readings)
+
+
+def test_pipeline_batches_by_size_and_time():
+    db = RecordingDB()
+    pipeline = WritePipeline(db, batch_size=10, flush_interval=0.1)
+    for i in range(25):
+        pipeline.put_reading({"i": i})
+    pipeline.put_log("auto_fetch", 1, "success")
+    assert db.written.wait(2), "❌ Full batch was not written"
+    time.sleep(0.3)  # the remainder goes out once it is flush_interval old
+    assert [len(r) + len(l) for r, l, _ in db.batches] == [10, 10, 6], f"❌ Unexpected batches: {db.batches}"
+    assert pipeline.written == 25, "❌ Written count is off"
+    pipeline.close()
+    print("✅ Pipeline batching test passed")
+
+
+def test_flush_makes_queued_writes_visible(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    db.update_location("Austin", "US")
+    location_id = db.get_location_id("Austin", "US")
+
+    db.start_write_pipeline(batch_size=1000, flush_interval=60)
+    for i in range(50):
+        assert db.insert_reading({**reading("Austin", 20.0 + i), "timestamp": f"2024-01-01T00:{i:02d}:00"}), \
+            "❌ Queued insert should report success"
+        db.log_request("auto_fetch", location_id, "success")
+    db.save_city_id(location_id, 4671654)
+    db.insert_reading({"city": "Broken"})  # malformed rows are skipped, not fatal to the batch
+    assert not db.flush_writes(timeout=5), "❌ flush() should report the skipped row"
+
+    assert len(db.fetch_all_for_city("Austin", "US")) == 50, "❌ Readings were not committed by flush()"
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM request_log").fetchone()[0] == 50, "❌ Log rows missing"
+        assert conn.execute("SELECT owm_id FROM locations WHERE id = ?", (location_id,)).fetchone()[0] == 4671654, \
+            "❌ City ID was not written"
+    assert db.write_pipeline.batches == 1, "❌ Everything queued before flush should go out in one transaction"
+    assert db.write_pipeline.failed == 1, "❌ The skipped row should be counted as failed"
+
+    db.stop_write_pipeline()
+    assert db.insert_reading({**reading("Austin"), "timestamp": "2024-01-01T01:00:00"}), "❌ Direct insert failed"
+    assert len(db.fetch_all_for_city("Austin", "US")) == 51, \
+        "❌ Direct writes should resume after the pipeline stops"
+    print("✅ Pipeline flush test passed")
+
+
+def test_flush_reports_failed_batches():
+    class FailingDB(RecordingDB):
+        def write_batch(self, readings, request_logs, city_ids):
+            raise RuntimeError("disk I/O error")
+
+    pipeline = WritePipeline(FailingDB(), batch_size=10, flush_interval=5.0)
+    pipeline.put_reading(reading("Austin"))
+    pipeline.put_log("auto_fetch", 1, "queued")
+    assert not pipeline.flush(timeout=5), "❌ flush() should report the failed batch"
+    assert pipeline.failed == 1 and pipeline.written == 0, "❌ Dropped readings were not counted"
+    assert pipeline.flush(timeout=5), "❌ A failure should only be reported once"
+    pipeline.close(timeout=5)
+    print("✅ Write pipeline failure reporting test passed")
+
+
+def test_invalid_reading_fails_flush_but_keeps_valid_ones(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "weather.db"))
+    db = WeatherDB()
+    db.start_write_pipeline(batch_size=1000, flush_interval=60)
+    db.insert_reading(reading("Austin", temp=None))
+    db.insert_reading(reading("Boston"))
+    assert not db.flush_writes(timeout=5), "❌ flush_writes() should report the invalid reading"
+    assert [row["city"] for row in db.get_all_readings()] == ["Boston"], "❌ The valid reading should be stored"
+    assert db.flush_writes(timeout=5), "❌ The failure should only be reported once"
+    db.close()
+    print("✅ Real database write failure test passed")
+
+
+def test_failed_batch_is_retried_row_by_row():
+    class OneBadRowDB(RecordingDB):
+        def write_batch(self, readings, request_logs, city_ids):
+            if any(data["temp"] is None for data in readings):
+                raise RuntimeError("NOT NULL constraint failed: readings.temp")
+            return super().write_batch(readings, request_logs, city_ids)
+
+    db = OneBadRowDB()
+    pipeline = WritePipeline(db, batch_size=10, flush_interval=5.0)
+    pipeline.put_reading(reading("Austin"))
+    pipeline.put_reading(reading("Boston", temp=None))
+    pipeline.put_reading(reading("Denver"))
+    pipeline.put_log("auto_fetch", 1, "queued")
+    assert not pipeline.flush(timeout=5), "❌ flush() should report the dropped row"
+    assert pipeline.written == 2 and pipeline.failed == 1, "❌ Only the bad row should be dropped"
+    stored = [data["city"] for readings, _, _ in db.batches for data in readings]
+    assert stored == ["Austin", "Denver"], f"❌ Good rows were not retried: {stored}"
+    assert sum(len(logs) for _, logs, _ in db.batches) == 1, "❌ Log rows should survive a bad reading"
+    pipeline.close(timeout=5)
+    print("✅ Write pipeline row isolation test passed")
@@ -13,3 +13,13 @@ def format_local_time(utc_iso: str, tz_name: str = "America/New_York") -> str:
         print(f"⚠️ Failed to convert time: {e}")
         return utc_iso
 
+
+def describe_age(seconds: float) -> str:
+    """Human-readable age, e.g. 'just now', '12 min ago' or '3 h ago'"""
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} h ago"
+    return f"{int(seconds // 86400)} days ago"
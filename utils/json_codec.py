@@ -0,0 +1,27 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib decoder is used without it
+    orjson = None
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Decode JSON with orjson when installed, falling back to the stdlib"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def decode_response(response) -> Any:
+    """Decode a transport response body in one pass.
+
+    Uses the raw ``content`` bytes when the response exposes them (requests,
+    httpx) so orjson can skip the str round trip; otherwise defers to the
+    response's own ``json()`` (e.g. ReplayTransport).
+    """
+    content = getattr(response, "content", None)
+    if isinstance(content, (bytes, bytearray, str)) and content:
+        return loads(content)
+    return response.json()
@@ -0,0 +1,87 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Generator, List, Optional, Union
+
+# Applied to every connection. WAL lets readers run alongside the single
+# writer; synchronous=NORMAL is durable in WAL mode except across power loss.
+DEFAULT_PRAGMAS: Dict[str, Union[str, int]] = {
+    # Only takes effect on a new, empty file, so it must come before journal_mode writes the header
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -20000,  # negative = KiB, so ~20 MB of page cache per connection
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+
+class SQLiteConnectionManager:
+    """One persistent connection per thread (and per process) for a database file.
+
+    sqlite3 connections must not be used from two threads at once, so every
+    thread lazily opens its own and keeps it for the life of the manager;
+    pragmas are applied once at open time instead of per query. Connections
+    are recreated after a fork. ``close_all`` closes every thread's
+    connection and should only be called when no other thread is using one.
+    """
+
+    def __init__(self, path: str, pragmas: Optional[Dict[str, Union[str, int]]] = None):
+        self.path = str(path)
+        self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _open(self) -> sqlite3.Connection:
+        # check_same_thread=False only so close_all() can close other threads' connections
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use"""
+        if os.getpid() != self._pid:
+            self._local = threading.local()
+            self._connections = []
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        """Commit on success, roll back on error; the connection stays open"""
+        conn = self.connection()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def close(self) -> None:
+        """Close the calling thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            with self._lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+            conn.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
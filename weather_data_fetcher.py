@@ -2,34 +2,169 @@ import sys
 import requests                 
 import time                    
 import logging                 
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import datetime
 from typing import Dict, List, Optional 
 import os
+import threading
+from services.geocode_cache import GeocodeCache
+from services.alert_monitor import AlertMonitor
+from services.forecast_cache import ForecastCache
+from services.http_cache import HTTPResponseCache
+from services.retry_scheduler import CircuitBreaker, backoff_delay, parse_retry_after
+from services.api_key_status import APIKeyStatus
+from services.transport import Transport, get_shared_transport
+from services.forecast_table import ForecastTable
+from utils.json_codec import decode_response
+from utils.rate_limiter import TokenBucket
+from urllib.parse import urlparse
+
+GEOCODING_BASE_URL = "http://api.openweathermap.org/geo/1.0"
+GEOCODING_URL = f"{GEOCODING_BASE_URL}/direct"
+SUNRISE_SUNSET_BASE_URL = "https://api.sunrise-sunset.org"
+GROUP_BATCH_SIZE = 20  # OpenWeatherMap's limit on city IDs per /group request
+
+
+def units_for_country(country: Optional[str]) -> str:
+    """US locations are reported in imperial units, everything else in metric"""
+    return "imperial" if (country or "").upper() == "US" else "metric"
+
+
+def build_weather_reading(raw_data: Dict, city: str, units: str, alerts: Optional[List[Dict]] = None) -> Dict:
+    """Normalize a raw /weather payload into the reading dict stored by WeatherDB.insert_reading"""
+    country_code = raw_data["sys"]["country"]
+    temp = raw_data["main"]["temp"]
+    feels_like = raw_data["main"]["feels_like"]
+    temp_min = raw_data["main"].get("temp_min", temp)
+    temp_max = raw_data["main"].get("temp_max", temp)
+
+    temp_unit = "°F" if units == "imperial" else "°C"
+
+    temp_display = round(temp, 1)
+    feels_display = round(feels_like, 1)
+    temp_min_display = round(temp_min, 1)
+    temp_max_display = round(temp_max, 1)
+
+    # Format sunrise and sunset times
+    sunrise_timestamp = raw_data["sys"].get("sunrise")
+    sunset_timestamp = raw_data["sys"].get("sunset")
+
+    sunrise_time = ""
+    sunset_time = ""
+    if sunrise_timestamp:
+        sunrise_dt = datetime.fromtimestamp(sunrise_timestamp)
+        sunrise_time = sunrise_dt.strftime("%I:%M %p")
+    if sunset_timestamp:
+        sunset_dt = datetime.fromtimestamp(sunset_timestamp)
+        sunset_time = sunset_dt.strftime("%I:%M %p")
+
+    return {
+        "timestamp": datetime.utcfromtimestamp(raw_data["dt"]).isoformat(),
+        "api_timestamp": datetime.utcnow().isoformat(),
+        "city": raw_data.get("name", city),
+        "country": country_code,
+        "state": "",
+        "temperature": temp_display,
+        "condition": raw_data["weather"][0].get("description", "Unknown"),
+        "temp": temp_display,
+        "temp_min": temp_min_display,
+        "temp_max": temp_max_display,
+        "feels_like": feels_display,
+        "temp_unit": temp_unit,
+        "humidity": raw_data["main"]["humidity"],
+        "pressure": raw_data["main"]["pressure"],
+        "weather_summary": raw_data["weather"][0]["main"],
+        "weather_detail": raw_data["weather"][0].get("description", "Unknown"),
+        "wind_speed": raw_data["wind"].get("speed", 0),
+        "wind_direction": raw_data["wind"].get("deg", 0),
+        "cloudiness": raw_data["clouds"].get("all", 0),
+        "visibility": raw_data.get("visibility", 10000),
+        "precipitation": 0,  # Basic API doesn't provide precipitation
+        "sunrise": sunrise_time,
+        "sunset": sunset_time,
+        "alerts": alerts or [],  # Weather alerts
+        "units": units,
+        "city_id": raw_data.get("id")  # Provider city ID, used for /group batching
+    }
+
+
+def parse_group_response(data: Optional[Dict], units: str) -> Dict[int, Dict]:
+    """Normalize a /group payload into readings keyed by provider city ID"""
+    readings = {}
+    for raw_data in (data or {}).get("list", []):
+        try:
+            readings[raw_data["id"]] = build_weather_reading(raw_data, raw_data.get("name", ""), units)
+        except (KeyError, IndexError, TypeError):
+            continue
+    return readings
+
 
 class WeatherDataFetcher:
-    def __init__(self, config, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    """Synchronous OpenWeatherMap client.
+
+    Concurrency contract: one instance may be shared by any number of threads
+    (GUI workers, the tracker loop, a ThreadPoolExecutor fan-out).
+
+    - HTTP goes through a thread-safe transport; the default gives every
+      thread its own ``requests.Session`` on a shared connection pool.
+    - Request pacing uses a token bucket whose accounting is a short critical
+      section; waiting for a token happens outside any lock.
+    - ``failed_cities`` is only mutated through ``register_failure``.
+    - The caches, circuit breaker and API key status lock internally.
+    - Caller-supplied ``params`` dicts are never mutated.
+
+    Returned payloads may be shared with other callers (see
+    ``fetch_forecast_table``) and must be treated as read-only.
+    """
+
+    def __init__(self, config, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 transport: Optional[Transport] = None):
         self.config = config
         self.api_key = api_key or config.api_key
         self.base_url = base_url or config.base_url
-        self.session = requests.Session()
-        self.min_request_interval = 1.0
-        self.last_request = 0
+        # Every HTTP call goes through this; pass a ReplayTransport to run offline
+        self.session = transport or get_shared_transport(config)
+        self.rate_limiter: Optional[TokenBucket] = TokenBucket(
+            getattr(config, "requests_per_second", 1.0), getattr(config, "rate_limit_burst", 5)
+        )
         self.failed_cities = {}
-        self.logger = config.logger or logging.getLogger(__name__)
-        
-        # Validate API key on initialization
-        self._validate_api_key()
-        
+        self._failures_lock = threading.Lock()
+        self.geocode_cache = GeocodeCache()
+        self.alert_monitor = AlertMonitor(self, refresh_interval=getattr(config, "alert_refresh_minutes", 10) * 60)
+        self.forecast_cache = ForecastCache(ttl=getattr(config, "forecast_ttl_minutes", 10) * 60)
+        cache_dir = getattr(config, "http_cache_dir", "")
+        self.http_cache = HTTPResponseCache(cache_dir, getattr(config, "http_cache_ttl", 240)) if cache_dir else None
+        self.circuit_breaker = CircuitBreaker()
+        self.max_inline_retry_wait = 5.0
+        self.api_key_status = APIKeyStatus(
+            self.api_key,
+            path=getattr(config, "api_key_status_path", ""),
+            max_age=getattr(config, "api_key_recheck_hours", 24) * 3600
+        )
+
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
+        # The key is validated lazily: the first real request reports 200/401
+        # back to api_key_status, so startup never waits on the network.
+        if not self.api_key:
+            self.logger.error("❌ No API key provided. Check your .env file.")
+        elif self.api_key_status.valid is False:
+            self.logger.error("❌ API key was rejected on the last check. Please check your OpenWeatherMap API key.")
+
+    @property
+    def api_key_valid(self) -> Optional[bool]:
+        """Last known API key status, or None if it hasn't been checked recently"""
+        return self.api_key_status.valid
+
     def _validate_api_key(self):
-        """Validate API key with a simple API call"""
+        """Validate API key with a simple API call, reusing a recent cached result"""
         if not self.api_key:
             self.logger.error("❌ No API key provided. Check your .env file.")
             return False
-            
+        if self.api_key_status.valid is not None:
+            return self.api_key_status.valid
+
+
         # Test API key with a simple call
         test_url = f"{self.base_url}/weather"
         test_params = {
@@ -40,10 +175,12 @@ class WeatherDataFetcher:
         try:
             response = self.session.get(test_url, params=test_params, timeout=10)
             if response.status_code == 401:
+                self.api_key_status.record(False)
                 self.logger.error("❌ Invalid API key. Please check your OpenWeatherMap API key.")
                 self.logger.error("💡 Make sure your API key is activated (can take up to 2 hours)")
                 return False
             elif response.status_code == 200:
+                self.api_key_status.record(True)
                 self.logger.info("✅ API key validated successfully")
                 return True
             else:
@@ -53,8 +190,18 @@ class WeatherDataFetcher:
             self.logger.error(f"❌ Failed to validate API key: {e}")
             return False
 
+    @property
+    def min_request_interval(self) -> float:
+        return 1.0 / self.rate_limiter.rate if self.rate_limiter else 0.0
+
+    @min_request_interval.setter
+    def min_request_interval(self, seconds: float) -> None:
+        """Pace requests at most one per ``seconds``; 0 disables pacing"""
+        self.rate_limiter = TokenBucket(1.0 / seconds, 1) if seconds > 0 else None
+
     def register_failure(self, city: str):
-        self.failed_cities[city] = self.failed_cities.get(city, 0) + 1
+        with self._failures_lock:
+            self.failed_cities[city] = self.failed_cities.get(city, 0) + 1
 
     def is_fake_or_unresolvable(self, city: str, threshold: int = 3) -> bool:
         city = city.lower()
@@ -62,28 +209,55 @@ class WeatherDataFetcher:
             return True
         return self.failed_cities.get(city.title(), 0) >= threshold
 
-    def _delay_between_request(self):     
-        elapsed_time = time.time() - self.last_request
-        if elapsed_time < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed_time)
-        self.last_request = time.time()
+    def _delay_between_request(self):
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
+    def _api_request(self, endpoint: str, params: Dict, base_url: Optional[str] = None,
+                     keyed: bool = True) -> Optional[Dict]:
+        """GET an endpoint through the HTTP cache, circuit breaker and rate limiter, with retries.
+
+        ``keyed=False`` is for third-party APIs: the OpenWeatherMap key is
+        neither sent nor judged by their responses.
+        """
+        url = f"{base_url or self.base_url}/{endpoint}"
+        params = dict(params, appid=self.api_key) if keyed else dict(params)
+        record_key = self.api_key_status.record if keyed else (lambda valid: None)
+
+        # Serve fresh cached responses without touching the network or the rate limit
+        cached = self.http_cache.lookup(url, params) if self.http_cache else None
+        if self.http_cache and self.http_cache.is_fresh(cached):
+            return cached["data"]
+        headers = HTTPResponseCache.conditional_headers(cached)
+
+        host = urlparse(url).netloc
+        if not self.circuit_breaker.allow(host):
+            self.logger.warning(f"🔌 {host} is cooling down for {self.circuit_breaker.retry_in(host):.0f}s — skipping request")
+            return None
 
-    def _api_request(self, endpoint: str, params: Dict, base_url: Optional[str] = None) -> Optional[Dict]:
         self._delay_between_request() 
 
-        url = f"{base_url or self.base_url}/{endpoint}"         
-        params['appid'] = self.api_key              
-
-        max_retries = 3                             
-        retry_delays = [1, 2, 4]                
+        max_retries = getattr(self.config, "retry_limit", 3) or 3
 
         for attempt in range(max_retries):
+            delay = None
             try:
-                response = self.session.get(url, params=params, timeout=10)
+                response = self.session.get(url, params=params, headers=headers, timeout=10)
 
                 if response.status_code == 200:
-                    return response.json()   
+                    self.circuit_breaker.record_success(host)
+                    record_key(True)
+                    data = decode_response(response)
+                    if self.http_cache:
+                        self.http_cache.store(url, params, response.headers, data)
+                    return data
+                elif response.status_code == 304 and cached:
+                    self.circuit_breaker.record_success(host)
+                    record_key(True)
+                    self.http_cache.revalidated(url, params, cached, response.headers)
+                    return cached["data"]
                 elif response.status_code == 401:
+                    record_key(False)
                     self.logger.error("❌ Invalid API key. Please check your OpenWeatherMap API key.")
                     self.logger.error("💡 Tips:")
                     self.logger.error("   - Verify API key in your .env file")
@@ -91,80 +265,62 @@ class WeatherDataFetcher:
                     self.logger.error("   - Make sure you're using the correct subscription plan")
                     return None
                 elif response.status_code == 429:
-                    self.logger.warning("⏳ Rate limited! Waiting 60 seconds...")
-                    time.sleep(60)
+                    delay = parse_retry_after(response.headers.get("Retry-After"))
+                    if delay is None:
+                        delay = backoff_delay(attempt, base=2.0, cap=60.0)
+                    self.circuit_breaker.hold(host, delay)
+                    self.logger.warning(f"⏳ Rate limited! {host} paused for {delay:.0f} seconds")
                 elif response.status_code == 404:
+                    self.circuit_breaker.record_success(host)
                     self.logger.warning(f"🌍 City not found: {params.get('q', 'Unknown location')}")
                     if "q" in params:
                         city = params.get("q", "Unknown").split(",")[0].title()
                         self.register_failure(city)
                     return None
                 else:
+                    self.circuit_breaker.record_failure(host)
                     self.logger.warning(f"⚠️ Unexpected status code: {response.status_code}")
                     if "q" in params:
                         city = params.get("q", "Unknown").split(",")[0].title()
                         self.register_failure(city)
-            except requests.RequestException as e:
+            except (requests.RequestException, ValueError) as e:  # ValueError: undecodable body
+                self.circuit_breaker.record_failure(host)
                 self.logger.warning(f"📡 Request error on attempt {attempt + 1}: {e}")
 
             if attempt < max_retries - 1:
-                time.sleep(retry_delays[attempt])  
+                # Only short waits happen inline; anything longer is left to the
+                # caller's retry queue so one slow city doesn't stall the others.
+                delay = delay if delay is not None else backoff_delay(attempt)
+                if delay > self.max_inline_retry_wait or not self.circuit_breaker.allow(host):
+                    self.logger.warning(f"🅿️ Parking request to {endpoint}; retry in {delay:.0f}s")
+                    return None
+                time.sleep(delay)
 
         self.logger.error("🚫 Failed to get a valid response after retries")
         return None
 
     def get_coordinates(self, city: str, country: str) -> Optional[tuple]:
-        """Get latitude and longitude for a city using geocoding API"""
-        geocoding_url = "http://api.openweathermap.org/geo/1.0/direct"
-        params = {
-            "q": f"{city},{country}",
-            "limit": 1,
-            "appid": self.api_key
-        }
-        
-        try:
-            response = self.session.get(geocoding_url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data:
-                    return data[0]['lat'], data[0]['lon']
-            elif response.status_code == 401:
-                self.logger.error("❌ Invalid API key for geocoding")
-                return None
-        except Exception as e:
-            self.logger.error(f"Error getting coordinates: {e}")
+        """Get latitude and longitude for a city, geocoding only on a cache miss"""
+        cached = self.geocode_cache.get(city, country)
+        if cached:
+            return cached
+
+        data = self._api_request("direct", {"q": f"{city},{country}", "limit": 1}, base_url=GEOCODING_BASE_URL)
+        if data:
+            lat, lon = data[0]['lat'], data[0]['lon']
+            self.geocode_cache.put(city, country, lat, lon)
+            return lat, lon
         return None
 
     def fetch_weather_alerts(self, city: str, country: Optional[str] = None) -> List[Dict]:
         """Fetch weather alerts for a location"""
-        try:
-            # Get coordinates first
-            coords = self.get_coordinates(city, country or "")
-            if not coords:
-                return []
-            
-            lat, lon = coords
-            
-            # Use One Call API for alerts (requires coordinates)
-            alerts_url = f"{self.base_url}/onecall"
-            params = {
-                "lat": lat,
-                "lon": lon,
-                "exclude": "minutely,daily",  # We only want alerts
-                "appid": self.api_key
-            }
-            
-            response = self.session.get(alerts_url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('alerts', [])
-            else:
-                self.logger.warning(f"Could not fetch alerts: {response.status_code}")
-                return []
-                
-        except Exception as e:
-            self.logger.error(f"Error fetching weather alerts: {e}")
+        coords = self.get_coordinates(city, country or "")
+        if not coords:
             return []
+        lat, lon = coords
+        # One Call API for alerts (requires coordinates)
+        data = self._api_request("onecall", {"lat": lat, "lon": lon, "exclude": "minutely,daily"})
+        return data.get('alerts', []) if data else []
 
     def fetch_current_weather(self, city: str, country: Optional[str] = None, units: str = 'metric') -> Optional[Dict]:
         """Fetch current weather with enhanced error handling and additional data"""
@@ -175,10 +331,7 @@ class WeatherDataFetcher:
             self.logger.warning(f"⛔️ Skipping persistently failing city: {city}")
             return None
 
-        if country == "US":
-            units = "imperial"
-        else:
-            units = "metric"
+        units = units_for_country(country)
 
         location = f"{city},{country}" if country else city
         params = {"q": location, "units": units}
@@ -187,306 +340,105 @@ class WeatherDataFetcher:
         if not raw_data:
             return None
 
-        try:
-            country_code = raw_data["sys"]["country"]
-            temp = raw_data["main"]["temp"]
-            feels_like = raw_data["main"]["feels_like"]
-            temp_min = raw_data["main"].get("temp_min", temp)
-            temp_max = raw_data["main"].get("temp_max", temp)
+        # Alerts come from the independently refreshed cache, never an extra request here
+        self.alert_monitor.watch(city, country)
+        alerts = self.alert_monitor.peek(city, country)
 
-            temp_unit = "°F" if units == "imperial" else "°C"
-            
-            temp_display = round(temp, 1)
-            feels_display = round(feels_like, 1)
-            temp_min_display = round(temp_min, 1)
-            temp_max_display = round(temp_max, 1)
-
-            # Format sunrise and sunset times
-            sunrise_timestamp = raw_data["sys"].get("sunrise")
-            sunset_timestamp = raw_data["sys"].get("sunset")
-            
-            sunrise_time = ""
-            sunset_time = ""
-            if sunrise_timestamp:
-                sunrise_dt = datetime.fromtimestamp(sunrise_timestamp)
-                sunrise_time = sunrise_dt.strftime("%I:%M %p")
-            if sunset_timestamp:
-                sunset_dt = datetime.fromtimestamp(sunset_timestamp)
-                sunset_time = sunset_dt.strftime("%I:%M %p")
-
-            # Fetch weather alerts
-            alerts = self.fetch_weather_alerts(city, country)
-
-            return {
-                "timestamp": datetime.utcfromtimestamp(raw_data["dt"]).isoformat(),
-                "api_timestamp": datetime.utcnow().isoformat(),
-                "city": raw_data.get("name", city),
-                "country": country_code,
-                "state": "",
-                "temperature": temp_display,
-                "condition": raw_data["weather"][0].get("description", "Unknown"),
-                "temp": temp_display,
-                "temp_min": temp_min_display,
-                "temp_max": temp_max_display,
-                "feels_like": feels_display,
-                "temp_unit": temp_unit, 
-                "humidity": raw_data["main"]["humidity"],
-                "pressure": raw_data["main"]["pressure"],
-                "weather_summary": raw_data["weather"][0]["main"],
-                "weather_detail": raw_data["weather"][0].get("description", "Unknown"),
-                "wind_speed": raw_data["wind"].get("speed", 0),
-                "wind_direction": raw_data["wind"].get("deg", 0),
-                "cloudiness": raw_data["clouds"].get("all", 0),
-                "visibility": raw_data.get("visibility", 10000),
-                "precipitation": 0,  # Basic API doesn't provide precipitation
-                "sunrise": sunrise_time,
-                "sunset": sunset_time,
-                "alerts": alerts,  # Weather alerts
-                "units": units 
-            }
+        try:
+            return build_weather_reading(raw_data, city, units, alerts)
         except (KeyError, IndexError, TypeError) as err:
             self.logger.error(f"🧨 Data parsing error for {location}: {err}")
             return None
 
+    def fetch_forecast_table(self, city: str, country: Optional[str] = None, units: str = "metric") -> Optional[ForecastTable]:
+        """5-day/3-hour forecast parsed once into columns, downloaded once per city within the cache TTL.
+
+        Concurrent callers for the same location share one in-flight request and
+        the resulting table; all forecast views are derived from it. The
+        download is always metric and converted to ``units`` on the way out,
+        so metric and imperial views of one city share it too.
+        """
+        location = f"{city},{country}" if country else city
+        table = self.forecast_cache.get_or_fetch(
+            self._forecast_key(city, country),
+            lambda: ForecastTable.from_payload(self._api_request("forecast", {"q": location, "units": "metric"}))
+        )
+        return table.in_units(units) if table else None
+
+    def peek_forecast_table(self, city: str, country: Optional[str] = None, units: str = "metric") -> Optional[ForecastTable]:
+        """Last downloaded forecast for a location, even if expired, without touching the network"""
+        table = self.forecast_cache.get(self._forecast_key(city, country), allow_stale=True)
+        return table.in_units(units) if table else None
+
+    @staticmethod
+    def _forecast_key(city: str, country: Optional[str]) -> tuple:
+        return city.strip().lower(), (country or "").strip().upper()
+
+    def fetch_current_weather_group(self, city_ids: List[int], units: str = "metric") -> Dict[int, Dict]:
+        """Fetch current weather for up to GROUP_BATCH_SIZE provider city IDs in one request"""
+        if not city_ids:
+            return {}
+        params = {"id": ",".join(str(city_id) for city_id in city_ids[:GROUP_BATCH_SIZE]), "units": units}
+        return parse_group_response(self._api_request("group", params), units)
+
     def fetch_five_day_forecast(self, city: str, country: Optional[str] = None, units: str = "metric") -> Optional[Dict]:
         """Fetch 5-day forecast with enhanced error handling"""
         location = f"{city},{country}" if country else city
-        params = {"q": location, "units": units}
 
-        forecast = self._api_request("forecast", params)
-        if forecast:
-            self.logger.info(f"✅ Forecast list length: {len(forecast.get('list', []))}")
-            
-            # Enhance forecast data with daily highs and lows
-            enhanced_forecast = self._enhance_forecast_data(forecast)
-            return enhanced_forecast
-        else:
-            self.logger.warning(f"❌ No forecast returned for: {location}")
-        return forecast
+        table = self.fetch_forecast_table(city, country, units)
+        if table:
+            self.logger.info(f"✅ Forecast list length: {len(table)}")
 
-    def _enhance_forecast_data(self, forecast_data: Dict) -> Dict:
-        """Enhance forecast data with better daily aggregation"""
-        if not forecast_data or 'list' not in forecast_data:
-            return forecast_data
-        
-        forecast_list = forecast_data.get("list", [])
-        daily_data = defaultdict(list)
-
-        # Organize forecast data by date
-        for entry in forecast_list:
-            dt_txt = entry.get("dt_txt")
-            if dt_txt:
-                date = dt_txt.split(" ")[0]
-                daily_data[date].append(entry)
-
-        # Calculate actual daily highs and lows
-        enhanced_list = []
-        for date in sorted(daily_data.keys())[:5]:
-            entries = daily_data[date]
-            
-            # Calculate daily statistics
-            temps = [entry["main"]["temp"] for entry in entries]
-            feels_like_temps = [entry["main"]["feels_like"] for entry in entries]
-            humidity_vals = [entry["main"]["humidity"] for entry in entries]
-            
-            daily_high = max(temps)
-            daily_low = min(temps)
-            avg_feels_like = sum(feels_like_temps) / len(feels_like_temps)
-            avg_humidity = sum(humidity_vals) / len(humidity_vals)
-            
-            # Get representative weather condition (preferably midday)
-            preferred_entry = next(
-                (e for e in entries if "12:00:00" in e["dt_txt"]),
-                entries[len(entries)//2]
-            )
-            
-            # Create enhanced entry
-            enhanced_entry = preferred_entry.copy()
-            enhanced_entry["main"]["temp_max"] = daily_high
-            enhanced_entry["main"]["temp_min"] = daily_low
-            enhanced_entry["main"]["feels_like"] = avg_feels_like
-            enhanced_entry["main"]["humidity"] = avg_humidity
-            enhanced_entry["daily_stats"] = {
-                "temp_max": daily_high,
-                "temp_min": daily_low,
-                "temp_range": daily_high - daily_low,
-                "entries_count": len(entries)
-            }
-            
-            enhanced_list.append(enhanced_entry)
-        
-        # Update the forecast data
-        enhanced_forecast = forecast_data.copy()
-        enhanced_forecast["list"] = enhanced_list
-        enhanced_forecast["enhanced"] = True
-        
-        return enhanced_forecast
+            # One entry per day with daily highs and lows
+            return table.enhanced_payload()
+
+        self.logger.warning(f"❌ No forecast returned for: {location}")
+        return None
 
     def fetch_recent(self, city, country, hours=3):
-        forecast = self.fetch_five_day_forecast(city, country)
-        if not forecast:
+        table = self.fetch_forecast_table(city, country, units_for_country(country))
+        if not table:
             return None
 
-        now = datetime.utcnow()
-        window = timedelta(hours=hours)
-
-        recent_entries = [
-            entry for entry in forecast["list"]
-            if abs(datetime.strptime(entry["dt_txt"], "%Y-%m-%d %H:%M:%S") - now) <= window
-        ]
-
+        recent_entries = [table.entry(i) for i in table.window(time.time(), hours * 3600)]
         return recent_entries if recent_entries else None
 
     def fetch_hourly_forecast(self, city: str, country: Optional[str] = None, units: str = 'metric') -> List[Dict]:
         """Fetch hourly forecast using basic 5-day forecast API"""
-        location = f"{city},{country}" if country else city
-        params = {"q": location, "units": units}
-        
-        forecast = self._api_request("forecast", params)
-        if not forecast:
+        table = self.fetch_forecast_table(city, country, units)
+        if not table:
             return []
-        
-        try:
-            hourly_data = []
-            forecast_list = forecast.get("list", [])
-            
-            # Get next 8 entries (24 hours worth of 3-hour intervals)
-            for entry in forecast_list[:8]:
-                dt_timestamp = entry.get("dt")
-                if dt_timestamp:
-                    dt = datetime.utcfromtimestamp(dt_timestamp)
-                    
-                    hourly_entry = {
-                        "datetime": dt,
-                        "time": dt.strftime("%H:%M"),
-                        "date": dt.strftime("%m/%d"),
-                        "temp": entry["main"]["temp"],
-                        "feels_like": entry["main"]["feels_like"],
-                        "temp_min": entry["main"].get("temp_min", entry["main"]["temp"]),
-                        "temp_max": entry["main"].get("temp_max", entry["main"]["temp"]),
-                        "humidity": entry["main"]["humidity"],
-                        "pressure": entry["main"]["pressure"],
-                        "weather_main": entry["weather"][0]["main"],
-                        "weather_desc": entry["weather"][0]["description"],
-                        "wind_speed": entry["wind"].get("speed", 0),
-                        "wind_deg": entry["wind"].get("deg", 0),
-                        "clouds": entry["clouds"].get("all", 0),
-                        "visibility": entry.get("visibility", 10000),
-                        "pop": entry.get("pop", 0) * 100  # Probability of precipitation
-                    }
-                    hourly_data.append(hourly_entry)
-            
-            return hourly_data
-            
-        except Exception as e:
-            self.logger.error(f"Error parsing hourly forecast: {e}")
-            return []
-
-    def extract_five_day_summary(self, forecast: Dict) -> List[Dict]:      
-        """Extract 5-day summary with proper daily highs and lows"""
-        if not forecast or 'list' not in forecast:
-            return []
-            
-        forecast_list = forecast.get("list", [])
-        daily_data = defaultdict(list)
-
-        # Organize forecast data by date
-        for entry in forecast_list:
-            dt_txt = entry.get("dt_txt")
-            if dt_txt:
-                date = dt_txt.split(" ")[0]
-                daily_data[date].append(entry)
 
-        five_day_forecasts = []
+        # Next 8 entries (24 hours worth of 3-hour intervals)
+        return table.hourly(8)
 
-        # Get forecasts for the next 5 days
-        for date in sorted(daily_data.keys())[:5]:
-            entries = daily_data[date]
-            
-            # Calculate actual daily high and low temperatures
-            temps = [entry["main"]["temp"] for entry in entries]
-            temp_max = max(temps) if temps else 0
-            temp_min = min(temps) if temps else 0
-            
-            # Get representative weather conditions (prefer midday)
-            preferred_entry = next(
-                (e for e in entries if "12:00:00" in e["dt_txt"]),
-                entries[len(entries)//2] if entries else None
-            )
-            
-            if preferred_entry:
-                # Create enhanced daily summary
-                daily_summary = {
-                    "date": date,
-                    "dt_txt": preferred_entry["dt_txt"],
-                    "dt": preferred_entry["dt"],
-                    "main": {
-                        "temp": preferred_entry["main"]["temp"],
-                        "temp_min": temp_min,
-                        "temp_max": temp_max,
-                        "feels_like": preferred_entry["main"]["feels_like"],
-                        "pressure": preferred_entry["main"]["pressure"],
-                        "humidity": preferred_entry["main"]["humidity"]
-                    },
-                    "weather": preferred_entry["weather"],
-                    "clouds": preferred_entry["clouds"],
-                    "wind": preferred_entry["wind"],
-                    "visibility": preferred_entry.get("visibility", 10000),
-                    "pop": preferred_entry.get("pop", 0),
-                    "daily_range": temp_max - temp_min,
-                    "entries_count": len(entries)
-                }
-                five_day_forecasts.append(daily_summary)
-
-        return five_day_forecasts
+    def extract_five_day_summary(self, forecast) -> List[Dict]:
+        """Extract 5-day summary with proper daily highs and lows from a ForecastTable or raw payload"""
+        table = forecast if isinstance(forecast, ForecastTable) else ForecastTable.from_payload(forecast)
+        return table.daily_summary(5) if table else []
 
     def fetch_extended_forecast(self, city: str, country: Optional[str] = None, units: str = 'metric') -> Optional[Dict]:
         """Fetch extended forecast with better daily aggregation"""
-        try:
-            # Get coordinates for One Call API (if available)
-            coords = self.get_coordinates(city, country or "")
-            if coords:
-                lat, lon = coords
-                
-                # Try One Call API for better daily forecasts
-                onecall_url = f"{self.base_url}/onecall"
-                params = {
-                    "lat": lat,
-                    "lon": lon,
-                    "exclude": "minutely,alerts",
-                    "units": units,
-                    "appid": self.api_key
-                }
-                
-                response = self.session.get(onecall_url, params=params, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    return data
-                else:
-                    self.logger.warning(f"One Call API failed: {response.status_code}")
-            
-            # Fallback to regular 5-day forecast
-            return self.fetch_five_day_forecast(city, country, units)
-            
-        except Exception as e:
-            self.logger.error(f"Error fetching extended forecast: {e}")
-            return self.fetch_five_day_forecast(city, country, units)
+        # Try One Call API for better daily forecasts (requires coordinates)
+        coords = self.get_coordinates(city, country or "")
+        if coords:
+            lat, lon = coords
+            data = self._api_request("onecall", {"lat": lat, "lon": lon, "exclude": "minutely,alerts", "units": units})
+            if data:
+                return data
+            self.logger.warning("One Call API failed, falling back to the 5-day forecast")
+
+        return self.fetch_five_day_forecast(city, country, units)
 
     def fetch_weather_with_alerts(self, city: str, country: Optional[str] = None, units: str = 'metric') -> Optional[Dict]:
-        """Fetch current weather with integrated alerts"""
+        """Fetch current weather with alerts from the TTL-cached alert pipeline"""
         # Get basic weather data
         weather_data = self.fetch_current_weather(city, country, units)
         if not weather_data:
             return None
         
-        # Try to get additional alerts if not already included
         if not weather_data.get('alerts'):
-            try:
-                alerts = self.fetch_weather_alerts(city, country)
-                weather_data['alerts'] = alerts
-            except Exception as e:
-                self.logger.error(f"Error fetching alerts: {e}")
-                weather_data['alerts'] = []
+            weather_data['alerts'] = self.alert_monitor.get_alerts(city, country)
         
         return weather_data
 
@@ -501,16 +453,14 @@ class WeatherDataFetcher:
             
             # Use a sunrise-sunset API for more detailed information
             # This is a backup method if you want more detailed sun information
-            sunrise_api_url = f"https://api.sunrise-sunset.org/json"
             params = {
                 "lat": lat,
                 "lng": lon,
                 "formatted": 0
             }
             
-            response = self.session.get(sunrise_api_url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
+            data = self._api_request("json", params, base_url=SUNRISE_SUNSET_BASE_URL, keyed=False)
+            if data:
                 if data.get("status") == "OK":
                     results = data.get("results", {})
                     
@@ -1,15 +1,112 @@
 import sqlite3
+import time
+import unicodedata
 from pathlib import Path
-from datetime import datetime, timezone
-from typing import List, Dict, Optional, Generator
-from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import ContextManager, Iterator, List, Dict, Optional, Sequence, Tuple
 import csv
 import os
 import logging
+import numpy as np
 from dotenv import load_dotenv
-from weather_data_fetcher import WeatherDataFetcher
+from weather_data_fetcher import WeatherDataFetcher, units_for_country
+from services.rollups import GRAINS, ROLLUP_METRICS, apply_rollups, ensure_rollups, metric_summary
+from services.write_pipeline import WritePipeline
+from utils.sqlite_connections import SQLiteConnectionManager
 load_dotenv()
 
+
+# Text columns read_columns() returns as integer codes into a ``<name>_labels`` array
+CATEGORICAL_COLUMNS = ("city", "country", "state", "weather_summary", "weather_detail")
+
+
+# Physical readings columns after location_id; city/country/state live on locations
+READING_COLUMNS = (
+    "timestamp", "temp", "temp_min", "temp_max", "feels_like", "humidity", "pressure",
+    "weather_summary", "weather_detail", "wind_speed", "wind_deg", "clouds", "visibility",
+    "precipitation", "sunrise", "sunset", "fetched_at", "ts", "created_at"
+)
+
+READINGS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS {name} (
+    id INTEGER PRIMARY KEY,
+    location_id INTEGER NOT NULL REFERENCES locations(id),
+    timestamp TEXT NOT NULL,
+    temp REAL NOT NULL,
+    temp_min REAL,
+    temp_max REAL,
+    feels_like REAL,
+    humidity INTEGER,
+    pressure REAL,
+    weather_summary TEXT,
+    weather_detail TEXT,
+    wind_speed REAL,
+    wind_deg INTEGER,
+    clouds INTEGER,
+    visibility INTEGER,
+    precipitation REAL DEFAULT 0,
+    sunrise TEXT,
+    sunset TEXT,
+    fetched_at TEXT,
+    ts INTEGER,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+)"""
+
+
+def location_key(city: Optional[str], country: Optional[str]) -> str:
+    """Canonical natural key for a location: accents stripped, whitespace collapsed, case-folded"""
+    def fold(text: Optional[str]) -> str:
+        text = unicodedata.normalize("NFKD", text or "")
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+        return " ".join(text.split()).casefold()
+    return f"{fold(city)}|{fold(country)}"
+
+
+def to_epoch(value: Optional[str]) -> Optional[int]:
+    """Epoch seconds for a stored ISO timestamp; naive values are UTC, as the fetcher writes them"""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def reading_from_row(row: sqlite3.Row) -> Dict:
+    """Turn a readings row back into the reading dict produced by the fetcher"""
+    units = units_for_country(row["country"])
+    return {
+        "timestamp": row["timestamp"],
+        "api_timestamp": row["fetched_at"],
+        "city": row["city"],
+        "country": row["country"],
+        "state": row["state"] or "",
+        "temperature": row["temp"],
+        "condition": row["weather_detail"],
+        "temp": row["temp"],
+        "temp_min": row["temp_min"],
+        "temp_max": row["temp_max"],
+        "feels_like": row["feels_like"],
+        "temp_unit": "°F" if units == "imperial" else "°C",
+        "humidity": row["humidity"],
+        "pressure": row["pressure"],
+        "weather_summary": row["weather_summary"],
+        "weather_detail": row["weather_detail"],
+        "wind_speed": row["wind_speed"],
+        "wind_direction": row["wind_deg"],
+        "cloudiness": row["clouds"],
+        "visibility": row["visibility"],
+        "precipitation": row["precipitation"],
+        "sunrise": row["sunrise"],
+        "sunset": row["sunset"],
+        "alerts": [],
+        "units": units
+    }
+
+
 class WeatherDB:
     def __init__(self, fetcher: Optional['WeatherDataFetcher'] = None):
         db_path = os.getenv("DB_PATH")
@@ -20,38 +117,32 @@ class WeatherDB:
         
         # Initialize logger
         self.logger = logging.getLogger(__name__)
-        
+
+        # Persistent per-thread connections in WAL mode, so GUI reads don't wait on tracker writes
+        self.connections = SQLiteConnectionManager(self.db_file)
+        self._reading_column_names: Optional[List[str]] = None
+        # location_key -> locations.id; ids never change once assigned
+        self._location_ids: Dict[str, int] = {}
+
         # Initialize database schema
         self._initialize_schema()
         self.fetcher = fetcher
-    def _conn(self):
-      return sqlite3.connect(str(self.db_file))
+        # Set by start_write_pipeline(); while active, writes are queued and batched
+        self.write_pipeline: Optional[WritePipeline] = None
+
+        # Let the fetcher's geocode cache read and persist coordinates here
+        if fetcher is not None and getattr(fetcher, "geocode_cache", None) is not None:
+            fetcher.geocode_cache.db = self
+    def _conn(self) -> sqlite3.Connection:
+        return self.connections.connection()
+
+    def close(self) -> None:
+        """Stop the write pipeline and close every thread's connection"""
+        self.stop_write_pipeline()
+        self.connections.close_all()
 
     def _initialize_schema(self) -> None:
         schema = """
-        CREATE TABLE IF NOT EXISTS readings (
-            id INTEGER PRIMARY KEY,
-            timestamp TEXT NOT NULL,
-            city TEXT NOT NULL,
-            country TEXT NOT NULL,
-            state TEXT,
-            temp REAL NOT NULL,
-            feels_like REAL,
-            humidity INTEGER,
-            pressure REAL,
-            weather_summary TEXT,
-            weather_detail TEXT,
-            wind_speed REAL,
-            wind_deg INTEGER,
-            clouds INTEGER,
-            visibility INTEGER,
-            precipitation REAL DEFAULT 0,
-            sunrise TEXT,
-            sunset TEXT,
-            fetched_at TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        );
-
         CREATE TABLE IF NOT EXISTS locations (
             id INTEGER PRIMARY KEY,
             city TEXT NOT NULL,
@@ -65,6 +156,12 @@ class WeatherDB:
             UNIQUE(city, country)
         );
 
+        -- Extra spellings (e.g. "NYC") that resolve to an existing location
+        CREATE TABLE IF NOT EXISTS location_aliases (
+            alias_key TEXT PRIMARY KEY,
+            location_id INTEGER NOT NULL REFERENCES locations(id)
+        ) WITHOUT ROWID;
+
         CREATE TABLE IF NOT EXISTS request_log (
             id INTEGER PRIMARY KEY,
             timestamp TEXT NOT NULL,
@@ -77,105 +174,337 @@ class WeatherDB:
             FOREIGN KEY (location_id) REFERENCES locations(id)
         );
 
-        CREATE INDEX IF NOT EXISTS idx_readings_time ON readings(timestamp);
-        CREATE INDEX IF NOT EXISTS idx_readings_location ON readings(city, country);
         CREATE INDEX IF NOT EXISTS idx_log_time ON request_log(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_log_location_time ON request_log(location_id, timestamp);
         """
         with self._conn() as conn:
-            conn.executescript(schema)
-
-            # Check and add missing columns if necessary
-            required_columns = [
-                ('state', 'TEXT DEFAULT ""'),
-                ('temp_min', 'REAL'),
-                ('temp_max', 'REAL'),
-                ('precipitation', 'REAL DEFAULT 0'),
-                ('sunrise', 'TEXT DEFAULT ""'),
-                ('sunset', 'TEXT DEFAULT ""')
-            ]
-
-            # Get existing columns in the readings table
+            conn.executescript(schema + READINGS_TABLE_SQL.format(name="readings") + ";")
+
+            # Provider city IDs let the tracker batch locations into /group requests
+            cursor = conn.execute("PRAGMA table_info(locations)")
+            location_columns = [row[1] for row in cursor.fetchall()]
+            if "owm_id" not in location_columns:
+                conn.execute("ALTER TABLE locations ADD COLUMN owm_id INTEGER")
+                self.logger.info("Added column 'owm_id' to locations table")
+
+            # Locations are matched on a case-folded natural key rather than the raw spelling
+            if "state" not in location_columns:
+                conn.execute("ALTER TABLE locations ADD COLUMN state TEXT")
+                self.logger.info("Added column 'state' to locations table")
+            if "location_key" not in location_columns:
+                conn.execute("ALTER TABLE locations ADD COLUMN location_key TEXT")
+                self.logger.info("Added column 'location_key' to locations table")
+            self._backfill_location_keys(conn)
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_locations_key ON locations(location_key)")
+
+            # Older databases store city/country/state text on every reading
             cursor = conn.execute("PRAGMA table_info(readings)")
-            existing_columns = [row[1] for row in cursor.fetchall()]
+            if "city" in [row[1] for row in cursor.fetchall()]:
+                self._migrate_readings_to_location_ids(conn)
 
-            for column_name, column_def in required_columns:
-                if column_name not in existing_columns:
-                    try:
-                        conn.execute(f"ALTER TABLE readings ADD COLUMN {column_name} {column_def}")
-                        self.logger.info(f"Added column '{column_name}' to readings table")
-                    except sqlite3.OperationalError as e:
-                        if "duplicate column name" not in str(e).lower():
-                            self.logger.error(f"Error adding column {column_name}: {e}")
+            # Range queries filter on a numeric epoch column so they can use index range scans
+            conn.executescript("""
+            DROP INDEX IF EXISTS idx_readings_time;
+            DROP INDEX IF EXISTS idx_readings_location;
+            DROP INDEX IF EXISTS idx_readings_city_ts;
+            CREATE INDEX IF NOT EXISTS idx_readings_ts ON readings(ts);
+            CREATE INDEX IF NOT EXISTS idx_readings_location_ts ON readings(location_id, ts);
+            CREATE VIEW IF NOT EXISTS reading_details AS
+                SELECT readings.*, locations.city, locations.country, locations.state
+                FROM readings JOIN locations ON locations.id = readings.location_id;
+            """)
 
+            # Hourly/daily aggregates, kept current by every insert; seeded from readings when first created
+            ensure_rollups(conn)
 
+    def _backfill_location_keys(self, conn: sqlite3.Connection) -> None:
+        """Fill location_key and fold locations whose spellings share a key into the oldest one"""
+        rows = conn.execute("SELECT id, city, country, location_key FROM locations ORDER BY id").fetchall()
+        if all(row["location_key"] for row in rows):
+            return
+        self._location_ids.clear()
+        canonical: Dict[str, int] = {row["location_key"]: row["id"] for row in rows if row["location_key"]}
+        for row in rows:
+            if row["location_key"]:
+                continue
+            key = location_key(row["city"], row["country"])
+            keep = canonical.setdefault(key, row["id"])
+            if keep == row["id"]:
+                conn.execute("UPDATE locations SET location_key = ? WHERE id = ?", (key, keep))
+                continue
+            conn.execute("""
+            UPDATE locations SET
+                is_active = max(coalesce(is_active, 0), (SELECT coalesce(is_active, 0) FROM locations WHERE id = ?)),
+                owm_id = coalesce(owm_id, (SELECT owm_id FROM locations WHERE id = ?)),
+                lat = coalesce(lat, (SELECT lat FROM locations WHERE id = ?)),
+                lon = coalesce(lon, (SELECT lon FROM locations WHERE id = ?))
+            WHERE id = ?
+            """, (row["id"], row["id"], row["id"], row["id"], keep))
+            conn.execute("UPDATE request_log SET location_id = ? WHERE location_id = ?", (keep, row["id"]))
+            conn.execute("DELETE FROM locations WHERE id = ?", (row["id"],))
+            self.logger.info(f"Merged location {row['id']} ({row['city']}, {row['country']}) into {keep}")
 
-    # def _conn(self):
-    #     return sqlite3.connect(str(self.db_file))
+    def _migrate_readings_to_location_ids(self, conn: sqlite3.Connection) -> None:
+        """Rebuild a legacy readings table around location_id, dropping its per-row city/country/state"""
+        table_info = conn.execute("PRAGMA table_info(readings)").fetchall()
+        existing_columns = [row[1] for row in table_info]
+        # Tables written by other tools may have a plain, non-unique id column; those rows get new ids
+        keep_ids = any(row[1] == "id" and row[5] for row in table_info)
 
-    @contextmanager
-    def get_connection(self) -> Generator[sqlite3.Connection, None, None]:
-        conn = sqlite3.connect(str(self.db_file))
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        # Every spelling seen in readings gets a location; new ones are stored inactive
+        conn.execute("CREATE TEMP TABLE location_map (city TEXT, country TEXT, location_id INTEGER)")
+        state = "MAX(state)" if "state" in existing_columns else "NULL"
+        spellings = conn.execute(f"SELECT city, country, {state} FROM readings GROUP BY city, country").fetchall()
+        mapped = [(city, country, self._location_id(conn, city, country, state, create=True), state)
+                  for city, country, state in spellings]
+        conn.executemany("INSERT INTO location_map VALUES (?, ?, ?)", [row[:3] for row in mapped])
+        conn.executemany("UPDATE locations SET state = ? WHERE id = ? AND coalesce(state, '') = ''",
+                         [(state, location_id) for _, _, location_id, state in mapped if state])
+
+        copied = [column for column in READING_COLUMNS if column in existing_columns]
+        if "ts" in existing_columns:
+            ts = "coalesce(r.ts, CAST(strftime('%s', r.timestamp) AS INTEGER))"
+        else:
+            ts = "CAST(strftime('%s', r.timestamp) AS INTEGER)"
+        sources = [ts if column == "ts" else f"r.{column}" for column in copied]
+        if "ts" not in copied:
+            copied.append("ts")
+            sources.append(ts)
+        if keep_ids:
+            copied.insert(0, "id")
+            sources.insert(0, "r.id")
+
+        # One transaction: the old table is only dropped once every row is copied
+        conn.executescript(f"""
+        BEGIN;
+        DROP VIEW IF EXISTS reading_details;
+        DROP TABLE IF EXISTS readings_hourly;
+        DROP TABLE IF EXISTS readings_daily;
+        DROP TABLE IF EXISTS conditions_hourly;
+        DROP TABLE IF EXISTS conditions_daily;
+        {READINGS_TABLE_SQL.format(name="readings_migrated")};
+        INSERT INTO readings_migrated (location_id, {', '.join(copied)})
+        SELECT m.location_id, {', '.join(sources)}
+        FROM readings r JOIN temp.location_map m ON m.city = r.city AND m.country = r.country
+        ORDER BY r.rowid;
+        DROP TABLE readings;
+        ALTER TABLE readings_migrated RENAME TO readings;
+        DROP TABLE temp.location_map;
+        COMMIT;
+        """)
+        migrated = conn.execute("SELECT COUNT(*) FROM readings").fetchone()[0]
+        self.logger.info(f"Migrated {migrated} readings to location_id")
+
+    def get_connection(self) -> ContextManager[sqlite3.Connection]:
+        """Transaction on the calling thread's persistent connection"""
+        return self.connections.transaction()
+
+    # A reading already stored for its location and observation time (``ts``, the last
+    # parameter) is skipped: the provider repeats ``dt`` until its next update
+    INSERT_READING_SQL = f"""
+        INSERT INTO readings (location_id, {', '.join(READING_COLUMNS[:-1])})
+        SELECT {', '.join(f'?{i}' for i in range(1, len(READING_COLUMNS) + 1))}
+        WHERE NOT EXISTS (SELECT 1 FROM readings WHERE location_id = ?1 AND ts = ?{len(READING_COLUMNS)})
+        """
+
+    INSERT_REQUEST_LOG_SQL = """
+        INSERT INTO request_log (
+            timestamp, url, location_id, status, error, latency_ms
+        ) VALUES (?, ?, ?, ?, ?, ?)
+        """
+
+    @staticmethod
+    def _reading_params(data: Dict) -> tuple:
+        """INSERT_READING_SQL parameters after location_id"""
+        return (
+            data['timestamp'],
+            data['temp'],
+            data.get('temp_min', data['temp']),  # Default to current temp if no min
+            data.get('temp_max', data['temp']),  # Default to current temp if no max
+            data['feels_like'],
+            data['humidity'],
+            data['pressure'],
+            data['weather_summary'],
+            data['weather_detail'],
+            data['wind_speed'],
+            data['wind_direction'],
+            data['cloudiness'],
+            data['visibility'],
+            data.get('precipitation', 0),
+            data.get('sunrise', ''),
+            data.get('sunset', ''),
+            data['api_timestamp'],
+            to_epoch(data['timestamp'])
+        )
+
+    def _location_id(self, conn: sqlite3.Connection, city: str, country: str,
+                     state: Optional[str] = None, create: bool = False) -> Optional[int]:
+        """locations.id for a spelling, via its canonical key or an alias.
+
+        With ``create`` an unknown location is added inactive (so the tracker
+        does not start polling it), the same way save_coordinates does.
+        """
+        key = location_key(city, country)
+        location_id = self._location_ids.get(key)
+        if location_id is not None:
+            return location_id
+        lookup = ("SELECT id FROM locations WHERE location_key = ? "
+                  "UNION ALL SELECT location_id FROM location_aliases WHERE alias_key = ? LIMIT 1")
+        row = conn.execute(lookup, (key, key)).fetchone()
+        if row is None and conn.execute("SELECT 1 FROM locations WHERE location_key IS NULL LIMIT 1").fetchone():
+            # Rows inserted without a key (older code, external tools) get one before giving up
+            self._backfill_location_keys(conn)
+            row = conn.execute(lookup, (key, key)).fetchone()
+        if row is not None:
+            location_id = row[0]
+        elif create:
+            location_id = conn.execute(
+                "INSERT INTO locations (city, country, state, location_key, is_active) VALUES (?, ?, ?, ?, 0)",
+                (city.strip(), country.strip(), state or None, key)
+            ).lastrowid
+        else:
+            return None
+        self._location_ids[key] = location_id
+        return location_id
+
+    def _reading_location_id(self, conn: sqlite3.Connection, data: Dict) -> int:
+        """The reading's ``location_id`` when the tracker supplied one, else resolved from its name.
+
+        Only ad-hoc searches go by name; the provider's spelling of a tracked
+        city can differ from the favorite's, which would add a second row.
+        """
+        if data.get('location_id') is not None:
+            return data['location_id']
+        return self._location_id(conn, data['city'], data['country'], data.get('state'), create=True)
+
+    def _partial_location_ids(self, conn: sqlite3.Connection, city: Optional[str],
+                              country: Optional[str]) -> List[int]:
+        """ids of every location whose canonical key or alias has this city part (or this country part)"""
+        if city is not None:
+            # Keys are "city|country": a prefix range on the key index
+            prefix = location_key(city, "")
+            match, match_params = "{column} >= ? AND {column} < ?", [prefix, prefix[:-1] + "}"]
+        else:
+            suffix = location_key("", country)
+            match, match_params = "substr({column}, -?) = ?", [len(suffix), suffix]
+        if conn.execute("SELECT 1 FROM locations WHERE location_key IS NULL LIMIT 1").fetchone():
+            self._backfill_location_keys(conn)
+        rows = conn.execute(
+            f"SELECT id FROM locations WHERE {match.format(column='location_key')} "
+            f"UNION SELECT location_id FROM location_aliases WHERE {match.format(column='alias_key')}",
+            match_params * 2
+        )
+        return [row[0] for row in rows]
+
+    def add_location_alias(self, alias_city: str, alias_country: str, city: str, country: str) -> bool:
+        """Make another spelling resolve to an existing location; False if that location is unknown"""
+        with self._conn() as conn:
+            location_id = self._location_id(conn, city, country)
+            if location_id is None:
+                return False
+            key = location_key(alias_city, alias_country)
+            conn.execute("INSERT OR REPLACE INTO location_aliases (alias_key, location_id) VALUES (?, ?)",
+                         (key, location_id))
+            self._location_ids[key] = location_id
+        return True
+
+    def start_write_pipeline(self, batch_size: int = 500, flush_interval: float = 1.0) -> WritePipeline:
+        """Route insert_reading, log_request and save_city_id through a batching writer thread"""
+        if self.write_pipeline is None:
+            self.write_pipeline = WritePipeline(self, batch_size, flush_interval)
+        return self.write_pipeline
+
+    def flush_writes(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued writes are committed (no-op without a pipeline).
+
+        False if ``timeout`` ran out or a queued row was not written since the last flush.
+        """
+        return self.write_pipeline.flush(timeout) if self.write_pipeline else True
+
+    def stop_write_pipeline(self) -> None:
+        if self.write_pipeline is not None:
+            self.write_pipeline.close()
+            self.write_pipeline = None
 
     def insert_reading(self, data: Dict) -> bool:
-        """Insert weather reading with all fields including highs/lows"""
-        query = """
-        INSERT INTO readings (
-            timestamp, city, country, state, temp, temp_min, temp_max, feels_like, humidity,
-            pressure, weather_summary, weather_detail, wind_speed,
-            wind_deg, clouds, visibility, precipitation, sunrise, sunset, fetched_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """Insert weather reading with all fields including highs/lows.
+
+        While the write pipeline is running this only queues the row and returns
+        True; ``flush_writes`` reports whether it was committed.
         """
+        if self.write_pipeline is not None:
+            self.write_pipeline.put_reading(data)
+            return True
         try:
+            params = self._reading_params(data)
             with self._conn() as conn:
-                conn.execute(query, (
-                    data['timestamp'],
-                    data['city'],
-                    data['country'],
-                    data.get('state', ''),
-                    data['temp'],
-                    data.get('temp_min', data['temp']),  # Default to current temp if no min
-                    data.get('temp_max', data['temp']),  # Default to current temp if no max
-                    data['feels_like'],
-                    data['humidity'],
-                    data['pressure'],
-                    data['weather_summary'],
-                    data['weather_detail'],
-                    data['wind_speed'],
-                    data['wind_direction'],
-                    data['cloudiness'],
-                    data['visibility'],
-                    data.get('precipitation', 0),
-                    data.get('sunrise', ''),
-                    data.get('sunset', ''),
-                    data['api_timestamp']
-                ))
+                cursor = conn.execute(self.INSERT_READING_SQL, (self._reading_location_id(conn, data), *params))
+                if cursor.rowcount:
+                    apply_rollups(conn, cursor.lastrowid)
             return True
+        except KeyError as err:
+            self.logger.error(f"[Insert Error] missing {err}\nData: {data}")
+            return False
         except sqlite3.Error as err:
+            self._location_ids.clear()  # ids created in the rolled-back transaction are gone
             self.logger.error(f"[Insert Error] {err}\nData: {data}")
             return False
-        
+
+    def write_batch(self, readings: List[Dict] = (), request_logs: List[tuple] = (),
+                    city_ids: List[tuple] = ()) -> int:
+        """Write many readings, request-log rows and (location_id, owm_id) pairs in one transaction.
+
+        ``request_logs`` rows use ``log_request``'s argument order. Malformed
+        readings are logged and skipped; returns the number of readings stored,
+        counting one already stored for its location and time (never written twice).
+        A database error rolls the whole batch back and is re-raised, so the
+        caller can retry the rows one at a time to isolate a bad one.
+        """
+        prepared = []
+        for data in readings:
+            try:
+                if data.get('location_id') is None:
+                    data['city'], data['country']  # ad-hoc readings are resolved by name
+                prepared.append((data, self._reading_params(data)))
+            except KeyError as err:
+                self.logger.error(f"[Insert Error] missing {err}\nData: {data}")
+        now = datetime.now(timezone.utc).isoformat()
+        log_rows = [(now, *row, *(None,) * (5 - len(row))) for row in request_logs]
+        try:
+            with self.get_connection() as conn:
+                if prepared:
+                    # Take the write lock first so the new rows are exactly the ids above the current max
+                    if not conn.in_transaction:
+                        conn.execute("BEGIN IMMEDIATE")
+                    first_id = (conn.execute("SELECT MAX(id) FROM readings").fetchone()[0] or 0) + 1
+                    conn.executemany(self.INSERT_READING_SQL, [
+                        (self._reading_location_id(conn, data), *params) for data, params in prepared
+                    ])
+                    apply_rollups(conn, first_id, first_id + len(prepared) - 1)
+                conn.executemany(self.INSERT_REQUEST_LOG_SQL, log_rows)
+                conn.executemany("UPDATE locations SET owm_id = ? WHERE id = ?",
+                                 [(owm_id, location_id) for location_id, owm_id in city_ids])
+            return len(prepared)
+        except sqlite3.Error as err:
+            self._location_ids.clear()  # ids created in the rolled-back transaction are gone
+            self.logger.error(f"[Batch Insert Error] {err}")
+            raise
+
     def fetch_recent(self, city: str, country: str, hours: int = 24) -> List[Dict]:
-       
+        """Readings for a city from the last ``hours`` hours, newest first"""
         query = """
         SELECT timestamp, temp, temp_min, temp_max, humidity, pressure, weather_summary, weather_detail
-        FROM readings 
-        WHERE city = ? AND country = ?
-        AND datetime(timestamp) >= datetime('now', '-{} hours')
-        ORDER BY timestamp DESC
-        """.format(hours)
+        FROM readings
+        WHERE location_id = ? AND ts >= ?
+        ORDER BY ts DESC
+        """
         
         try:
             with self._conn() as conn:
-                cursor = conn.execute(query, (city, country))
+                location_id = self._location_id(conn, city, country)
+                if location_id is None:
+                    return []
+                cursor = conn.execute(query, (location_id, int(time.time() - hours * 3600)))
                 results = cursor.fetchall()
                 
                 readings = []
@@ -196,6 +525,83 @@ class WeatherDB:
         except Exception as e:
             self.logger.error(f"Error fetching recent readings: {e}")
             return []
+
+    def fetch_range(self, start: float, end: float, city: Optional[str] = None,
+                    country: Optional[str] = None) -> List[tuple]:
+        """``(timestamp, temp, weather_summary, humidity, wind_speed)`` rows with ``start <= ts <= end``, oldest first.
+
+        ``start`` and ``end`` are epoch seconds. Without a city this scans
+        ``idx_readings_ts``; with one, ``idx_readings_location_ts``.
+        """
+        query = "SELECT timestamp, temp, weather_summary, humidity, wind_speed FROM readings WHERE "
+        params: list = []
+        with self.get_connection() as conn:
+            if city is not None:
+                location_id = self._location_id(conn, city, country)
+                if location_id is None:
+                    return []
+                query += "location_id = ? AND "
+                params.append(location_id)
+            query += "ts BETWEEN ? AND ? ORDER BY ts"
+            params += [int(start), int(end)]
+            return [tuple(row) for row in conn.execute(query, params)]
+
+    def get_rollups(self, grain: str, start: float, end: float, city: Optional[str] = None,
+                    country: Optional[str] = None) -> List[Dict]:
+        """Per-bucket aggregates between two epoch times, oldest first.
+
+        ``grain`` is ``"hourly"`` or ``"daily"``. Without a city the buckets are
+        combined across all locations. Each row has ``bucket`` (epoch start),
+        ``n``, ``<metric>_avg``/``_min``/``_max`` for every rolled-up metric and
+        the bucket's most frequent ``condition``.
+        """
+        if grain not in GRAINS:
+            raise ValueError(f"Unknown rollup grain: {grain}")
+        width = GRAINS[grain]
+        where = "bucket BETWEEN ? AND ?"
+        params: list = [int(start) // width * width, int(end)]
+        selects = ", ".join(
+            f"SUM({m}_sum) / NULLIF(SUM({m}_n), 0) AS {m}_avg, MIN({m}_min) AS {m}_min, MAX({m}_max) AS {m}_max"
+            for m in ROLLUP_METRICS
+        )
+        with self.get_connection() as conn:
+            if city is not None:
+                location_id = self._location_id(conn, city, country)
+                if location_id is None:
+                    return []
+                where = "location_id = ? AND " + where
+                params = [location_id] + params
+            rows = [dict(row) for row in conn.execute(
+                f"SELECT bucket, SUM(temp_n) AS n, {selects} FROM readings_{grain} "
+                f"WHERE {where} GROUP BY bucket ORDER BY bucket", params)]
+            top = {}
+            for bucket, condition, _ in conn.execute(
+                    f"SELECT bucket, condition, SUM(n) AS total FROM conditions_{grain} "
+                    f"WHERE {where} GROUP BY bucket, condition ORDER BY bucket, total", params):
+                top[bucket] = condition  # ascending by count, so the last one per bucket wins
+        for row in rows:
+            row["condition"] = top.get(row["bucket"], "")
+        return rows
+
+    def get_rollup_summary(self, city: str, country: str, start: float, end: Optional[float] = None) -> Dict:
+        """count/avg/min/max/stddev per metric plus a condition histogram, from the hourly rollups"""
+        end = time.time() if end is None else end
+        columns = ", ".join(f"SUM({m}_n), SUM({m}_sum), MIN({m}_min), MAX({m}_max), SUM({m}_sq)"
+                            for m in ROLLUP_METRICS)
+        with self.get_connection() as conn:
+            params = (self._location_id(conn, city, country), int(start) // 3600 * 3600, int(end))
+            totals = conn.execute(
+                f"SELECT {columns} FROM readings_hourly WHERE location_id = ? AND bucket BETWEEN ? AND ?",
+                params).fetchone()
+            conditions = dict(conn.execute(
+                "SELECT condition, SUM(n) FROM conditions_hourly "
+                "WHERE location_id = ? AND bucket BETWEEN ? AND ? GROUP BY condition", params).fetchall())
+        summary = {
+            metric: metric_summary(*totals[i * 5:(i + 1) * 5]) for i, metric in enumerate(ROLLUP_METRICS)
+        }
+        summary["conditions"] = conditions
+        return summary
+
     def get_recent_forecast(self, city: str, country: str, hours: int = 24) -> List[Dict]:
         if not self.fetcher:
             self.logger.warning("No fetcher available for forecast data")
@@ -222,7 +628,7 @@ class WeatherDB:
         SELECT timestamp, city, country, status, error
         FROM request_log
         JOIN locations ON request_log.location_id = locations.id
-        WHERE status != 'success'
+        WHERE status NOT IN ('success', 'queued')
         ORDER BY timestamp DESC
         LIMIT ?
         """
@@ -230,35 +636,72 @@ class WeatherDB:
             return [dict(row) for row in conn.execute(query, (limit,))]
 
     def update_location(self, city: str, country: str, **kwargs) -> None:
+        # Upsert rather than REPLACE so columns filled in elsewhere (owm_id) survive
         with self._conn() as conn:
             conn.execute("""
-            INSERT OR REPLACE INTO locations (id, city, country, lat, lon, tz, is_active)
-            VALUES (
-                COALESCE((SELECT id FROM locations WHERE city = ? AND country = ?), NULL),
-                ?, ?, ?, ?, ?, ?
-            )
+            INSERT INTO locations (city, country, lat, lon, tz, is_active, location_key)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(location_key) DO UPDATE SET
+                lat = excluded.lat,
+                lon = excluded.lon,
+                tz = excluded.tz,
+                is_active = excluded.is_active
             """, (
-                city, country,
-                city, country,
+                city.strip(), country.strip(),
                 kwargs.get('latitude'),
                 kwargs.get('longitude'),
                 kwargs.get('timezone'),
-                int(kwargs.get('is_active', True))
+                int(kwargs.get('is_active', True)),
+                location_key(city, country)
             ))
     
+    def get_coordinates(self, city: str, country: str) -> Optional[tuple]:
+        """Return stored (lat, lon) for a location, matching on its canonical key"""
+        try:
+            with self._conn() as conn:
+                row = conn.execute("""
+                SELECT lat, lon FROM locations
+                WHERE id = ? AND lat IS NOT NULL AND lon IS NOT NULL
+                """, (self._location_id(conn, city, country),)).fetchone()
+                return (row[0], row[1]) if row else None
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading coordinates: {e}")
+            return None
+
+    def save_coordinates(self, city: str, country: str, lat: float, lon: float) -> None:
+        """Persist geocoded coordinates without activating new locations for tracking"""
+        try:
+            with self._conn() as conn:
+                location_id = self._location_id(conn, city, country, create=True)
+                conn.execute("UPDATE locations SET lat = ?, lon = ? WHERE id = ?", (lat, lon, location_id))
+        except sqlite3.Error as e:
+            self._location_ids.clear()
+            self.logger.error(f"Error saving coordinates: {e}")
+
+    def save_city_id(self, location_id: int, owm_id: int) -> None:
+        """Remember the provider city ID resolved for a tracked location"""
+        if self.write_pipeline is not None:
+            self.write_pipeline.put_city_id(location_id, owm_id)
+            return
+        try:
+            with self._conn() as conn:
+                conn.execute("UPDATE locations SET owm_id = ? WHERE id = ?", (owm_id, location_id))
+        except sqlite3.Error as e:
+            self.logger.error(f"Error saving city ID: {e}")
+
     def fetch_all_for_city(self, city: str, country: str, limit: int = 100) -> List[Dict]:
         """Fetch all available readings for a specific city"""
         query = """
         SELECT timestamp, temp, temp_min, temp_max, humidity, pressure, weather_summary, weather_detail
         FROM readings 
-        WHERE city = ? AND country = ?
-        ORDER BY timestamp DESC
+        WHERE location_id = ?
+        ORDER BY ts DESC
         LIMIT ?
         """
         
         try:
             with self.get_connection() as conn:
-                cursor = conn.execute(query, (city, country, limit))
+                cursor = conn.execute(query, (self._location_id(conn, city, country), limit))
                 results = cursor.fetchall()
                 
                 readings = []
@@ -281,10 +724,137 @@ class WeatherDB:
             return []
     
     
+    def get_latest_reading(self, city: str, country: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """Newest stored reading for a city, optionally only if fetched within ``max_age`` seconds"""
+        query = "SELECT * FROM reading_details WHERE location_id = ?"
+        params: list = []
+        if max_age is not None:
+            query += " AND fetched_at >= ?"
+            params.append((datetime.utcnow() - timedelta(seconds=max_age)).isoformat())
+        query += " ORDER BY fetched_at DESC LIMIT 1"
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(query, [self._location_id(conn, city, country)] + params).fetchone()
+                return reading_from_row(row) if row else None
+        except sqlite3.Error as e:
+            self.logger.error(f"Error fetching latest reading: {e}")
+            return None
+
+    def _readings_columns(self) -> List[str]:
+        if self._reading_column_names is None:
+            with self.get_connection() as conn:
+                self._reading_column_names = [row[1] for row in conn.execute("PRAGMA table_info(reading_details)")]
+        return self._reading_column_names
+
+    def _reading_filter(self, conn: sqlite3.Connection, city: Optional[str], country: Optional[str],
+                        start: Optional[float] = None, end: Optional[float] = None) -> Tuple[List[str], list]:
+        """WHERE terms selecting a location's readings between two epoch times"""
+        conditions, params = [], []
+        if city is not None and country is not None:
+            location_id = self._location_id(conn, city, country)
+            conditions.append("location_id = ?" if location_id is not None else "0")
+            params += [location_id] if location_id is not None else []
+        elif city is not None or country is not None:
+            location_ids = self._partial_location_ids(conn, city, country)
+            conditions.append(f"location_id IN ({','.join('?' * len(location_ids))})" if location_ids else "0")
+            params += location_ids
+        if start is not None:
+            conditions.append("ts >= ?")
+            params.append(int(start))
+        if end is not None:
+            conditions.append("ts <= ?")
+            params.append(int(end))
+        return conditions, params
+
+    def iter_readings(self, city: Optional[str] = None, country: Optional[str] = None,
+                      since: Optional[float] = None, columns: Optional[Sequence[str]] = None,
+                      chunk_size: int = 500, newest_first: bool = True) -> Iterator[Dict]:
+        """Stream readings rows as dicts, ``chunk_size`` rows per ``fetchmany``.
+
+        Filtering happens in SQL: ``city``/``country`` resolve to a location id
+        through its canonical key (so any casing matches) and ``since`` (epoch seconds) bounds ``ts``, so only matching rows and
+        only the requested ``columns`` ever leave SQLite. Memory use is one
+        chunk however large the table is. The cursor holds a read snapshot
+        until the generator is exhausted or closed.
+        """
+        if columns:
+            unknown = set(columns) - set(self._readings_columns())
+            if unknown:
+                raise ValueError(f"Unknown readings columns: {', '.join(sorted(unknown))}")
+            select = ", ".join(columns)
+        else:
+            select = "*"
+        conn = self._conn()
+        conditions, params = self._reading_filter(conn, city, country, since)
+        query = f"SELECT {select} FROM reading_details"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY ts DESC" if newest_first else " ORDER BY ts"
+
+        cursor = conn.execute(query, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        finally:
+            cursor.close()
+
+    def read_columns(self, city: Optional[str] = None, country: Optional[str] = None,
+                     start: Optional[float] = None, end: Optional[float] = None,
+                     fields: Sequence[str] = ("temp",)) -> Dict[str, np.ndarray]:
+        """Readings with ``start <= ts <= end`` as contiguous NumPy arrays, oldest first.
+
+        The result always has ``ts`` (int64 epoch seconds). Numeric ``fields``
+        are float32 with NaN for NULL; text fields (``weather_summary`` ...)
+        are int32 codes into a sorted ``<field>_labels`` array, where ``''``
+        stands for NULL. The arrays are filled straight from the cursor by
+        ``np.fromiter``, so no per-row dicts or lists are built. City and
+        country resolve to a location id, as in iter_readings.
+        """
+        unknown = set(fields) - set(self._readings_columns())
+        if unknown:
+            raise ValueError(f"Unknown readings columns: {', '.join(sorted(unknown))}")
+        select, dtype = ["ts"], [("ts", np.int64)]
+        for field in fields:
+            if field in CATEGORICAL_COLUMNS:
+                select.append(f"IFNULL({field}, '')")
+                dtype.append((field, object))
+            else:
+                # NULL can't go through fromiter into a float field; 9e999 reads back as inf
+                select.append(f"IFNULL({field}, 9e999)")
+                dtype.append((field, np.float32))
+        conn = self._conn()
+        conditions, params = self._reading_filter(conn, city, country, start, end)
+        # The join to locations is only needed for the location's own text columns
+        source = "reading_details" if {"city", "country", "state"} & set(fields) else "readings"
+        query = (f"SELECT {', '.join(select)} FROM {source} "
+                 f"WHERE {' AND '.join(['ts IS NOT NULL'] + conditions)} ORDER BY ts")
+
+        cursor = conn.cursor()
+        cursor.row_factory = None  # plain tuples, which fromiter can unpack into a structured dtype
+        try:
+            records = np.fromiter(cursor.execute(query, params), dtype=np.dtype(dtype))
+        finally:
+            cursor.close()
+
+        columns = {"ts": np.ascontiguousarray(records["ts"])}
+        for field in fields:
+            if field in CATEGORICAL_COLUMNS:
+                labels, codes = np.unique(records[field], return_inverse=True)
+                columns[field] = codes.astype(np.int32)
+                columns[f"{field}_labels"] = labels
+            else:
+                values = np.ascontiguousarray(records[field])
+                values[np.isinf(values)] = np.nan
+                columns[field] = values
+        return columns
+
     def get_all_readings(self) -> List[Dict]:
-        with self.get_connection() as conn:
-            rows = conn.execute("SELECT * FROM readings ORDER BY timestamp DESC").fetchall()
-            return [dict(row) for row in rows]
+        """Every reading, newest first; prefer iter_readings for anything that filters or scans"""
+        return list(self.iter_readings())
         
     def get_all_locations(self) -> List[Dict]:
         with self.get_connection() as conn:
@@ -316,7 +886,7 @@ class WeatherDB:
             os.makedirs(dir_path, exist_ok=True)
 
         with self.get_connection() as conn:
-            cursor = conn.execute("SELECT * FROM readings ORDER BY timestamp DESC")
+            cursor = conn.execute("SELECT * FROM reading_details ORDER BY ts DESC")
             rows = cursor.fetchall()
 
             if rows:
@@ -405,13 +975,12 @@ class WeatherDB:
     def log_request(self, url: str, location_id: Optional[int], status: str,
                     error: Optional[str] = None, latency_ms: Optional[int] = None) -> None:
         """Log API request details for monitoring and debugging"""
+        if self.write_pipeline is not None:
+            self.write_pipeline.put_log(url, location_id, status, error, latency_ms)
+            return
         try:
             with self.get_connection() as conn:
-                conn.execute("""
-                INSERT INTO request_log (
-                    timestamp, url, location_id, status, error, latency_ms
-                ) VALUES (?, ?, ?, ?, ?, ?)
-                """, (
+                conn.execute(self.INSERT_REQUEST_LOG_SQL, (
                     datetime.now(timezone.utc).isoformat(),
                     url,
                     location_id,
@@ -423,18 +992,14 @@ class WeatherDB:
             self.logger.error(f"Failed to log request: {e}")
 
     def get_location_id(self, city: str, country: str) -> Optional[int]:
-
+        """locations.id for any spelling of a location (case, accents, aliases), or None"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT id FROM locations WHERE city = ? AND country = ?",
-                    (city, country)
-                )
-                result = cursor.fetchone()
-                return result['id'] if result else None
+                return self._location_id(conn, city, country)
         except Exception as e:
             self.logger.error(f"Error getting location ID: {e}")
             return None
+
     def save_weather_entry(self, row_data: dict):
         try:
             self.insert_reading(row_data)  # Use your existing insert method